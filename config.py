@@ -1,5 +1,5 @@
 # config.py
-import pygame
+import os
 from enum import Enum
 
 # Game constants
@@ -10,6 +10,53 @@ FPS = 60
 MAP_WIDTH = 2000
 MAP_HEIGHT = 2000
 
+# Map files
+MAP_FILE = os.path.join('assets', 'maps', 'village.json')  # Map loaded for a new game
+MAP_CACHE_DIR = os.path.join('assets', 'maps', 'cache')  # Compiled maps, rebuilt when the source changes
+
+# Enemy data
+ENEMY_DATA_FILE = os.path.join('assets', 'data', 'enemies.json')  # Enemy archetypes and AI profiles
+LOOT_DATA_FILE = os.path.join('assets', 'data', 'loot.json')  # Drop tables per archetype and zone
+SPAWN_ACTIVATE_RADIUS = 1000  # Map spawns closer than this to the view become enemies
+SPAWN_PARK_RADIUS = 1300  # Enemies further than this from the view go back to being spawn records
+
+# Collision
+PIXEL_PERFECT_COLLISION = True  # Use per-pixel masks for walls instead of rects
+COLLISION_CELL_SIZE = 4  # Resolution of the compiled wall grid in pixels
+MOVE_STUCK_TIME = 500  # Milliseconds click-to-move keeps pushing without nearing its waypoint
+
+# Simulation level of detail (distances from the camera centre in pixels)
+LOD_NEAR_RADIUS = 700  # Closer than this ticks every frame
+LOD_FAR_RADIUS = 1400  # Further than this sleeps until woken
+LOD_MID_INTERVAL = 4  # Frames between ticks in the mid band
+LOD_HYSTERESIS = 100  # Distance past a boundary before changing band
+
+# Chunked world streaming
+CHUNKED_WORLD = False  # Stream an endless generated world instead of the village map
+WORLD_SEED = 1337  # Seed for generated chunks
+RNG_SEED = None  # Session seed for the per-subsystem random streams, None for a fresh one
+CHUNK_TILES = 16  # Rendered tiles per chunk side (64px tiles, so 1024px chunks)
+CHUNK_WORLD_SIZE = 1024  # Chunks per world side
+CHUNK_LOAD_RADIUS = 1  # Rings of chunks around the camera kept active
+CHUNK_PREFETCH_SECONDS = 1.0  # How far ahead of the player's velocity to prefetch
+CHUNK_MEMORY_BUDGET = 32  # Chunks kept in memory (active and cached) before eviction
+CHUNK_SAVE_DIR = None  # Directory for evicted chunks, None to regenerate them from the seed
+
+# Saves
+SAVE_DIR = 'saves'
+SAVE_SLOTS = 3  # Manual slots 1-3, slot 0 is the autosave
+QUICKSAVE_SLOT = 1  # Slot used by F5 (save) and F9 (load)
+AUTOSAVE_INTERVAL = 60  # Seconds of world play between autosaves
+
+# Group battles
+BATTLE_JOIN_RADIUS = 250  # Enemies this close to the one touched join the battle
+BATTLE_MAX_ENEMIES = 60  # Most enemies in one battle
+BATTLE_MAX_CELL = 150  # Largest grid cell per enemy on the battle screen
+BATTLE_MIN_CELL = 64  # Smallest grid cell; more enemies than fit scroll instead
+BATTLE_LUNGE_TIME = 0.12  # Seconds for an attack lunge to reach its target (and again to return)
+BATTLE_FLASH_TIME = 0.25  # Seconds a hit flash takes to fade
+COMBAT_LOG_SIZE = 64  # Battle log events kept; older ones are overwritten
+
 # Colors
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -0,0 +1,69 @@
+import json
+from collections import namedtuple
+
+class Archetype(namedtuple('Archetype', ('name', 'hp', 'attack', 'exp', 'appearance', 'ai', 'ranged',
+                                         'speed', 'aggro_radius', 'shot_range', 'shot_cooldown'))):
+    """Immutable data shared by every enemy of one type.
+
+    Enemies keep a reference to their archetype instead of copies of its
+    stats and looks, so authored data is stored once per type however many
+    enemies use it.
+    """
+    __slots__ = ()
+
+class ArchetypeRegistry:
+    """Enemy archetypes by name, loaded from a data file.
+
+    The file has an "ai_profiles" table of movement and combat settings and
+    an "archetypes" table of per-type stats, each naming one profile:
+
+        {"ai_profiles": {"melee": {"speed": 60, "aggro_radius": 150}},
+         "archetypes": {"Goblin": {"hp": 40, "attack": 8, "exp": 20,
+                                   "appearance": "Goblin", "ai": "melee"}}}
+    """
+
+    def __init__(self, archetypes):
+        self.archetypes = {archetype.name: archetype for archetype in archetypes}
+
+    @classmethod
+    def load(cls, path):
+        """Read a registry from a JSON data file."""
+        with open(path) as f:
+            data = json.load(f)
+
+        profiles = data.get('ai_profiles', {})
+        archetypes = []
+        for name, entry in data['archetypes'].items():
+            ai = entry.get('ai', 'melee')
+            if ai not in profiles:
+                raise ValueError(f"Archetype '{name}' uses unknown AI profile '{ai}'")
+            profile = profiles[ai]
+            archetypes.append(Archetype(
+                name=name,
+                hp=entry['hp'],
+                attack=entry['attack'],
+                exp=entry['exp'],
+                appearance=entry.get('appearance'),
+                ai=ai,
+                ranged=profile.get('ranged', False),
+                speed=profile.get('speed', 60),
+                aggro_radius=profile.get('aggro_radius', 0),
+                shot_range=profile.get('shot_range', 0),
+                shot_cooldown=profile.get('shot_cooldown', 0),
+            ))
+        return cls(archetypes)
+
+    def get(self, name):
+        """Archetype for a name, raising KeyError for unknown types."""
+        try:
+            return self.archetypes[name]
+        except KeyError:
+            raise KeyError(f"Unknown enemy archetype '{name}'")
+
+    def __contains__(self, name):
+        return name in self.archetypes
+
+    @property
+    def names(self):
+        """Every archetype name, in file order."""
+        return list(self.archetypes)
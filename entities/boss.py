@@ -1,15 +1,20 @@
 import pygame
 import os
 import random
+from entities.ecs import EntityFacade, component_property
+from entities.components import BOSS, HEALTH, MAX_HEALTH, HEALTH_BAR
 
-class Boss(pygame.sprite.Sprite):
-    def __init__(self, x, y, name="Mzana", health=500, attack=25, exp=100):
+class Boss(EntityFacade, pygame.sprite.Sprite):
+    # Stored in the boss's world entity
+    health = component_property(HEALTH)
+    max_health = component_property(MAX_HEALTH)
+    
+    def __init__(self, world, x, y, name="Mzana", health=500, attack=25, exp=100):
         super().__init__()
         
         # Basic properties
         self.name = name
-        self.health = health
-        self.max_health = health
+        self.attach(world, {BOSS: None, HEALTH_BAR: None, HEALTH: health, MAX_HEALTH: health})
         self.attack = attack
         self.exp = exp
         self.speed = 1
@@ -31,6 +36,7 @@ class Boss(pygame.sprite.Sprite):
         
         # State tracking
         self.is_defeated = False
+        self.spawn_index = -1  # Map boss spawn this boss came from, if any
         
     def load_boss_sprite(self):
         """Load the boss sprite image"""
@@ -70,11 +76,21 @@ class Boss(pygame.sprite.Sprite):
             self.image = pygame.Surface((self.width, self.height))
             self.image.fill((255, 0, 0))  # Red for the boss
     
+    def kill(self):
+        """Remove from all groups and free the boss's entity."""
+        self.detach()
+        super().kill()
+    
     def update(self):
         """Update boss state"""
         # If we add animations or movement later, implement it here
         pass
     
+    @property
+    def hurtbox(self):
+        """Area that can be hit by attacks (the whole sprite)."""
+        return self.rect
+    
     def take_damage(self, damage):
         """Reduce health when taking damage"""
         self.health = max(0, self.health - damage)
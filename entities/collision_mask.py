@@ -0,0 +1,13 @@
+import pygame
+
+# One mask per unique source surface, shared by every sprite that draws it.
+# The surface is kept alongside its mask so its id() cannot be reused.
+_mask_cache = {}
+
+def get_mask(surface):
+    """Return the cached pygame.mask.Mask for a surface, building it on first use."""
+    entry = _mask_cache.get(id(surface))
+    if entry is None or entry[0] is not surface:
+        entry = (surface, pygame.mask.from_surface(surface))
+        _mask_cache[id(surface)] = entry
+    return entry[1]
@@ -0,0 +1,74 @@
+import numpy as np
+from collections import namedtuple
+
+# Combat rules shared by the battle screen and the headless simulator.
+# Nothing here touches pygame or keeps state. Damage functions take Python
+# ints or NumPy arrays alike, so the simulator can resolve a whole batch of
+# battles in one call. Callers holding scalars wrap results in int().
+
+BASE_HEALTH = 100
+BASE_ATTACK = 10
+BASE_DEFENSE = 5
+BASE_CRITICAL_CHANCE = 10  # Percent
+BASE_SPEED = 3
+BASE_HEAL_AMOUNT = 30
+HEAL_COOLDOWN = 3.0        # Seconds between heals (skill 3)
+ENEMY_SPEED = 1            # Enemy.speed and Boss.speed, so the player always opens
+ATB_GAUGE = 1000           # Battle time units a combatant waits between actions at ATB_BASE_RATE
+ATB_BASE_RATE = 10         # Gauge fill rate before speed, keeping speed from multiplying turns outright
+HEALTH_PER_LEVEL = 20
+LEVEL_SCALE = 1.1          # Attack and healing grow 10% per level
+EXP_PER_ENEMY = 25
+
+PlayerStats = namedtuple('PlayerStats', ('level', 'max_health', 'attack_power', 'defense',
+                                         'critical_chance', 'speed', 'heal_amount'))
+
+def player_stats(level):
+    """Stats of a fresh player after levelling up to a level."""
+    max_health, attack_power, heal_amount = BASE_HEALTH, BASE_ATTACK, BASE_HEAL_AMOUNT
+    for _ in range(level - 1):
+        max_health, attack_power, heal_amount = level_up(max_health, attack_power, heal_amount)
+    return PlayerStats(level, max_health, attack_power, BASE_DEFENSE, BASE_CRITICAL_CHANCE, BASE_SPEED,
+                       heal_amount)
+
+def level_up(max_health, attack_power, heal_amount):
+    """(max health, attack power, heal amount) one level up."""
+    return (max_health + HEALTH_PER_LEVEL, round(attack_power * LEVEL_SCALE),
+            round(heal_amount * LEVEL_SCALE))
+
+def exp_to_next_level(level):
+    """Experience needed to leave a level."""
+    return round(100 * (1.3 ** (level - 1)))
+
+def action_delay(speed):
+    """Battle time between a combatant's actions; each point of speed fills the gauge faster."""
+    return ATB_GAUGE // (ATB_BASE_RATE + np.maximum(0, speed))
+
+def roll_succeeds(roll, chance):
+    """True where a 1-100 percentile roll lands within a percent chance."""
+    return roll <= chance
+
+def attack_damage(attack_power, skill, critical):
+    """Damage a player attack deals to each enemy.
+
+    A skill hits for 1.5x attack power and a critical for 1.5x again,
+    truncated like int(x * 1.5) at each step.
+    """
+    damage = attack_power * 3 // 2 if skill else attack_power
+    return np.where(critical, damage * 3 // 2, damage)
+
+def dodge_chance(speed):
+    """Percent chance the player dodges an enemy attack."""
+    return np.minimum(5 + speed * 2, 30)
+
+def enemy_damage(attack, defense):
+    """Damage an enemy hit deals after the player's defense (at least 1)."""
+    return np.maximum(1, attack - defense)
+
+def apply_heal(health, max_health, heal_amount):
+    """Health after healing, capped at max health."""
+    return np.minimum(max_health, health + heal_amount)
+
+def victory_exp(enemy_count):
+    """Experience for winning a battle against enemy_count enemies."""
+    return EXP_PER_ENEMY * enemy_count
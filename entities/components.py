@@ -0,0 +1,24 @@
+import numpy as np
+from entities.ecs import Component
+
+# Hit points
+HEALTH = Component('health', np.int32)
+MAX_HEALTH = Component('max_health', np.int32)
+
+# Seconds until an action can be used again, counted down by the cooldown system
+HEAL_COOLDOWN = Component('heal_cooldown', np.float32)
+VOLLEY_COOLDOWN = Component('volley_cooldown', np.float32)
+SHOT_COOLDOWN = Component('shot_cooldown', np.float32)
+COOLDOWNS = (HEAL_COOLDOWN, VOLLEY_COOLDOWN, SHOT_COOLDOWN)
+
+# Distance in pixels a ranged enemy shoots from
+SHOT_RANGE = Component('shot_range', np.float32)
+
+# Slot in the EnemySimulation that moves and animates the entity
+SIM_SLOT = Component('sim_slot', np.int32)
+
+# Tags saying what kind of entity this is and what it can do
+PLAYER = Component('player')
+ENEMY = Component('enemy')
+BOSS = Component('boss')
+HEALTH_BAR = Component('health_bar')
@@ -0,0 +1,349 @@
+import numpy as np
+from collections import namedtuple
+
+# Low bits of a handle index the entity slot, high bits count how often the slot was reused
+INDEX_BITS = 32
+INDEX_MASK = (1 << INDEX_BITS) - 1
+
+class Component(namedtuple('Component', ('name', 'dtype', 'shape'))):
+    """One kind of per-entity data.
+
+    Data components store a value of a NumPy dtype (and optional per-entity
+    shape) in a typed column. Components without a dtype are tags: they
+    take no storage and only decide which table an entity lives in.
+    """
+    __slots__ = ()
+
+    def __new__(cls, name, dtype=None, shape=()):
+        shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        return super().__new__(cls, name, None if dtype is None else np.dtype(dtype), shape)
+
+    @property
+    def is_tag(self):
+        return self.dtype is None
+
+    def __repr__(self):
+        return f"Component({self.name})"
+
+class Table:
+    """Dense storage for every entity with exactly one set of components.
+
+    Each data component is a preallocated column, and rows 0..count-1 are
+    always live, so systems can work on whole columns at once. Removing an
+    entity moves the last row into its place.
+    """
+
+    def __init__(self, components, capacity=64):
+        self.components = frozenset(components)
+        self.count = 0
+        self.capacity = capacity
+        self.handles = np.zeros(capacity, dtype=np.int64)
+        self.objects = []   # Facade object per row, or None
+        self.columns = {component: np.zeros((capacity,) + component.shape, dtype=component.dtype)
+                        for component in self.components if not component.is_tag}
+
+    def column(self, component):
+        """Live rows of one component's column (a view, writes go to the table)."""
+        return self.columns[component][:self.count]
+
+    def _reserve(self, extra):
+        """Grow every column so extra more rows fit."""
+        needed = self.count + extra
+        if needed <= self.capacity:
+            return
+        capacity = max(needed, self.capacity * 2)
+        self.handles = np.resize(self.handles, capacity)
+        for component, column in self.columns.items():
+            grown = np.zeros((capacity,) + component.shape, dtype=component.dtype)
+            grown[:self.count] = column[:self.count]
+            self.columns[component] = grown
+        self.capacity = capacity
+
+    def extend(self, handles, values, objects):
+        """Append rows, returning the first new row index."""
+        count = len(handles)
+        self._reserve(count)
+        start = self.count
+        self.handles[start:start + count] = handles
+        for component, column in self.columns.items():
+            value = values.get(component)
+            column[start:start + count] = 0 if value is None else value
+        self.objects.extend(objects)
+        self.count += count
+        return start
+
+    def remove(self, row):
+        """Drop a row, filling the gap with the last one.
+
+        Returns:
+            int: Handle of the entity moved into row, or -1 if none moved
+        """
+        last = self.count - 1
+        moved = -1
+        if row != last:
+            self.handles[row] = self.handles[last]
+            for column in self.columns.values():
+                column[row] = column[last]
+            self.objects[row] = self.objects[last]
+            moved = int(self.handles[row])
+        self.objects.pop()
+        self.count = last
+        return moved
+
+    def row_values(self, row):
+        """Copy of every data component of one row."""
+        return {component: column[row].copy() for component, column in self.columns.items()}
+
+class World:
+    """Entities as handles, their components in archetype tables.
+
+    A handle is a plain int that packs a slot index with the slot's
+    generation, so handles are cheap to store and a handle to a destroyed
+    entity is detected rather than silently reading whatever reused its
+    slot. Entities with the same component set share one Table, and
+    query() returns the tables holding a set of components, which systems
+    then iterate column by column.
+    """
+
+    def __init__(self, capacity=1024):
+        self.tables = {}
+        self._table_list = []
+        self._queries = {}
+
+        # Per slot: generation, table index (-1 when free) and row
+        self._generation = np.zeros(capacity, dtype=np.int64)
+        self._table = np.full(capacity, -1, dtype=np.int32)
+        self._row = np.zeros(capacity, dtype=np.int32)
+        self._free = []
+        self._next = 0
+
+    def _table_for(self, components):
+        """Table holding exactly these components, created on first use."""
+        key = frozenset(components)
+        table = self.tables.get(key)
+        if table is None:
+            table = Table(key)
+            table.index = len(self._table_list)
+            self.tables[key] = table
+            self._table_list.append(table)
+            # Cached queries may now have one more matching table
+            self._queries.clear()
+        return table
+
+    def _allocate(self, count):
+        """Slot indices for count new entities, reusing freed slots first."""
+        reused = self._free[-count:] if count else []
+        del self._free[len(self._free) - len(reused):]
+        fresh = count - len(reused)
+        start = self._next
+        if start + fresh > len(self._table):
+            capacity = max(start + fresh, len(self._table) * 2)
+            self._generation = np.resize(self._generation, capacity)
+            self._generation[len(self._table):] = 0
+            self._row = np.resize(self._row, capacity)
+            table = np.full(capacity, -1, dtype=np.int32)
+            table[:len(self._table)] = self._table
+            self._table = table
+        self._next += fresh
+        return np.concatenate((np.array(reused, dtype=np.int64), np.arange(start, start + fresh, dtype=np.int64)))
+
+    def create(self, components, obj=None):
+        """Create one entity.
+
+        Args:
+            components (dict): Component -> initial value (None for tags)
+            obj: Facade object to keep alongside the entity
+
+        Returns:
+            int: Entity handle
+        """
+        return int(self.create_many(1, components, [obj])[0])
+
+    def create_many(self, count, components, objects=None):
+        """Create entities sharing one component set in a single batch.
+
+        Args:
+            count (int): Number of entities
+            components (dict): Component -> value or per-entity array of values
+            objects (list): Facade object per entity, optional
+
+        Returns:
+            np.ndarray: int64 handles
+        """
+        table = self._table_for(components)
+        slots = self._allocate(count)
+        handles = slots | (self._generation[slots] << INDEX_BITS)
+        start = table.extend(handles, components, objects if objects is not None else [None] * count)
+        self._table[slots] = table.index
+        self._row[slots] = np.arange(start, start + count)
+        return handles
+
+    def _locate(self, handle):
+        """(table, row) of a live entity, raising KeyError for stale handles."""
+        slot = handle & INDEX_MASK
+        if slot >= self._next or self._table[slot] < 0 or self._generation[slot] != handle >> INDEX_BITS:
+            raise KeyError(f"Entity {handle} does not exist")
+        return self._table_list[self._table[slot]], int(self._row[slot])
+
+    def alive(self, handle):
+        """True if the handle refers to a live entity."""
+        try:
+            self._locate(handle)
+        except KeyError:
+            return False
+        return True
+
+    def destroy(self, handle):
+        """Remove an entity and free its slot."""
+        table, row = self._locate(handle)
+        moved = table.remove(row)
+        if moved >= 0:
+            self._row[moved & INDEX_MASK] = row
+        slot = handle & INDEX_MASK
+        self._table[slot] = -1
+        self._generation[slot] += 1
+        self._free.append(slot)
+
+    def has(self, handle, component):
+        """True if the entity has a component."""
+        table, _ = self._locate(handle)
+        return component in table.components
+
+    def get(self, handle, component):
+        """A component's value: a Python scalar, or a writable view for shaped components."""
+        table, row = self._locate(handle)
+        value = table.columns[component][row]
+        return value.item() if not component.shape else value
+
+    def set(self, handle, component, value):
+        """Write a component's value."""
+        table, row = self._locate(handle)
+        table.columns[component][row] = value
+
+    def _locate_many(self, handles):
+        """(table index, row) arrays for live entities, raising KeyError if any handle is stale."""
+        handles = np.asarray(handles, dtype=np.int64)
+        slots = handles & INDEX_MASK
+        known = slots < self._next
+        safe = np.where(known, slots, 0)
+        tables = self._table[safe]
+        if not (known & (tables >= 0) & (self._generation[safe] == handles >> INDEX_BITS)).all():
+            raise KeyError("Some entities do not exist")
+        return tables, self._row[safe]
+
+    def get_many(self, handles, component):
+        """One component of many entities as an array, gathered table by table."""
+        tables, rows = self._locate_many(handles)
+        values = np.empty((len(tables),) + component.shape, dtype=component.dtype)
+        for index in np.unique(tables).tolist():
+            in_table = tables == index
+            values[in_table] = self._table_list[index].columns[component][rows[in_table]]
+        return values
+
+    def set_many(self, handles, component, values):
+        """Write one component of many entities, scattered table by table."""
+        tables, rows = self._locate_many(handles)
+        values = np.broadcast_to(np.asarray(values, dtype=component.dtype), (len(tables),) + component.shape)
+        for index in np.unique(tables).tolist():
+            in_table = tables == index
+            self._table_list[index].columns[component][rows[in_table]] = values[in_table]
+
+    def object(self, handle):
+        """Facade object stored with an entity."""
+        table, row = self._locate(handle)
+        return table.objects[row]
+
+    def snapshot(self, handle):
+        """Copy of every data component of an entity."""
+        table, row = self._locate(handle)
+        return table.row_values(row)
+
+    def add(self, handle, component, value=None):
+        """Give an entity another component, moving it to the matching table."""
+        table, row = self._locate(handle)
+        if component in table.components:
+            if not component.is_tag:
+                table.columns[component][row] = value
+            return
+        values = table.row_values(row)
+        values[component] = value
+        self._move(handle, table, row, table.components | {component}, values)
+
+    def remove(self, handle, component):
+        """Take a component off an entity, moving it to the matching table."""
+        table, row = self._locate(handle)
+        if component not in table.components:
+            return
+        values = table.row_values(row)
+        values.pop(component, None)
+        self._move(handle, table, row, table.components - {component}, values)
+
+    def _move(self, handle, table, row, components, values):
+        """Move an entity's row to the table for a new component set."""
+        obj = table.objects[row]
+        moved = table.remove(row)
+        if moved >= 0:
+            self._row[moved & INDEX_MASK] = row
+        target = self._table_for(components)
+        slot = handle & INDEX_MASK
+        self._row[slot] = target.extend(np.array([handle], dtype=np.int64), values, [obj])
+        self._table[slot] = target.index
+
+    def query(self, *components):
+        """Every table holding all of the given components (some may be empty)."""
+        key = frozenset(components)
+        tables = self._queries.get(key)
+        if tables is None:
+            tables = [table for table in self._table_list if key <= table.components]
+            self._queries[key] = tables
+        return tables
+
+    def count(self, *components):
+        """Number of live entities holding all of the given components."""
+        return sum(table.count for table in self.query(*components))
+
+    def __len__(self):
+        return sum(table.count for table in self._table_list)
+
+def component_property(component, doc=None):
+    """Facade attribute stored in one of the entity's components."""
+    def fget(self):
+        if self.entity is None:
+            return self._detached[component]
+        return self.world.get(self.entity, component)
+
+    def fset(self, value):
+        if self.entity is None:
+            self._detached[component] = value
+        else:
+            self.world.set(self.entity, component, value)
+
+    return property(fget, fset, doc=doc)
+
+class EntityFacade:
+    """Base for objects whose data lives in a World entity.
+
+    Attributes declared with component_property read and write the entity's
+    columns. detach() destroys the entity but keeps its last values on the
+    object, so code still holding a removed sprite can read them.
+    """
+    world = None
+    entity = None
+
+    def attach(self, world, components):
+        """Create this object's entity."""
+        self.world = world
+        self.entity = world.create(components, self)
+
+    def detach(self):
+        """Destroy the entity, keeping a copy of its data."""
+        if self.entity is None:
+            return
+        self._detached = {component: value.item() if not component.shape else value
+                          for component, value in self.world.snapshot(self.entity).items()}
+        self.world.destroy(self.entity)
+        self.entity = None
+
+    def has(self, component):
+        """True if the entity has a component (False once detached)."""
+        return self.entity is not None and self.world.has(self.entity, component)
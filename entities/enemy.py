@@ -1,19 +1,162 @@
 import pygame
 import math
-import random
 import os
-from config import TILE_SIZE, RED, YELLOW
+from entities import game_clock, rng
+from entities.ecs import EntityFacade, component_property
+from entities.components import ENEMY, HEALTH, MAX_HEALTH, SHOT_COOLDOWN, SHOT_RANGE, SIM_SLOT
+from config import YELLOW, MAP_WIDTH, MAP_HEIGHT
 
-class Enemy(pygame.sprite.Sprite):
-    def __init__(self, x, y, name="Enemy", hp=50, attack=10, exp=100):
+_looks = rng.stream(rng.LOOKS)
+_ai = rng.stream(rng.AI)
+_combat = rng.stream(rng.COMBAT)
+
+# Color schemes for the static sprite, picked by an archetype's appearance key
+COLOR_SCHEMES = {
+    "Skeleton": {
+        "main": (200, 200, 200),  # Light gray
+        "accent": (150, 150, 150),  # Darker gray
+        "eye": (255, 0, 0)         # Red eyes
+    },
+    "Ghost": {
+        "main": (150, 150, 255),    # Light blue
+        "accent": (100, 100, 200),  # Darker blue
+        "eye": (255, 255, 255)      # White eyes
+    },
+    "Goblin": {
+        "main": (100, 200, 100),    # Green
+        "accent": (50, 150, 50),    # Darker green
+        "eye": (255, 255, 0)        # Yellow eyes
+    },
+    "Wraith": {
+        "main": (80, 0, 80),        # Dark purple
+        "accent": (120, 0, 120),    # Brighter purple
+        "eye": (255, 100, 255)      # Pink eyes
+    },
+    "Elemental": {
+        "main": (255, 100, 0),      # Orange
+        "accent": (255, 50, 0),     # Red-orange
+        "eye": (255, 255, 0)        # Yellow eyes
+    },
+    "Slime": {
+        "main": (0, 255, 100),      # Lime green
+        "accent": (0, 200, 80),     # Darker lime
+        "eye": (0, 0, 0)            # Black eyes
+    },
+    "Undead": {
+        "main": (100, 255, 255),    # Cyan
+        "accent": (0, 200, 200),    # Darker cyan
+        "eye": (255, 0, 0)          # Red eyes
+    },
+    "Demon": {
+        "main": (255, 0, 0),        # Red
+        "accent": (200, 0, 0),      # Dark red
+        "eye": (255, 255, 0)        # Yellow eyes
+    },
+    "Fairy": {
+        "main": (255, 150, 255),    # Pink
+        "accent": (200, 100, 200),  # Darker pink
+        "eye": (0, 255, 255)        # Cyan eyes
+    },
+    "Corrupted": {
+        "main": (0, 0, 0),          # Black
+        "accent": (50, 50, 50),     # Dark gray
+        "eye": (255, 0, 0)          # Red eyes
+    },
+    # New vibrant colors as requested
+    "Sapphire": {
+        "main": (0, 50, 255),       # Deep blue
+        "accent": (0, 100, 200),    # Medium blue
+        "eye": (255, 255, 255)      # White eyes
+    },
+    "Solar": {
+        "main": (255, 255, 0),      # Bright yellow
+        "accent": (255, 200, 0),    # Gold
+        "eye": (255, 100, 0)        # Orange eyes
+    },
+    "Aquamarine": {
+        "main": (0, 255, 255),      # Bright cyan
+        "accent": (0, 200, 255),    # Turquoise
+        "eye": (0, 0, 255)          # Blue eyes
+    },
+    "Royal": {
+        "main": (100, 0, 255),      # Royal purple
+        "accent": (75, 0, 200),     # Deep purple
+        "eye": (255, 255, 0)        # Gold eyes
+    },
+    "Emerald": {
+        "main": (0, 200, 50),       # Emerald green
+        "accent": (0, 150, 50),     # Darker emerald
+        "eye": (255, 255, 255)      # White eyes
+    },
+    "Amber": {
+        "main": (255, 191, 0),      # Amber
+        "accent": (255, 170, 0),    # Darker amber
+        "eye": (0, 0, 0)            # Black eyes
+    },
+    "Scarlet": {
+        "main": (255, 36, 0),       # Scarlet red
+        "accent": (200, 30, 0),     # Darker scarlet
+        "eye": (255, 255, 200)      # Light yellow eyes
+    },
+    "Teal": {
+        "main": (0, 128, 128),      # Teal
+        "accent": (0, 100, 100),    # Darker teal
+        "eye": (200, 255, 255)      # Light cyan eyes
+    }
+}
+
+# Font for name labels, created on first use
+_label_font = None
+
+def label_font():
+    """Small font shared by every enemy name label."""
+    global _label_font
+    if _label_font is None:
+        _label_font = pygame.font.Font(None, 12)
+    return _label_font
+
+class Enemy(EntityFacade, pygame.sprite.Sprite):
+    # Pre-rendered pulse animation frames shared by enemies with the same name
+    PULSE_STEPS = 16
+    _pulse_frames = {}
+    
+    # Stored in the enemy's world entity
+    health = component_property(HEALTH)
+    max_health = component_property(MAX_HEALTH)
+    
+    def __init__(self, world, x, y, archetype, health=None):
+        """
+        Args:
+            world (World): World holding the enemy's entity
+            x, y (int): Top-left position
+            archetype (Archetype): Shared stats, appearance and AI profile
+            health (int): Current health, full health if None
+        """
         super().__init__()
         
         # Enemy properties first so they can be used by sprite methods
-        self.name = name
-        self.max_health = hp
-        self.health = hp
-        self.attack = attack
-        self.exp = exp
+        self.archetype = archetype
+        self.name = archetype.name
+        self.attack = archetype.attack
+        self.exp = archetype.exp
+        
+        # Ranged attack properties (archers shoot arrows at the player)
+        self.is_ranged = archetype.ranged
+        self.shot_interval = archetype.shot_cooldown / 1000  # Seconds between shots
+        
+        components = {ENEMY: None, HEALTH: archetype.hp if health is None else health,
+                      MAX_HEALTH: archetype.hp, SIM_SLOT: -1}
+        if self.is_ranged:
+            components[SHOT_COOLDOWN] = 0
+            components[SHOT_RANGE] = archetype.shot_range
+        self.attach(world, components)
+        
+        # Authored spawn this enemy came from, if any
+        self.spawn_index = -1
+        
+        # Simulation slot, set by bind() when the enemy is driven by an EnemySimulation
+        self.sim = None
+        self.slot = -1
         
         # Sprite dimensions
         self.width = 40
@@ -28,10 +171,10 @@ class Enemy(pygame.sprite.Sprite):
         # Animation variables
         self.frame = 0
         self.animation_speed = 0.1
-        self.last_update = pygame.time.get_ticks()
+        self.last_update = game_clock.get_ticks()
         
-        # Create custom Mzana-like appearance but smaller
-        self.create_mzana_like_sprite()
+        # The static sprite is only drawn while unbound, so it is built on first use
+        self._image = None
         
         # Movement properties
         self.speed = 1
@@ -40,117 +183,19 @@ class Enemy(pygame.sprite.Sprite):
         self.move_duration = 1000  # Milliseconds to move
         self.moving = False
         self.move_direction = [0, 0]
+        
+        # Compiled wall grid, set by the game when the enemy is spawned
+        self.collision_map = None
     
     def create_mzana_like_sprite(self):
         """Create a smaller version of the Mzana boss sprite with varied colors."""
         # Create a transparent surface
         self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
         
-        # Enhanced color selection with more variety and vibrant colors
-        enemy_types = {
-            "Skeleton": {
-                "main": (200, 200, 200),  # Light gray
-                "accent": (150, 150, 150),  # Darker gray
-                "eye": (255, 0, 0)         # Red eyes
-            },
-            "Ghost": {
-                "main": (150, 150, 255),    # Light blue
-                "accent": (100, 100, 200),  # Darker blue
-                "eye": (255, 255, 255)      # White eyes
-            },
-            "Goblin": {
-                "main": (100, 200, 100),    # Green
-                "accent": (50, 150, 50),    # Darker green
-                "eye": (255, 255, 0)        # Yellow eyes
-            },
-            "Wraith": {
-                "main": (80, 0, 80),        # Dark purple
-                "accent": (120, 0, 120),    # Brighter purple
-                "eye": (255, 100, 255)      # Pink eyes
-            },
-            "Elemental": {
-                "main": (255, 100, 0),      # Orange
-                "accent": (255, 50, 0),     # Red-orange
-                "eye": (255, 255, 0)        # Yellow eyes
-            },
-            "Slime": {
-                "main": (0, 255, 100),      # Lime green
-                "accent": (0, 200, 80),     # Darker lime
-                "eye": (0, 0, 0)            # Black eyes
-            },
-            "Undead": {
-                "main": (100, 255, 255),    # Cyan
-                "accent": (0, 200, 200),    # Darker cyan
-                "eye": (255, 0, 0)          # Red eyes
-            },
-            "Demon": {
-                "main": (255, 0, 0),        # Red
-                "accent": (200, 0, 0),      # Dark red
-                "eye": (255, 255, 0)        # Yellow eyes
-            },
-            "Fairy": {
-                "main": (255, 150, 255),    # Pink
-                "accent": (200, 100, 200),  # Darker pink
-                "eye": (0, 255, 255)        # Cyan eyes
-            },
-            "Corrupted": {
-                "main": (0, 0, 0),          # Black
-                "accent": (50, 50, 50),     # Dark gray
-                "eye": (255, 0, 0)          # Red eyes
-            },
-            # New vibrant colors as requested
-            "Sapphire": {
-                "main": (0, 50, 255),       # Deep blue
-                "accent": (0, 100, 200),    # Medium blue
-                "eye": (255, 255, 255)      # White eyes
-            },
-            "Solar": {
-                "main": (255, 255, 0),      # Bright yellow
-                "accent": (255, 200, 0),    # Gold
-                "eye": (255, 100, 0)        # Orange eyes
-            },
-            "Aquamarine": {
-                "main": (0, 255, 255),      # Bright cyan
-                "accent": (0, 200, 255),    # Turquoise
-                "eye": (0, 0, 255)          # Blue eyes
-            },
-            "Royal": {
-                "main": (100, 0, 255),      # Royal purple
-                "accent": (75, 0, 200),     # Deep purple
-                "eye": (255, 255, 0)        # Gold eyes
-            },
-            "Emerald": {
-                "main": (0, 200, 50),       # Emerald green
-                "accent": (0, 150, 50),     # Darker emerald
-                "eye": (255, 255, 255)      # White eyes
-            },
-            "Amber": {
-                "main": (255, 191, 0),      # Amber
-                "accent": (255, 170, 0),    # Darker amber
-                "eye": (0, 0, 0)            # Black eyes
-            },
-            "Scarlet": {
-                "main": (255, 36, 0),       # Scarlet red
-                "accent": (200, 30, 0),     # Darker scarlet
-                "eye": (255, 255, 200)      # Light yellow eyes
-            },
-            "Teal": {
-                "main": (0, 128, 128),      # Teal
-                "accent": (0, 100, 100),    # Darker teal
-                "eye": (200, 255, 255)      # Light cyan eyes
-            }
-        }
-        
-        # If the enemy has a recognized type, use its colors
-        # Otherwise randomly select one of the color schemes
-        if self.name in enemy_types:
-            color_scheme = enemy_types[self.name]
-        else:
-            # Pick a random enemy type
-            random_type = random.choice(list(enemy_types.keys()))
-            color_scheme = enemy_types[random_type]
-            # Set the enemy name to match the colors
-            self.name = random_type
+        # Use the archetype's colors, or a random scheme if it names none
+        color_scheme = COLOR_SCHEMES.get(self.archetype.appearance)
+        if color_scheme is None:
+            color_scheme = _looks.choice(list(COLOR_SCHEMES.values()))
             
         main_color = color_scheme["main"]
         accent_color = color_scheme["accent"]
@@ -158,8 +203,8 @@ class Enemy(pygame.sprite.Sprite):
         
         # Add some random variation to the colors to make enemies more unique
         # Shift hue slightly for more individuality
-        main_color = tuple(max(0, min(255, c + random.randint(-20, 20))) for c in main_color)
-        accent_color = tuple(max(0, min(255, c + random.randint(-20, 20))) for c in accent_color)
+        main_color = tuple(max(0, min(255, c + _looks.randint(-20, 20))) for c in main_color)
+        accent_color = tuple(max(0, min(255, c + _looks.randint(-20, 20))) for c in accent_color)
             
         # Draw a Mzana-like shape but smaller
         pygame.draw.circle(self.image, main_color, (self.width//2, self.height//2), self.width//2-5)
@@ -177,7 +222,7 @@ class Enemy(pygame.sprite.Sprite):
         pygame.draw.ellipse(self.image, accent_color, mouth_rect)
         
         # Decorative patterns - more complex patterns based on enemy type
-        if "Elemental" in self.name or "Fairy" in self.name:
+        if self.archetype.appearance in ("Elemental", "Fairy"):
             # Add glowing aura effect
             for r in range(3):
                 glow_radius = self.width//2 - 5 - r*2
@@ -188,7 +233,7 @@ class Enemy(pygame.sprite.Sprite):
         else:
             # Standard decorative patterns
             pattern_radius = self.width // 12
-            pattern_count = random.randint(4, 7)  # Vary the number of patterns
+            pattern_count = _looks.randint(4, 7)  # Vary the number of patterns
             for i in range(pattern_count):
                 angle = i * (2 * math.pi / pattern_count)
                 x = self.width//2 + int(math.cos(angle) * (self.width//2 - 10))
@@ -196,20 +241,103 @@ class Enemy(pygame.sprite.Sprite):
                 pygame.draw.circle(self.image, accent_color, (x, y), pattern_radius)
         
         # Add name text
-        font = pygame.font.Font(None, 12)
-        name_text = font.render(self.name, True, (255, 255, 255))
+        name_text = label_font().render(self.name, True, (255, 255, 255))
         self.image.blit(name_text, (self.width//2 - name_text.get_width()//2, self.height - 10))
         
+    @property
+    def rect(self):
+        """Position rect, read from the simulation arrays when bound."""
+        if self.sim is not None:
+            x, y = self.sim.pos[self.slot].tolist()
+            self._rect.topleft = (int(x), int(y))
+        return self._rect
+    
+    @rect.setter
+    def rect(self, value):
+        self._rect = value
+        if self.sim is not None:
+            self.sim.pos[self.slot] = value.topleft
+    
+    @property
+    def image(self):
+        """Current animation frame, picked from the simulated pulse phase when bound."""
+        if self.sim is not None:
+            step = int(self.sim.pulse[self.slot] / (2 * math.pi) * self.PULSE_STEPS) % self.PULSE_STEPS
+            return self.get_pulse_frames()[step]
+        if self._image is None:
+            self.create_mzana_like_sprite()
+        return self._image
+    
+    @image.setter
+    def image(self, value):
+        self._image = value
+    
+    def bind(self, sim):
+        """
+        Hand movement and animation over to an EnemySimulation.
+        
+        Speed and aggro radius come from the archetype's AI profile.
+        
+        Args:
+            sim (EnemySimulation): Simulation to take a slot in
+        
+        Returns:
+            bool: True if a slot was available
+        """
+        rect = self._rect
+        archetype = self.archetype
+        slot = sim.add(self, rect.x, rect.y, rect.width, rect.height, archetype.speed, archetype.aggro_radius)
+        if slot < 0:
+            return False
+        self.sim = sim
+        self.slot = slot
+        self.world.set(self.entity, SIM_SLOT, slot)
+        return True
+    
+    def unbind(self):
+        """Release the simulation slot, keeping the last simulated position."""
+        if self.sim is None:
+            return
+        rect = self.rect
+        self.sim.remove(self.slot)
+        self.sim = None
+        self.slot = -1
+        self._rect = rect
+        if self.entity is not None:
+            self.world.set(self.entity, SIM_SLOT, -1)
+    
+    def kill(self):
+        """Remove from all groups and free the simulation slot and entity."""
+        self.unbind()
+        self.detach()
+        super().kill()
+    
+    def get_pulse_frames(self):
+        """Return the pulse animation, rendering it once per archetype."""
+        frames = self._pulse_frames.get(self.name)
+        if frames is None:
+            frames = [
+                self.create_animated_sprite(math.sin(i * 2 * math.pi / self.PULSE_STEPS) * 2)
+                for i in range(self.PULSE_STEPS)
+            ]
+            self._pulse_frames[self.name] = frames
+        return frames
+    
     def update(self):
         """Update enemy state, animation and movement."""
-        current_time = pygame.time.get_ticks()
+        # Enemies bound to a simulation are advanced in bulk
+        if self.sim is not None:
+            return
+        
+        current_time = game_clock.get_ticks()
         
         # Update pulsing animation
         self.pulse_timer += 0.1
         self.pulse_amount = math.sin(self.pulse_timer) * 2
         
-        # Recreate the sprite with the current pulse to animate it
-        self.create_animated_sprite()
+        # Use the cached frame closest to the current pulse
+        step = int(self.pulse_timer / (2 * math.pi) * self.PULSE_STEPS) % self.PULSE_STEPS
+        self.image = self.get_pulse_frames()[step]
         
         # Check if it's time to start/stop moving
         if not self.moving and current_time - self.move_timer > self.move_delay:
@@ -218,8 +346,8 @@ class Enemy(pygame.sprite.Sprite):
             self.moving = True
             # Choose random direction
             self.move_direction = [
-                random.choice([-1, 0, 1]),
-                random.choice([-1, 0, 1])
+                _ai.choice([-1, 0, 1]),
+                _ai.choice([-1, 0, 1])
             ]
         elif self.moving and current_time - self.move_timer > self.move_duration:
             # Stop movement
@@ -229,14 +357,20 @@ class Enemy(pygame.sprite.Sprite):
         
         # Apply movement
         if self.moving:
-            self.rect.x += self.move_direction[0] * self.speed
-            self.rect.y += self.move_direction[1] * self.speed
+            dx = self.move_direction[0] * self.speed
+            dy = self.move_direction[1] * self.speed
+            if self.collision_map is not None:
+                # Slide along walls instead of walking through them
+                self.rect = self.collision_map.move_and_slide(self.rect, dx, dy)
+            else:
+                self.rect.x += dx
+                self.rect.y += dy
             
             # Keep enemy within map bounds
-            self.rect.clamp_ip(pygame.Rect(0, 0, 2000, 2000))
+            self.rect.clamp_ip(pygame.Rect(0, 0, MAP_WIDTH, MAP_HEIGHT))
             
-    def create_animated_sprite(self):
-        """Create an animated version of the Mzana-like sprite with pulsing effect."""
+    def create_animated_sprite(self, pulse_amount):
+        """Render one frame of the Mzana-like sprite at the given pulse amount."""
         # Create a new surface for the animated sprite
         animated_image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
         animated_image.fill((0, 0, 0, 0))  # Transparent base
@@ -260,8 +394,8 @@ class Enemy(pygame.sprite.Sprite):
             detail_color = (80, 0, 0)
             
         # Calculate pulsing size
-        body_size = int(self.width//2 - 5 + self.pulse_amount)
-        head_size = int(self.width//5 + self.pulse_amount/2)
+        body_size = int(self.width//2 - 5 + pulse_amount)
+        head_size = int(self.width//5 + pulse_amount/2)
         
         # Draw the pulsing sprite elements
         # Main body
@@ -269,19 +403,22 @@ class Enemy(pygame.sprite.Sprite):
         # Head
         pygame.draw.circle(animated_image, head_color, (self.width//2, self.height//3), head_size)
         # Eyes
-        eye_size = 2 + abs(self.pulse_amount/4)
+        eye_size = 2 + abs(pulse_amount/4)
         pygame.draw.circle(animated_image, (255, 255, 0), (self.width//2 - 8, self.height//3), eye_size)
         pygame.draw.circle(animated_image, (255, 255, 0), (self.width//2 + 8, self.height//3), eye_size)
         # Details
         pygame.draw.rect(animated_image, detail_color, (self.width//4, 2*self.height//3, self.width//2, self.height//8))
         
         # Add name text
-        font = pygame.font.Font(None, 12)
-        name_text = font.render(self.name, True, (255, 255, 255))
+        name_text = label_font().render(self.name, True, (255, 255, 255))
         animated_image.blit(name_text, (self.width//2 - name_text.get_width()//2, self.height - 10))
         
-        # Update the image
-        self.image = animated_image
+        return animated_image
+    
+    @property
+    def hurtbox(self):
+        """Area that can be hit by attacks (the whole sprite)."""
+        return self.rect
     
     def take_damage(self, damage):
         """
@@ -318,8 +455,8 @@ class Enemy(pygame.sprite.Sprite):
                           health_width, bar_height))
 
 class GrandMaster(Enemy):
-    def __init__(self, x, y, name, hp, attack, exp, skills):
-        super().__init__(x, y, name, hp, attack, exp)
+    def __init__(self, world, x, y, archetype, skills):
+        super().__init__(world, x, y, archetype)
         
         # Make the boss visually distinct
         self.image.fill(YELLOW)  # Use yellow color for bosses
@@ -335,29 +472,9 @@ class GrandMaster(Enemy):
             return {"name": "Basic Attack", "damage": self.attack}
         
         # More likely to use powerful skills in phase 2
-        if self.health < self.phase_threshold and random.random() < 0.7:
+        if self.health < self.phase_threshold and _combat.random() < 0.7:
             skill = max(self.skills, key=lambda s: s["damage"])
         else:
-            skill = random.choice(self.skills)
+            skill = _combat.choice(self.skills)
         
         return skill
-
-def spawn_enemies():
-    """Create a group of enemies with predefined positions."""
-    enemies = pygame.sprite.Group()
-    
-    # Predefined enemy locations based on map coordinates
-    enemy_positions = [
-        (50 * TILE_SIZE, 250 * TILE_SIZE, "Orc Warrior", 50, 10, 25),
-        (100 * TILE_SIZE, 450 * TILE_SIZE, "Orc Warrior", 40, 8, 20),
-        (500 * TILE_SIZE, 500 * TILE_SIZE, "Orc Warrior", 60, 12, 30),
-        (100 * TILE_SIZE, 50 * TILE_SIZE, "Orc Warrior", 60, 12, 30),
-        (450 * TILE_SIZE, 500 * TILE_SIZE, "Orc Warrior", 60, 12, 30)
-    ]
-    
-    for x, y, name, hp, attack, exp in enemy_positions:
-        # Create enemy with parameters in the right order
-        enemy = Enemy(x, y, name, hp, attack, exp)
-        enemies.add(enemy)
-    
-    return enemies
\ No newline at end of file
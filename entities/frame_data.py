@@ -0,0 +1,91 @@
+import pygame
+
+# Per-frame hitbox and hurtbox data for animation clips.
+# Boxes are (x, y, width, height) in source sprite pixels, measured on the
+# unscaled 100x100 frames with the character facing right.
+CLIP_DATA = {
+    'soldier_idle': {
+        'frame_size': (100, 100),
+        'damage_scale': 0.0,
+        'frames': [{'hurtbox': (41, 38, 16, 20), 'hitboxes': []}] * 6,
+    },
+    'soldier_walk': {
+        'frame_size': (100, 100),
+        'damage_scale': 0.0,
+        'frames': [{'hurtbox': (41, 38, 16, 20), 'hitboxes': []}] * 8,
+    },
+    'soldier_attack01': {
+        'frame_size': (100, 100),
+        'damage_scale': 1.0,
+        'frames': [
+            {'hurtbox': (41, 39, 17, 21), 'hitboxes': []},                  # Wind-up
+            {'hurtbox': (41, 33, 19, 27), 'hitboxes': []},
+            {'hurtbox': (41, 34, 20, 26), 'hitboxes': [(52, 30, 12, 16)]},  # Sword raised
+            {'hurtbox': (36, 40, 22, 20), 'hitboxes': [(54, 38, 18, 22)]},  # Swing
+            {'hurtbox': (36, 40, 22, 20), 'hitboxes': [(54, 38, 18, 22)]},
+            {'hurtbox': (36, 40, 22, 20), 'hitboxes': []},                  # Recovery
+        ],
+    },
+}
+
+# Compiled clips keyed by (clip name, scale)
+_compiled_clips = {}
+
+class CompiledClip:
+    """Frame data scaled to the rendered sprite size and mirrored for both facings.
+
+    Boxes are stored as offsets from the sprite's top-left corner so looking up
+    the active boxes each frame is a tuple index plus a rect move.
+    """
+
+    def __init__(self, name, data, scale):
+        self.name = name
+        self.damage_scale = data['damage_scale']
+        self.frame_count = len(data['frames'])
+
+        frame_width = int(data['frame_size'][0] * scale)
+
+        def scale_box(box, facing_right):
+            x, y, w, h = (int(v * scale) for v in box)
+            if not facing_right:
+                # Mirror around the frame, matching pygame.transform.flip
+                x = frame_width - x - w
+            return pygame.Rect(x, y, w, h)
+
+        # Index with [facing_right][frame]
+        self.hitboxes = {
+            facing: tuple(tuple(scale_box(box, facing) for box in frame['hitboxes']) for frame in data['frames'])
+            for facing in (True, False)
+        }
+        self.hurtboxes = {
+            facing: tuple(scale_box(frame['hurtbox'], facing) for frame in data['frames'])
+            for facing in (True, False)
+        }
+
+        # Frames with any hitbox, so inactive frames skip collision entirely
+        self.active_frames = frozenset(i for i, frame in enumerate(data['frames']) if frame['hitboxes'])
+
+    def get_hitboxes(self, frame, facing_right, origin):
+        """Return world-space hitboxes for a frame, or an empty tuple."""
+        if frame not in self.active_frames:
+            return ()
+        return tuple(box.move(origin) for box in self.hitboxes[facing_right][frame])
+
+    def get_hurtbox(self, frame, facing_right, origin):
+        """Return the world-space hurtbox for a frame."""
+        return self.hurtboxes[facing_right][frame % self.frame_count].move(origin)
+
+def compile_clip(name, scale=1.0):
+    """Compile a clip from CLIP_DATA once and reuse it for every caller.
+
+    Args:
+        name (str): Key into CLIP_DATA
+        scale (float): Sprite scale factor used when rendering the clip
+
+    Returns:
+        CompiledClip: Scaled, mirrored frame data
+    """
+    key = (name, scale)
+    if key not in _compiled_clips:
+        _compiled_clips[key] = CompiledClip(name, CLIP_DATA[name], scale)
+    return _compiled_clips[key]
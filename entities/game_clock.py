@@ -0,0 +1,22 @@
+class GameClock:
+    """Game time in milliseconds, advanced once per frame by GameLogic.
+
+    Entities read it instead of pygame.time.get_ticks(), so a replay that
+    feeds back the recorded frame times sees the same timings as the
+    session it came from.
+    """
+
+    def __init__(self):
+        self.ticks = 0
+
+    def advance(self, ms):
+        self.ticks += ms
+
+    def reset(self):
+        self.ticks = 0
+
+clock = GameClock()
+
+def get_ticks():
+    """Milliseconds of game time, the drop-in for pygame.time.get_ticks()."""
+    return clock.ticks
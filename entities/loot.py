@@ -0,0 +1,135 @@
+import json
+import numpy as np
+
+class AliasTable:
+    """Weighted random choice in O(1) per draw (Vose's alias method).
+
+    Building the table is O(n) once. Each draw then picks a column
+    uniformly and either keeps it or takes its alias, so a draw costs the
+    same for two outcomes or two thousand, and a batch of draws is two
+    array lookups.
+    """
+
+    def __init__(self, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(weights) == 0 or weights.min() < 0 or weights.sum() <= 0:
+            raise ValueError("Alias table weights must be non-negative with a positive total")
+        count = len(weights)
+        scaled = weights * count / weights.sum()
+        self.probability = np.ones(count, dtype=np.float64)
+        self.alias = np.arange(count, dtype=np.int64)
+
+        small = [i for i in range(count) if scaled[i] < 1.0]
+        large = [i for i in range(count) if scaled[i] >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left over is 1 up to rounding and keeps its own column
+
+    def __len__(self):
+        return len(self.alias)
+
+    def sample(self, rng, size=None):
+        """Outcome indices drawn with the table's weights.
+
+        Args:
+            rng (np.random.Generator): Source of the draws
+            size (int): Number of draws, None for a single int
+        """
+        column = rng.integers(0, len(self.alias), size)
+        keep = rng.random(size) < self.probability[column]
+        return np.where(keep, column, self.alias[column])
+
+class LootTables:
+    """Weighted drop tables for enemy archetypes and zones, loaded from a data file.
+
+    Each kill rolls once on its archetype's table and once on the zone's
+    table. Every table is compiled to an AliasTable when loaded, and kills
+    are rolled in one batch per table, so rewarding a large battle is a few
+    array operations:
+
+        {"tables": {"goblin": [{"item": "Gold", "weight": 60, "min": 2, "max": 6},
+                               {"item": null, "weight": 40}]},
+         "archetypes": {"default": "goblin", "boss": "goblin", "Goblin": "goblin"},
+         "zones": {"default": "goblin"}}
+
+    An entry with a null item drops nothing. "boss" is the table of every boss.
+    """
+
+    def __init__(self, items, tables, archetypes, zones):
+        """
+        Args:
+            items (list): Item names; table entries refer to them by index
+            tables (dict): Table name -> (AliasTable, item indices, min counts, max counts);
+                item index -1 drops nothing
+            archetypes (dict): Archetype name, 'default' or 'boss' -> table name
+            zones (dict): Zone name or 'default' -> table name
+        """
+        self.items = items
+        self.table_names = list(tables)
+        self._tables = [tables[name] for name in self.table_names]
+        index = {name: i for i, name in enumerate(self.table_names)}
+        self._archetypes = {name: index[table] for name, table in archetypes.items()}
+        self._zones = {name: index[table] for name, table in zones.items()}
+
+    @classmethod
+    def load(cls, path):
+        """Read and compile the loot tables in a JSON data file."""
+        with open(path) as f:
+            data = json.load(f)
+
+        items = []
+        item_index = {}
+        tables = {}
+        for name, entries in data['tables'].items():
+            ids = []
+            for entry in entries:
+                item = entry.get('item')
+                if item is not None and item not in item_index:
+                    item_index[item] = len(items)
+                    items.append(item)
+                ids.append(-1 if item is None else item_index[item])
+            tables[name] = (AliasTable([entry['weight'] for entry in entries]),
+                            np.array(ids, dtype=np.int64),
+                            np.array([entry.get('min', 1) for entry in entries], dtype=np.int64),
+                            np.array([entry.get('max', entry.get('min', 1)) for entry in entries], dtype=np.int64))
+
+        for section in ('archetypes', 'zones'):
+            for name, table in data[section].items():
+                if table not in tables:
+                    raise ValueError(f"Loot {section[:-1]} '{name}' uses unknown table '{table}'")
+            if 'default' not in data[section]:
+                raise ValueError(f"Loot {section} need a 'default' table")
+        return cls(items, tables, data['archetypes'], data['zones'])
+
+    def table_for(self, archetype, boss=False):
+        """Table index an enemy rolls on."""
+        if boss:
+            return self._archetypes.get('boss', self._archetypes['default'])
+        return self._archetypes.get(archetype, self._archetypes['default'])
+
+    def roll(self, rng, tables, zone):
+        """Loot for a batch of kills.
+
+        Args:
+            rng (np.random.Generator): Source of the draws
+            tables (list): Table index per kill, from table_for()
+            zone (str): Zone the battle took place in, None for the default zone
+
+        Returns:
+            dict: Item name -> count, only items that dropped
+        """
+        tables = np.asarray(tables, dtype=np.int64)
+        zone_table = self._zones.get(zone, self._zones['default'])
+        counts = np.zeros(len(self.items) + 1, dtype=np.int64)  # Last slot collects "nothing"
+        kills = np.bincount(tables, minlength=len(self._tables))
+        kills[zone_table] += len(tables)
+        for table in np.flatnonzero(kills).tolist():
+            alias, ids, low, high = self._tables[table]
+            entries = alias.sample(rng, int(kills[table]))
+            amounts = rng.integers(low[entries], high[entries] + 1)
+            np.add.at(counts, ids[entries], amounts)
+        return {self.items[i]: int(counts[i]) for i in np.flatnonzero(counts[:-1]).tolist()}
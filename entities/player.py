@@ -1,11 +1,27 @@
 import pygame
 import os
 import logging
+import math
+from entities import combat, game_clock
+from entities.frame_data import compile_clip
+from entities.ecs import EntityFacade, component_property
+from entities.components import PLAYER, HEALTH, MAX_HEALTH, HEAL_COOLDOWN, VOLLEY_COOLDOWN, HEALTH_BAR
+from config import PIXEL_PERFECT_COLLISION
 
-class Player(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+class Player(EntityFacade, pygame.sprite.Sprite):
+    # Stored in the player's world entity
+    health = component_property(HEALTH)
+    max_health = component_property(MAX_HEALTH)
+    skill3_cooldown = component_property(HEAL_COOLDOWN, "Seconds until healing can be used again.")
+    arrow_cooldown = component_property(VOLLEY_COOLDOWN, "Seconds until the next arrow volley.")
+    
+    def __init__(self, world, x, y):
         super().__init__()
         
+        # Health and cooldowns live in the world so systems can update them in bulk
+        self.attach(world, {PLAYER: None, HEALTH_BAR: None, HEALTH: combat.BASE_HEALTH, MAX_HEALTH: combat.BASE_HEALTH,
+                            HEAL_COOLDOWN: 0, VOLLEY_COOLDOWN: 0})
+        
         # Initialize logger
         self.logger = logging.getLogger(__name__)
         
@@ -15,11 +31,19 @@ class Player(pygame.sprite.Sprite):
         self.animation_speed = 0.15  # Slower for smoother animation
         self.animation_timer = 0
         self.facing_right = True
-        self.last_update_time = pygame.time.get_ticks()
+        self.last_update_time = game_clock.get_ticks()
         
         # Load sprites first
         self.load_sprites()
         
+        # Hitbox/hurtbox frame data for each animation, compiled once
+        self.clips = {
+            "idle": compile_clip('soldier_idle', self.sprite_scale),
+            "walk": compile_clip('soldier_walk', self.sprite_scale),
+            "attack": compile_clip('soldier_attack01', self.sprite_scale),
+        }
+        self.attack_hits = set()  # Enemies already hit by the current swing
+        
         # Position and movement
         self.rect = pygame.Rect(x, y, 150, 150)  # Increased size from 100 to 150
         self.vel_x = 0
@@ -35,32 +59,41 @@ class Player(pygame.sprite.Sprite):
         self.collision_rect.centerx = self.rect.centerx
         self.collision_rect.bottom = self.rect.bottom
         
+        # Box around the character's feet for pixel-perfect wall collision
+        self.build_footprint()
+        
+        # Compiled wall grid, set by the game once a map exists
+        self.collision_map = None
+        
         # Combat properties
-        self.health = 100
-        self.max_health = 100
-        self.attack_power = 10
+        self.attack_power = combat.BASE_ATTACK
         self.is_attacking = False
         self.exp = 0
         self.level = 1
         self.exp_to_next_level = 100  # Always 100 XP per level
         
         # Additional character attributes
-        self.defense = 5           # Reduces damage taken
-        self.critical_chance = 10  # Percentage chance for critical hits (1.5x damage)
-        self.speed = 3             # Affects turn order and dodge chance
+        self.defense = combat.BASE_DEFENSE                  # Reduces damage taken
+        self.critical_chance = combat.BASE_CRITICAL_CHANCE  # Percentage chance for critical hits (1.5x damage)
+        self.speed = combat.BASE_SPEED                      # Affects turn order and dodge chance
+        self.inventory = {}                                 # Item name -> count, filled by battle loot
         
         # Player ID selection
         self.player_id = 1  # Default player ID
         
         # Skill 3 - Health Regeneration
-        self.skill3_cooldown = 0
-        self.skill3_cooldown_max = 180  # 3 seconds at 60 FPS
-        self.skill3_heal_amount = 30  # Increased healing amount
+        self.skill3_cooldown_max = combat.HEAL_COOLDOWN  # Seconds
+        self.skill3_heal_amount = combat.BASE_HEAL_AMOUNT
+        
+        # Ranged skill - Arrow volley
+        self.arrow_cooldown_max = 0.75  # Seconds
+        self.arrow_volley_size = 5
         
     def load_sprites(self):
         """Load and scale sprite animations."""
         # Sprite scaling factor
         scale_factor = 1.5  # Increased from default
+        self.sprite_scale = scale_factor
 
         # Load sprite sheets or create fallback
         try:
@@ -119,6 +152,50 @@ class Player(pygame.sprite.Sprite):
         
         return sprites
     
+    def build_footprint(self):
+        """Measure the character's feet from the lower third of the idle frame."""
+        frame = self.idle_sprites[0]
+        body = frame.get_bounding_rect()
+        feet_height = max(1, body.height // 3)
+        self.footprint_offset = pygame.Rect(body.x, body.bottom - feet_height, body.width, feet_height)
+        
+        # The flipped footprint sits mirrored inside the frame
+        self.footprint_offset_left = self.footprint_offset.copy()
+        self.footprint_offset_left.x = frame.get_width() - self.footprint_offset.right
+    
+    @property
+    def footprint_rect(self):
+        """World-space box around the character's feet."""
+        offset = self.footprint_offset if self.facing_right else self.footprint_offset_left
+        return offset.move(self.rect.topleft)
+    
+    @property
+    def collision_box(self):
+        """Box the collision map moves: the feet when pixel-perfect, else the collision rect."""
+        return self.footprint_rect if PIXEL_PERFECT_COLLISION else self.collision_rect
+    
+    def move_by(self, dx, dy):
+        """Shift the player, sliding along walls when a collision map is set."""
+        # Round half up, as adding a float to a Rect coordinate does, so sub-pixel
+        # velocities (and the tiny leftovers friction leaves) move both ways alike
+        dx = math.floor(dx + 0.5)
+        dy = math.floor(dy + 0.5)
+        
+        if self.collision_map is not None:
+            box = self.collision_box
+            if PIXEL_PERFECT_COLLISION:
+                moved = self.collision_map.move_and_slide(box, dx, dy)
+            else:
+                # Rect walls have exact edges, so stop flush against them rather than at a grid cell
+                moved = self.collision_map.move_and_slide_exact(box, dx, dy)
+            dx = moved.x - box.x
+            dy = moved.y - box.y
+        
+        self.rect.x += dx
+        self.rect.y += dy
+        self.collision_rect.centerx = self.rect.centerx
+        self.collision_rect.bottom = self.rect.bottom
+    
     def _create_fallback_frames(self, color, count):
         """Create simple colored rectangles as fallback sprites."""
         frames = []
@@ -146,7 +223,7 @@ class Player(pygame.sprite.Sprite):
             print(f"Healed for {actual_heal} HP. Health: {self.health}/{self.max_health}")
             return True
         
-        print(f"Healing on cooldown: {self.skill3_cooldown//60 + 1}s remaining")
+        print(f"Healing on cooldown: {math.ceil(self.skill3_cooldown)}s remaining")
         return False
     
     def gain_exp(self, amount):
@@ -177,6 +254,15 @@ class Player(pygame.sprite.Sprite):
             
         return leveled
     
+    def add_items(self, items):
+        """Add loot to the inventory.
+        
+        Args:
+            items (dict): Item name -> count
+        """
+        for item, count in items.items():
+            self.inventory[item] = self.inventory.get(item, 0) + count
+    
     def set_player_id(self, player_id):
         """Set player ID.
         
@@ -190,6 +276,7 @@ class Player(pygame.sprite.Sprite):
         self.exp = 0
         self.level = 1
         self.exp_to_next_level = 100
+        self.inventory = {}
         
         # Print selected player info
         print(f"Selected Player {player_id}")
@@ -202,18 +289,13 @@ class Player(pygame.sprite.Sprite):
         """
         self.level += 1
         
-        # Increase max health by 20 per level
-        self.max_health += 20
-        self.health = self.max_health  # Fully heal on level up
-        
-        # Scale attack power with level (10% increase per level)
-        self.attack_power = round(self.attack_power * 1.1)
-        
-        # Scale healing with level (10% increase per level)
-        self.skill3_heal_amount = round(self.skill3_heal_amount * 1.1)
+        # More max health, attack and healing (see combat.level_up), fully healed
+        self.max_health, self.attack_power, self.skill3_heal_amount = combat.level_up(
+            self.max_health, self.attack_power, self.skill3_heal_amount)
+        self.health = self.max_health
         
         # Increase XP required for next level (30% more per level)
-        self.exp_to_next_level = round(100 * (1.3 ** (self.level - 1)))
+        self.exp_to_next_level = combat.exp_to_next_level(self.level)
         
         level_up_message = f"Level up! Player {self.player_id} is now level {self.level}!"
         stats_message = f"Attack: {self.attack_power}, Defense: {self.defense}, Health: {self.health}/{self.max_health}"
@@ -225,23 +307,14 @@ class Player(pygame.sprite.Sprite):
         return True, level_up_message, stats_message
     
     def update(self):
-        """Update player state, including skill cooldowns."""
+        """Update player movement and animation (cooldowns tick in the world's CooldownSystem)."""
         # Get current time
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         delta_time = (current_time - self.last_update_time) / 1000.0
         self.last_update_time = current_time
         
-        # Reduce skill 3 cooldown
-        if self.skill3_cooldown > 0:
-            self.skill3_cooldown -= 1
-        
         # Update position based on velocity
-        self.rect.x += self.vel_x
-        self.rect.y += self.vel_y
-        
-        # Update collision rect position
-        self.collision_rect.centerx = self.rect.centerx
-        self.collision_rect.bottom = self.rect.bottom
+        self.move_by(self.vel_x, self.vel_y)
         
         # Determine animation state based on current player state
         if self.is_attacking:
@@ -317,16 +390,11 @@ class Player(pygame.sprite.Sprite):
             self.vel_y = 0
         
         # Update position with current velocity
-        self.rect.x += self.vel_x
-        self.rect.y += self.vel_y
+        self.move_by(self.vel_x, self.vel_y)
         
         # Apply friction to slow down
         self.vel_x *= self.friction
         self.vel_y *= self.friction
-        
-        # Update collision rect to follow main rect
-        self.collision_rect.centerx = self.rect.centerx
-        self.collision_rect.bottom = self.rect.bottom
 
     def stop(self):
         """Stop movement smoothly."""
@@ -340,6 +408,19 @@ class Player(pygame.sprite.Sprite):
             self.is_attacking = True
             self.current_frame = 0
             self.animation_timer = 0
+            self.attack_hits.clear()
+    
+    def get_active_hitboxes(self):
+        """Return world-space hitboxes for the current attack frame."""
+        if not self.is_attacking or self.animation_state != "attack":
+            return ()
+        return self.clips["attack"].get_hitboxes(self.current_frame, self.facing_right, self.rect.topleft)
+    
+    @property
+    def hurtbox(self):
+        """World-space hurtbox for the current animation frame."""
+        clip = self.clips.get(self.animation_state, self.clips["idle"])
+        return clip.get_hurtbox(self.current_frame, self.facing_right, self.rect.topleft)
 
     def draw_health_bar(self, surface, x=None, y=None):
         """Draw a health bar above the player."""
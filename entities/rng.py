@@ -0,0 +1,75 @@
+import random
+import zlib
+import numpy as np
+
+# Stream names, one per subsystem
+COMBAT = 'combat'    # Critical hits, dodges and boss skill picks
+AI = 'ai'            # Enemy wandering
+LOOKS = 'looks'      # Enemy colour variations
+WORLD = 'world'      # Map decoration
+EFFECTS = 'effects'  # Particles, never read by gameplay
+SCREEN = 'screen'    # Decoration drawn by render code only
+LOOT = 'loot'        # Battle drops
+
+class RngStreams:
+    """Independent random streams for each subsystem, derived from one session seed.
+
+    Each subsystem draws only from its own stream, so a combat roll does not
+    change because the pause screen drew a few more stars, or because a
+    replay skipped rendering. Streams are reseeded in place, so modules can
+    keep the objects returned by stream() and generator().
+    """
+
+    def __init__(self, seed):
+        self.seed = seed
+        self._streams = {}
+        self._generators = {}
+
+    def _bit_generator(self, name):
+        return np.random.PCG64(np.random.SeedSequence([self.seed, zlib.crc32(name.encode('utf-8'))]))
+
+    def stream(self, name):
+        """random.Random for a subsystem, created on first use."""
+        stream = self._streams.get(name)
+        if stream is None:
+            stream = self._streams[name] = random.Random(f"{self.seed}:{name}")
+        return stream
+
+    def generator(self, name):
+        """NumPy Generator for a subsystem, created on first use."""
+        generator = self._generators.get(name)
+        if generator is None:
+            generator = self._generators[name] = np.random.Generator(self._bit_generator(name))
+        return generator
+
+    def reseed(self, seed):
+        """Restart every stream from a new session seed."""
+        self.seed = seed
+        for name, stream in self._streams.items():
+            stream.seed(f"{seed}:{name}")
+        for name, generator in self._generators.items():
+            generator.bit_generator.state = self._bit_generator(name).state
+
+streams = RngStreams(random.SystemRandom().getrandbits(32))
+
+def stream(name):
+    """random.Random for a subsystem of the running session."""
+    return streams.stream(name)
+
+def generator(name):
+    """NumPy Generator for a subsystem of the running session."""
+    return streams.generator(name)
+
+def seed_session(seed=None):
+    """Reseed every stream for a new session.
+
+    Args:
+        seed (int): Session seed, None for a fresh one
+
+    Returns:
+        int: The seed used, to record alongside the session's input
+    """
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(32)
+    streams.reseed(seed)
+    return seed
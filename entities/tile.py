@@ -1,4 +1,5 @@
 import pygame
+from entities.collision_mask import get_mask
 
 class Tile(pygame.sprite.Sprite):
     def __init__(self, x, y, image, is_wall=False):
@@ -19,3 +20,6 @@ class Tile(pygame.sprite.Sprite):
             self.collision_rect.centery = self.rect.centery
         else:
             self.collision_rect = self.rect
+        
+        # Pixel mask shared with every other tile using the same image
+        self.mask = get_mask(image) if is_wall and image else None
@@ -0,0 +1,65 @@
+import heapq
+from entities import combat
+
+class TurnQueue:
+    """Battle turn order: each combatant acts every action_delay(speed) time units.
+
+    Pending actions sit in a binary heap keyed on the battle time they come
+    due, so the next actor is found in O(log n) however many combatants
+    there are. Entries moved by delay() or dropped by remove() stay in the
+    heap and are skipped when they surface.
+
+    Combatants are any hashable ids; ties go to the one added first.
+    """
+
+    def __init__(self):
+        self.time = 0
+        self._heap = []
+        self._entries = {}  # Combatant -> (sequence number of its live heap entry, due time, speed)
+        self._sequence = 0
+
+    def _push(self, who, due, speed):
+        self._sequence += 1
+        self._entries[who] = (self._sequence, due, speed)
+        heapq.heappush(self._heap, (due, self._sequence, who))
+
+    def add(self, who, speed):
+        """Schedule a combatant's first action one delay from now."""
+        self._push(who, self.time + int(combat.action_delay(speed)), speed)
+
+    def remove(self, who):
+        """Take a combatant out of the order, e.g. once defeated."""
+        self._entries.pop(who, None)
+
+    def _clean(self):
+        """Drop stale entries from the top of the heap."""
+        heap, entries = self._heap, self._entries
+        while heap and (heap[0][2] not in entries or entries[heap[0][2]][0] != heap[0][1]):
+            heapq.heappop(heap)
+
+    def peek(self):
+        """Combatant acting next, or None if the queue is empty."""
+        self._clean()
+        return self._heap[0][2] if self._heap else None
+
+    def pop(self):
+        """Advance battle time to the next action and return who takes it.
+
+        The combatant's following action is scheduled straight away.
+        """
+        self._clean()
+        if not self._heap:
+            return None
+        due, _, who = heapq.heappop(self._heap)
+        self.time = due
+        speed = self._entries[who][2]
+        self._push(who, due + int(combat.action_delay(speed)), speed)
+        return who
+
+    def delay(self, who, amount):
+        """Push a combatant's next action back by amount time units (negative brings it forward)."""
+        _, due, speed = self._entries[who]
+        self._push(who, max(self.time, due + amount), speed)
+
+    def __len__(self):
+        return len(self._entries)
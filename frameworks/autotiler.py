@@ -0,0 +1,149 @@
+import numpy as np
+import pygame
+
+# Neighbour bits of a cell's mask, clockwise from north
+N, NE, E, SE, S, SW, W, NW = 1, 2, 4, 8, 16, 32, 64, 128
+
+# Grid offsets (dx, dy) for each neighbour bit
+_OFFSETS = ((N, 0, -1), (NE, 1, -1), (E, 1, 0), (SE, 1, 1), (S, 0, 1), (SW, -1, 1), (W, -1, 0), (NW, -1, -1))
+
+# Quadrant positions within a tile, as (col, row) in a 2x2 grid
+_QUADRANTS = {'nw': (0, 0), 'ne': (1, 0), 'sw': (0, 1), 'se': (1, 1)}
+
+# The four cells meeting at each corner of a cell: corner -> {position around the vertex: neighbour bit}.
+# None stands for the cell itself.
+_VERTEX_CELLS = {
+    'nw': {'nw': NW, 'ne': N, 'sw': W, 'se': None},
+    'ne': {'nw': N, 'ne': NE, 'sw': None, 'se': E},
+    'sw': {'nw': W, 'ne': None, 'sw': SW, 'se': S},
+    'se': {'nw': None, 'ne': E, 'sw': S, 'se': SE},
+}
+
+# Sheet slices (col, row) for each vertex pattern. Borders in the sheets run
+# through tile centres, so a slice describes the four cells around a vertex.
+_SINGLE_CORNER = {'se': (0, 0), 'sw': (2, 0), 'ne': (0, 2), 'nw': (2, 2)}  # Outer sheet, terrain at one corner
+_MISSING_CORNER = {'se': (0, 0), 'sw': (2, 0), 'ne': (0, 2), 'nw': (2, 2)}  # Inner sheet, background at one corner
+_EDGES = {
+    frozenset(('sw', 'se')): (1, 0),
+    frozenset(('nw', 'ne')): (1, 2),
+    frozenset(('ne', 'se')): (0, 1),
+    frozenset(('nw', 'sw')): (2, 1),
+}
+
+class Autotiler:
+    """Edge and corner tiles for one terrain drawn over a background.
+
+    Takes two 3x3 terrain sheets: an outer sheet showing a patch of terrain
+    on the background, and an inner sheet showing a patch of background on
+    the terrain, which supplies the concave corners. Each terrain cell is
+    assembled from four quadrants, every quadrant picked from the cell and
+    the three neighbours sharing that corner.
+
+    All 256 neighbour masks are resolved once into a lookup table of
+    composed tiles, so autotiling a grid is a few array shifts and one
+    table lookup.
+    """
+
+    def __init__(self, outer_sheet, inner_sheet, base, tile_size):
+        """
+        Args:
+            outer_sheet (pygame.Surface): 3x3 sheet, terrain patch on background
+            inner_sheet (pygame.Surface): 3x3 sheet, background patch on terrain
+            base (pygame.Surface): Plain terrain tile used away from any border
+            tile_size (int): Size in pixels of one rendered tile
+        """
+        self.tile_size = tile_size
+        self.outer = self._slice(outer_sheet)
+        self.inner = self._slice(inner_sheet)
+        self.base = pygame.transform.scale(base, (tile_size, tile_size))
+
+        # Composed tiles, and the tile index for every neighbour mask
+        self.tiles = []
+        self.lookup = np.zeros(256, dtype=np.int16)
+        composed = {}
+        for mask in range(256):
+            sources = tuple(self._quadrant_source(corner, mask) for corner in _QUADRANTS)
+            if sources not in composed:
+                composed[sources] = len(self.tiles)
+                self.tiles.append(self._compose(sources))
+            self.lookup[mask] = composed[sources]
+
+    def _slice(self, sheet):
+        """Scale a 3x3 sheet to the tile size and cut it into slices keyed by (col, row)."""
+        size = self.tile_size
+        sheet = pygame.transform.scale(sheet, (size * 3, size * 3))
+        return {(col, row): sheet.subsurface((col * size, row * size, size, size)).copy()
+                for row in range(3) for col in range(3)}
+
+    def _quadrant_source(self, corner, mask):
+        """(sheet, slice, quadrant) to draw in one corner of a cell with this mask."""
+        cells = _VERTEX_CELLS[corner]
+        solid = {position for position, bit in cells.items() if bit is None or mask & bit}
+        own = next(position for position, bit in cells.items() if bit is None)
+
+        if len(solid) == 4:
+            return ('base', None, own)
+        if len(solid) == 3:
+            missing = ({'nw', 'ne', 'sw', 'se'} - solid).pop()
+            return ('inner', _MISSING_CORNER[missing], own)
+        edge = _EDGES.get(frozenset(solid))
+        if edge is not None:
+            return ('outer', edge, own)
+        # Alone at the vertex, or touching only diagonally
+        return ('outer', _SINGLE_CORNER[own], own)
+
+    def _compose(self, sources):
+        """Build one tile from four (sheet, slice, quadrant) sources."""
+        half = self.tile_size // 2
+        tile = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA)
+        for corner, (sheet, key, quadrant) in zip(_QUADRANTS, sources):
+            source = self.base if sheet == 'base' else getattr(self, sheet)[key]
+            qx, qy = _QUADRANTS[quadrant]
+            cx, cy = _QUADRANTS[corner]
+            tile.blit(source, (cx * half, cy * half), (qx * half, qy * half, half, half))
+        return tile
+
+    @staticmethod
+    def masks(solid):
+        """8-neighbour masks for every cell of a bool grid.
+
+        Cells beyond the grid edge copy their nearest cell, so a grid's own
+        border never shows as a terrain edge.
+
+        Args:
+            solid (np.ndarray): (rows, cols) bool grid, True for terrain cells
+
+        Returns:
+            np.ndarray: (rows, cols) uint8 masks
+        """
+        rows, cols = solid.shape
+        padded = np.pad(solid, 1, mode='edge')
+        mask = np.zeros((rows, cols), dtype=np.uint8)
+        for bit, dx, dy in _OFFSETS:
+            mask |= padded[1 + dy:1 + dy + rows, 1 + dx:1 + dx + cols].astype(np.uint8) * np.uint8(bit)
+        return mask
+
+    def autotile(self, solid):
+        """Tile index for every cell, -1 where the cell isn't terrain."""
+        return np.where(solid, self.lookup[self.masks(solid)], -1).astype(np.int16)
+
+    def update(self, solid, indices, col, row):
+        """Re-autotile only the cells around a changed cell, in place.
+
+        Args:
+            solid (np.ndarray): Terrain grid, already holding the change
+            indices (np.ndarray): Tile indices from autotile() to patch
+            col, row (int): The changed cell
+
+        Returns:
+            tuple: (left, top, right, bottom) cell range that was rewritten
+        """
+        rows, cols = solid.shape
+        left, top = max(col - 1, 0), max(row - 1, 0)
+        right, bottom = min(col + 2, cols), min(row + 2, rows)
+        # Masks near the region need one more ring of cells for context
+        context = solid[max(top - 1, 0):min(bottom + 1, rows), max(left - 1, 0):min(right + 1, cols)]
+        masks = self.masks(context)[top - max(top - 1, 0):, left - max(left - 1, 0):]
+        masks = masks[:bottom - top, :right - left]
+        indices[top:bottom, left:right] = np.where(solid[top:bottom, left:right], self.lookup[masks], -1)
+        return left, top, right, bottom
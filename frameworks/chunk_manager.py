@@ -0,0 +1,223 @@
+import os
+import json
+from collections import OrderedDict
+from frameworks.collision_map import CollisionMap
+
+class Chunk:
+    """One square piece of a streamed world.
+
+    Holds the ground layout, the wall props with their compiled collision
+    grid, and the records of enemies parked here while the chunk is inactive.
+    """
+
+    def __init__(self, cx, cy, size, data, props, collision_map):
+        self.cx = cx
+        self.cy = cy
+        self.size = size                   # Side length in pixels
+        self.x = cx * size
+        self.y = cy * size
+        self.ground = data['ground']       # Rows of tileset names
+        self.prop_records = data['props']  # [name, x, y] for persisting
+        self.props = props                 # Wall tiles
+        self.collision_map = collision_map
+        self.enemy_records = data['enemies']
+        self.active = False
+
+    def to_data(self):
+        """Serialisable form of the chunk, including parked enemies."""
+        return {'ground': self.ground, 'props': self.prop_records, 'enemies': self.enemy_records}
+
+class ChunkManager:
+    """Loads, activates and evicts world chunks around the camera.
+
+    Chunks within load_radius of the camera's chunk are active: their walls
+    and enemies are part of the running world. Chunks ahead of the player's
+    velocity are prefetched one per frame so crossing a boundary rarely has
+    to build anything. Inactive chunks stay cached until more than
+    memory_budget chunks are resident, then the least recently used ones are
+    dropped, and written to save_dir first when one is configured.
+
+    The owner is told about activations and deactivations through
+    on_activate(chunk) and on_deactivate(chunk), and handles spawning or
+    parking the chunk's entities.
+    """
+
+    def __init__(self, map_manager, chunk_tiles, world_chunks, seed=0, load_radius=1,
+                 prefetch_seconds=1.0, memory_budget=32, save_dir=None,
+                 cell_size=4, use_masks=False, fps=60):
+        self.map_manager = map_manager
+        self.chunk_tiles = chunk_tiles
+        self.tile_size = map_manager.tileset['grass'].get_width()
+        self.chunk_size = chunk_tiles * self.tile_size
+        self.world_chunks = world_chunks
+        self.world_size = world_chunks * self.chunk_size
+        self.seed = seed
+        self.load_radius = load_radius
+        self.prefetch_frames = prefetch_seconds * fps
+        self.memory_budget = max(memory_budget, (2 * load_radius + 3) ** 2)
+        self.save_dir = save_dir
+        self.cell_size = cell_size
+        self.use_masks = use_masks
+
+        self.chunks = OrderedDict()  # (cx, cy) -> Chunk, least recently used first
+        self.active = set()
+        self.prefetch_queue = []
+
+        self.on_activate = None
+        self.on_deactivate = None
+
+    def chunk_at(self, x, y):
+        """Chunk coordinates containing a world position."""
+        last = self.world_chunks - 1
+        return (min(max(int(x) // self.chunk_size, 0), last),
+                min(max(int(y) // self.chunk_size, 0), last))
+
+    def _ring(self, center, radius):
+        """Chunk coordinates within radius of a chunk, clipped to the world."""
+        cx, cy = center
+        last = self.world_chunks - 1
+        return {(x, y)
+                for y in range(max(0, cy - radius), min(last, cy + radius) + 1)
+                for x in range(max(0, cx - radius), min(last, cx + radius) + 1)}
+
+    def update(self, x, y, vel_x=0.0, vel_y=0.0):
+        """Stream chunks for a camera centre and the player's velocity.
+
+        Args:
+            x, y (float): Centre of the view in world pixels
+            vel_x, vel_y (float): Player velocity in pixels per frame
+
+        Returns:
+            bool: True if the set of active chunks changed
+        """
+        center = self.chunk_at(x, y)
+        wanted = self._ring(center, self.load_radius)
+        # One ring of hysteresis before deactivating, so walking along a
+        # chunk border doesn't flip chunks in and out
+        keep = self._ring(center, self.load_radius + 1)
+
+        changed = False
+        for key in sorted(wanted - self.active):
+            chunk = self.load(key)
+            chunk.active = True
+            self.active.add(key)
+            if self.on_activate is not None:
+                self.on_activate(chunk)
+            changed = True
+
+        for key in sorted(self.active - keep):
+            chunk = self.chunks[key]
+            chunk.active = False
+            self.active.discard(key)
+            if self.on_deactivate is not None:
+                self.on_deactivate(chunk)
+            changed = True
+
+        # Queue the chunks around where the player will be, then build one per frame
+        ahead = self.chunk_at(x + vel_x * self.prefetch_frames, y + vel_y * self.prefetch_frames)
+        if ahead != center:
+            self.prefetch_queue = sorted(self._ring(ahead, self.load_radius) - set(self.chunks))
+        if self.prefetch_queue:
+            self.load(self.prefetch_queue.pop(0))
+
+        for key in self.active:
+            self.chunks.move_to_end(key)
+        self._evict()
+        return changed
+
+    def load(self, key):
+        """Return a resident chunk, reading or generating it if needed."""
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+
+        data = self._read(key)
+        if data is None:
+            data = self.map_manager.generate_chunk(key[0], key[1], self.chunk_tiles, self.seed)
+
+        props = self.map_manager.build_props(data['props'])
+        origin_x, origin_y = key[0] * self.chunk_size, key[1] * self.chunk_size
+        collision_map = CollisionMap.compile(props, self.chunk_size, self.chunk_size, self.cell_size,
+                                             self.use_masks, origin_x, origin_y,
+                                             self.map_manager.blocked_ground(data['ground']), self.tile_size)
+        chunk = Chunk(key[0], key[1], self.chunk_size, data, props, collision_map)
+        self.chunks[key] = chunk
+        return chunk
+
+    def _evict(self):
+        """Drop least recently used inactive chunks beyond the memory budget."""
+        while len(self.chunks) > self.memory_budget:
+            key = next((key for key in self.chunks if key not in self.active), None)
+            if key is None:
+                return
+            chunk = self.chunks.pop(key)
+            self._write(chunk)
+
+    def _path(self, key):
+        return os.path.join(self.save_dir, f"chunk_{self.seed}_{key[0]}_{key[1]}.json")
+
+    def _read(self, key):
+        """Load a persisted chunk, or None if there isn't one."""
+        if self.save_dir is None:
+            return None
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, chunk):
+        """Persist an evicted chunk so its parked enemies survive."""
+        if self.save_dir is None:
+            return
+        try:
+            os.makedirs(self.save_dir, exist_ok=True)
+            with open(self._path((chunk.cx, chunk.cy)), 'w') as f:
+                json.dump(chunk.to_data(), f)
+        except OSError as e:
+            print(f"Could not save chunk ({chunk.cx}, {chunk.cy}): {e}")
+
+    def save_all(self):
+        """Persist every resident chunk, for example before quitting."""
+        for chunk in self.chunks.values():
+            self._write(chunk)
+
+    def active_chunks(self):
+        """Active chunks in a stable order."""
+        return [self.chunks[key] for key in sorted(self.active)]
+
+    def window(self):
+        """(x, y, width, height) in pixels of the box around all active chunks."""
+        keys = self.active
+        min_x = min(key[0] for key in keys)
+        min_y = min(key[1] for key in keys)
+        max_x = max(key[0] for key in keys)
+        max_y = max(key[1] for key in keys)
+        size = self.chunk_size
+        return (min_x * size, min_y * size, (max_x - min_x + 1) * size, (max_y - min_y + 1) * size)
+
+    def stitch_collision(self):
+        """One collision map covering every active chunk."""
+        x, y, width, height = self.window()
+        return CollisionMap.stitch([chunk.collision_map for chunk in self.active_chunks()],
+                                   width, height, x, y)
+
+    def draw_ground(self, screen, camera, tileset):
+        """Blit the ground tiles under the view with one Surface.blits call."""
+        screen_width, screen_height = screen.get_size()
+        left = -camera.x_offset
+        top = -camera.y_offset
+        tile = self.tile_size
+        size = self.chunk_size
+
+        blits = []
+        first_col, first_row = left // tile, top // tile
+        for row in range(first_row, (top + screen_height) // tile + 1):
+            for col in range(first_col, (left + screen_width) // tile + 1):
+                chunk = self.chunks.get((col * tile // size, row * tile // size))
+                if chunk is None:
+                    continue
+                name = chunk.ground[row % self.chunk_tiles][col % self.chunk_tiles]
+                blits.append((tileset[name], (col * tile + camera.x_offset, row * tile + camera.y_offset)))
+        screen.blits(blits, doreturn=False)
@@ -0,0 +1,358 @@
+import numpy as np
+import pygame
+
+# Solid-pixel arrays, one per shared wall mask
+_solid_cache = {}
+
+# Side in pixels of the buckets that index merged rects for the precise tests
+RECT_BUCKET_SIZE = 64
+
+def _solid_pixels(mask):
+    """Return a cached (height, width) bool array of a mask's set bits."""
+    entry = _solid_cache.get(id(mask))
+    if entry is None or entry[0] is not mask:
+        surface = mask.to_surface(setcolor=(255, 255, 255, 255), unsetcolor=(0, 0, 0, 0))
+        entry = (mask, pygame.surfarray.array_alpha(surface).T > 0)
+        _solid_cache[id(mask)] = entry
+    return entry[1]
+
+def _merge_rects(solid, origin_x=0, origin_y=0):
+    """Greedily merge a pixel grid's solid pixels into few axis-aligned rects.
+
+    Horizontal runs are found per row with NumPy, and a run that repeats
+    exactly on the next row extends the rect above it. Rows equal to the
+    one above only grow the open rects, so only rows where the walls change
+    are scanned.
+    """
+    rows = solid.shape[0]
+    starts = np.r_[0, np.flatnonzero((solid[1:] != solid[:-1]).any(axis=1)) + 1, rows]
+    rects = []
+    open_runs = {}  # (start_col, end_col) -> Rect still growing downwards
+
+    for row, end in zip(starts[:-1].tolist(), starts[1:].tolist()):
+        edges = np.diff(np.r_[0, solid[row], 0].astype(np.int8))
+        next_runs = {}
+        for run in zip(np.flatnonzero(edges == 1).tolist(), np.flatnonzero(edges == -1).tolist()):
+            rect = open_runs.pop(run, None)
+            if rect is None:
+                rect = pygame.Rect(origin_x + run[0], origin_y + row, run[1] - run[0], 0)
+            rect.height += end - row
+            next_runs[run] = rect
+
+        # Runs that did not continue on this row are finished
+        rects.extend(open_runs.values())
+        open_runs = next_runs
+
+    rects.extend(open_runs.values())
+    return rects
+
+class CollisionMap:
+    """Static wall collision compiled once per map.
+
+    Holds a per-cell occupancy grid for O(1) point and cell queries, and
+    the same walls merged at pixel precision into a small set of
+    axis-aligned rects. The grid is the broad phase; where it reports a
+    wall, the rects give the exact answer. Movement sweeps against the grid,
+    or the rects when it has to stop flush against a wall, so its cost
+    depends on the mover's size and speed, not on how many walls the map has.
+
+    The grid covers width x height pixels starting at (origin_x, origin_y),
+    so a map can describe one chunk or a window of a larger world.
+    """
+
+    def __init__(self, width, height, cell_size=8, origin_x=0, origin_y=0):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.cols = -(-width // cell_size)
+        self.rows = -(-height // cell_size)
+        self.grid = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        self.rects = []
+        self._buckets = None
+        self._summed = None
+
+    @classmethod
+    def compile(cls, walls, width, height, cell_size=8, use_masks=False, origin_x=0, origin_y=0,
+                blocked=None, blocked_size=1):
+        """Rasterise wall sprites into an occupancy grid and merge them into rects.
+
+        Args:
+            walls: Iterable of wall sprites (Tile instances)
+            width, height (int): Map size in pixels
+            cell_size (int): Grid resolution in pixels
+            use_masks (bool): Rasterise each wall's pixel mask instead of its collision rect
+            origin_x, origin_y (int): World position of the map's top-left corner
+            blocked (np.ndarray): Optional (rows, cols) bool grid of solid ground, such as water
+            blocked_size (int): Size in pixels of one blocked grid entry
+
+        Returns:
+            CollisionMap: The compiled map
+        """
+        collision_map = cls(width, height, cell_size, origin_x, origin_y)
+
+        # Rasterise at pixel resolution, then reduce each cell with any()
+        canvas = np.zeros((collision_map.rows * cell_size, collision_map.cols * cell_size), dtype=bool)
+        for wall in walls:
+            if use_masks and wall.mask is not None:
+                rect = wall.rect.move(-origin_x, -origin_y)
+                solid = _solid_pixels(wall.mask)
+            else:
+                rect = wall.collision_rect.move(-origin_x, -origin_y)
+                solid = None
+
+            # Clip against the map
+            left, top = max(0, rect.left), max(0, rect.top)
+            right, bottom = min(width, rect.right), min(height, rect.bottom)
+            if left >= right or top >= bottom:
+                continue
+
+            if solid is None:
+                canvas[top:bottom, left:right] = True
+            else:
+                canvas[top:bottom, left:right] |= solid[top - rect.top:bottom - rect.top,
+                                                         left - rect.left:right - rect.left]
+
+        if blocked is not None:
+            # Solid ground tiles, scaled up to pixels
+            solid = np.repeat(np.repeat(blocked, blocked_size, axis=0), blocked_size, axis=1)
+            rows, cols = min(solid.shape[0], height), min(solid.shape[1], width)
+            canvas[:rows, :cols] |= solid[:rows, :cols]
+
+        collision_map.grid[:] = canvas.reshape(collision_map.rows, cell_size,
+                                               collision_map.cols, cell_size).any(axis=(1, 3))
+        collision_map.rects = _merge_rects(canvas, origin_x, origin_y)
+        return collision_map
+
+    @classmethod
+    def stitch(cls, maps, width, height, origin_x=0, origin_y=0):
+        """Combine maps sharing a cell size into one covering a larger window.
+
+        Each map's grid is copied into place, so stitching costs a memory copy
+        per map rather than re-rasterising any walls. Areas no map covers are open.
+        """
+        maps = list(maps)
+        cell_size = maps[0].cell_size if maps else 8
+        collision_map = cls(width, height, cell_size, origin_x, origin_y)
+        for part in maps:
+            col = (part.origin_x - origin_x) // cell_size
+            row = (part.origin_y - origin_y) // cell_size
+            rows, cols = part.grid.shape
+            # Clip parts that hang over the window edge
+            r0, c0 = max(0, -row), max(0, -col)
+            r1 = min(rows, collision_map.rows - row)
+            c1 = min(cols, collision_map.cols - col)
+            if r0 < r1 and c0 < c1:
+                collision_map.grid[row + r0:row + r1, col + c0:col + c1] = part.grid[r0:r1, c0:c1]
+            collision_map.rects.extend(part.rects)
+        return collision_map
+
+    def _rect_buckets(self):
+        """Merged rects indexed by the RECT_BUCKET_SIZE buckets they touch, built on first use."""
+        if self._buckets is None:
+            size = RECT_BUCKET_SIZE
+            self._buckets = {}
+            for rect in self.rects:
+                for by in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                    for bx in range(rect.left // size, (rect.right - 1) // size + 1):
+                        self._buckets.setdefault((bx, by), []).append(rect)
+        return self._buckets
+
+    def colliding_rects(self, rect):
+        """Return the merged wall rects that overlap rect."""
+        if not self.rect_blocked(rect):
+            return []
+        buckets = self._rect_buckets()
+        size = RECT_BUCKET_SIZE
+        found = []
+        for by in range(rect.top // size, (rect.bottom - 1) // size + 1):
+            for bx in range(rect.left // size, (rect.right - 1) // size + 1):
+                for wall in buckets.get((bx, by), ()):
+                    if wall.colliderect(rect) and wall not in found:
+                        found.append(wall)
+        return found
+
+    def points_blocked_exact(self, x, y):
+        """points_blocked, with points in a solid cell checked against the merged rects."""
+        blocked = self.points_blocked(x, y)
+        buckets = None
+        for i in np.flatnonzero(blocked).tolist():
+            if buckets is None:
+                buckets = self._rect_buckets()
+            px, py = int(x[i]), int(y[i])
+            walls = buckets.get((px // RECT_BUCKET_SIZE, py // RECT_BUCKET_SIZE), ())
+            blocked[i] = any(wall.collidepoint(px, py) for wall in walls)
+        return blocked
+
+    def points_blocked(self, x, y):
+        """Vectorised is_blocked_point for arrays of world positions."""
+        cx = (np.asarray(x) - self.origin_x) // self.cell_size
+        cy = (np.asarray(y) - self.origin_y) // self.cell_size
+        inside = (cx >= 0) & (cy >= 0) & (cx < self.cols) & (cy < self.rows)
+        blocked = np.zeros(inside.shape, dtype=bool)
+        blocked[inside] = self.grid[cy[inside].astype(np.int32), cx[inside].astype(np.int32)] != 0
+        return blocked
+
+    def is_blocked_cell(self, cx, cy):
+        """True if the cell is solid. Cells outside the map count as open."""
+        return 0 <= cx < self.cols and 0 <= cy < self.rows and bool(self.grid[cy, cx])
+
+    def is_blocked_point(self, x, y):
+        """True if the world point lies in a solid cell."""
+        return self.is_blocked_cell((int(x) - self.origin_x) // self.cell_size,
+                                    (int(y) - self.origin_y) // self.cell_size)
+
+    def _span(self, start, end, limit):
+        """Clip a half-open pixel span to a half-open cell range."""
+        size = self.cell_size
+        return max(0, start // size), min(limit, (end - 1) // size + 1)
+
+    def rect_blocked(self, rect):
+        """True if any cell under rect is solid."""
+        rect = rect.move(-self.origin_x, -self.origin_y)
+        r0, r1 = self._span(rect.top, rect.bottom, self.rows)
+        c0, c1 = self._span(rect.left, rect.right, self.cols)
+        return r0 < r1 and c0 < c1 and bool(self.grid[r0:r1, c0:c1].any())
+
+    def rects_blocked(self, x, y, width, height):
+        """Vectorised rect_blocked for arrays of rects.
+
+        Uses a summed-area table of the grid, so each rect costs four lookups
+        no matter how large it is.
+
+        Args:
+            x, y (np.ndarray): Top-left corners in pixels
+            width, height (np.ndarray or int): Rect sizes in pixels
+
+        Returns:
+            np.ndarray: Bool per rect, True if any solid cell lies under it
+        """
+        if self._summed is None:
+            self._summed = np.zeros((self.rows + 1, self.cols + 1), dtype=np.int32)
+            self._summed[1:, 1:] = self.grid.cumsum(axis=0, dtype=np.int32).cumsum(axis=1)
+
+        size = self.cell_size
+        x = np.asarray(x).astype(np.int32) - self.origin_x
+        y = np.asarray(y).astype(np.int32) - self.origin_y
+        c0 = np.clip(x // size, 0, self.cols)
+        r0 = np.clip(y // size, 0, self.rows)
+        c1 = np.clip((x + width - 1) // size + 1, 0, self.cols)
+        r1 = np.clip((y + height - 1) // size + 1, 0, self.rows)
+        summed = self._summed
+        return (summed[r1, c1] - summed[r0, c1] - summed[r1, c0] + summed[r0, c0]) > 0
+
+    def walkable_grid(self, cell_size):
+        """Coarsen the grid to cell_size pixels, True where a cell is entirely open.
+
+        cell_size must be a multiple of this map's cell size.
+        """
+        factor = cell_size // self.cell_size
+        rows = -(-self.rows // factor)
+        cols = -(-self.cols // factor)
+        padded = np.zeros((rows * factor, cols * factor), dtype=bool)
+        padded[:self.rows, :self.cols] = self.grid
+        return ~padded.reshape(rows, factor, cols, factor).any(axis=(1, 3))
+
+    def box_walkable_grid(self, cell_size, width, height):
+        """Grid of cell_size pixel cells, True where a width x height box centred on the cell is open.
+
+        This is the walkable grid eroded by a mover's footprint, so a path
+        through it never asks the mover to squeeze past a wall it can't.
+        """
+        rows = -(-self.rows * self.cell_size // cell_size)
+        cols = -(-self.cols * self.cell_size // cell_size)
+        x = self.origin_x + (np.arange(cols) * cell_size + (cell_size - width) // 2)
+        y = self.origin_y + (np.arange(rows) * cell_size + (cell_size - height) // 2)
+        return ~self.rects_blocked(x[None, :], y[:, None], width, height)
+
+    def move_and_slide(self, rect, dx, dy):
+        """Move rect by (dx, dy) one axis at a time, stopping at the first solid cell.
+
+        Blocked motion on one axis does not cancel the other, so movers slide
+        along walls instead of sticking to them.
+
+        Args:
+            rect (pygame.Rect): Collision box of the mover
+            dx, dy (int): Desired movement in pixels
+
+        Returns:
+            pygame.Rect: The moved rect
+        """
+        # Sweep in grid-local coordinates
+        moved = rect.move(-self.origin_x, -self.origin_y)
+        if dx:
+            moved.x += self._sweep_x(moved, int(dx))
+        if dy:
+            moved.y += self._sweep_y(moved, int(dy))
+        return moved.move(self.origin_x, self.origin_y)
+
+    def move_and_slide_exact(self, rect, dx, dy):
+        """move_and_slide that stops flush against the merged wall rects.
+
+        The grid sweep stops at cell edges, up to a cell short of the wall.
+        Here each axis only tests the rects in the swept strip, so the mover
+        ends exactly against the wall's edge.
+        """
+        moved = rect.copy()
+        if dx:
+            for wall in self.colliding_rects(moved.union(moved.move(dx, 0))):
+                # Walls the mover already overlaps don't hold it, so it can walk out
+                if wall.colliderect(moved):
+                    continue
+                dx = min(dx, wall.left - moved.right) if dx > 0 else max(dx, wall.right - moved.left)
+            moved.x += dx
+        if dy:
+            for wall in self.colliding_rects(moved.union(moved.move(0, dy))):
+                if wall.colliderect(moved):
+                    continue
+                dy = min(dy, wall.top - moved.bottom) if dy > 0 else max(dy, wall.bottom - moved.top)
+            moved.y += dy
+        return moved
+
+    def _sweep_x(self, rect, dx):
+        """Return how far rect may move horizontally before hitting a solid column."""
+        size = self.cell_size
+        r0, r1 = self._span(rect.top, rect.bottom, self.rows)
+        if r0 >= r1 or not dx:
+            return dx
+
+        if dx > 0:
+            # Only columns ahead of the current right edge can block
+            c0 = max(0, (rect.right - 1) // size + 1)
+            c1 = min(self.cols, (rect.right - 1 + dx) // size + 1)
+            if c0 < c1:
+                blocked = np.flatnonzero(self.grid[r0:r1, c0:c1].any(axis=0))
+                if len(blocked):
+                    return max(0, (c0 + blocked[0]) * size - rect.right)
+        else:
+            c0 = max(0, (rect.left + dx) // size)
+            c1 = min(self.cols, rect.left // size)
+            if c0 < c1:
+                blocked = np.flatnonzero(self.grid[r0:r1, c0:c1].any(axis=0))
+                if len(blocked):
+                    return min(0, (c0 + blocked[-1] + 1) * size - rect.left)
+        return dx
+
+    def _sweep_y(self, rect, dy):
+        """Return how far rect may move vertically before hitting a solid row."""
+        size = self.cell_size
+        c0, c1 = self._span(rect.left, rect.right, self.cols)
+        if c0 >= c1 or not dy:
+            return dy
+
+        if dy > 0:
+            r0 = max(0, (rect.bottom - 1) // size + 1)
+            r1 = min(self.rows, (rect.bottom - 1 + dy) // size + 1)
+            if r0 < r1:
+                blocked = np.flatnonzero(self.grid[r0:r1, c0:c1].any(axis=1))
+                if len(blocked):
+                    return max(0, (r0 + blocked[0]) * size - rect.bottom)
+        else:
+            r0 = max(0, (rect.top + dy) // size)
+            r1 = min(self.rows, rect.top // size)
+            if r0 < r1:
+                blocked = np.flatnonzero(self.grid[r0:r1, c0:c1].any(axis=1))
+                if len(blocked):
+                    return min(0, (r0 + blocked[-1] + 1) * size - rect.top)
+        return dy
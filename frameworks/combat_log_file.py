@@ -0,0 +1,81 @@
+import struct
+
+MAGIC = b'LCLG'
+COMBAT_LOG_VERSION = 1
+
+# File header: magic and format version, then records until the end of the file
+HEADER = struct.Struct('<4sH')
+
+# Per event: game time in ms, template id, four integer arguments
+RECORD = struct.Struct('<IB4i')
+
+# Template id of a record defining a name: arguments are the name id and the
+# length of the UTF-8 text that follows the record
+NAME_RECORD = 255
+
+class CombatLogError(Exception):
+    """Raised for combat log files that are missing, damaged or from another version."""
+
+class CombatLogWriter:
+    """Streams combat events to a compact binary file as they happen.
+
+    Each event is a fixed 21-byte record written through a buffered file,
+    and each name is written once, the first time an event uses it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.events = 0
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, COMBAT_LOG_VERSION))
+
+    def write(self, ticks, template, args):
+        """Append one event; args is four ints."""
+        self._file.write(RECORD.pack(ticks & 0xFFFFFFFF, template, *args))
+        self.events += 1
+
+    def write_name(self, name_id, text):
+        """Define the text of a name id used by later events."""
+        data = text.encode('utf-8')
+        self._file.write(RECORD.pack(0, NAME_RECORD, name_id, len(data), 0, 0) + data)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.close()
+        print(f"Logged {self.events} combat events to {self.path}")
+
+def read_combat_log(path):
+    """Read back a file written by CombatLogWriter.
+
+    Returns:
+        tuple: (list of (ticks, template id, args tuple), list of names by id)
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        raise CombatLogError(f"Could not read combat log {path}: {e}")
+    if len(data) < HEADER.size:
+        raise CombatLogError("Combat log file is truncated")
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise CombatLogError("Not a combat log file")
+    if version != COMBAT_LOG_VERSION:
+        raise CombatLogError(f"Combat log format version {version} is not supported")
+
+    events = []
+    names = []
+    offset = HEADER.size
+    # A log cut short by a crash still yields every complete record
+    while offset + RECORD.size <= len(data):
+        ticks, template, *args = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        if template == NAME_RECORD:
+            name_id, length = args[0], args[1]
+            names.extend([''] * (name_id + 1 - len(names)))
+            names[name_id] = data[offset:offset + length].decode('utf-8', 'replace')
+            offset += length
+        else:
+            events.append((ticks, template, tuple(args)))
+    return events, names
@@ -0,0 +1,176 @@
+import io
+import os
+import json
+import hashlib
+import numpy as np
+
+# Bump when the compiled layout changes so old caches are rebuilt
+CACHE_VERSION = 1
+
+# Spawn kinds, stored by index in the compiled spawn table
+SPAWN_KINDS = ['player', 'enemy', 'boss']
+
+class MapData:
+    """A map as NumPy arrays plus small object, spawn and region tables.
+
+    ground holds one legend code per tile. legend_tiles names the tile drawn
+    for each code ('grass' and 'path' are filled in by the map manager),
+    legend_blocked marks codes that can't be walked on. Objects are
+    (name index, x, y, is wall) rows, spawns are (kind, name index, x, y,
+    hp, attack, exp) rows, with stats left 0 for enemies since those come
+    from their archetype, and regions are (name index, x, y, width, height)
+    rows, with names looked up in the matching *_names table.
+    """
+
+    def __init__(self, arrays):
+        self.name = str(arrays['name'])
+        self.width, self.height, self.tile_size, seed = arrays['size'].tolist()
+        self.seed = None if seed < 0 else seed
+        self.ground = arrays['ground']
+        self.legend_tiles = arrays['legend_tiles']
+        self.legend_blocked = arrays['legend_blocked']
+        self.objects = arrays['objects']
+        self.object_names = arrays['object_names']
+        self.spawns = arrays['spawns']
+        self.spawn_names = arrays['spawn_names']
+        self.regions = arrays['regions']
+        self.region_names = arrays['region_names']
+
+    @property
+    def blocked(self):
+        """(rows, cols) bool grid of tiles that can't be walked on."""
+        return self.legend_blocked[self.ground]
+
+    def tile_mask(self, tile):
+        """(rows, cols) bool grid of tiles drawn with a legend tile name."""
+        return np.isin(self.ground, np.flatnonzero(self.legend_tiles == tile))
+
+    def object_list(self):
+        """Objects as (tile name, x, y, is wall) tuples."""
+        names = self.object_names
+        return [(str(names[name]), x, y, bool(wall)) for name, x, y, wall in self.objects.tolist()]
+
+    def spawn_list(self, kind):
+        """Spawns of one kind as dicts with name, x, y, hp, attack and exp."""
+        code = SPAWN_KINDS.index(kind)
+        names = self.spawn_names
+        return [{'name': str(names[name]), 'x': x, 'y': y, 'hp': hp, 'attack': attack, 'exp': exp}
+                for spawn_kind, name, x, y, hp, attack, exp in self.spawns.tolist() if spawn_kind == code]
+
+    def region_at(self, x, y):
+        """Name of the first region containing a point, or None."""
+        regions = self.regions
+        inside = ((regions[:, 1] <= x) & (x < regions[:, 1] + regions[:, 3]) &
+                  (regions[:, 2] <= y) & (y < regions[:, 2] + regions[:, 4]))
+        hits = np.flatnonzero(inside)
+        return str(self.region_names[regions[hits[0], 0]]) if len(hits) else None
+
+def compile_map(source):
+    """Turn a JSON map source into the arrays stored in the cache.
+
+    Args:
+        source (dict): Parsed map file
+
+    Returns:
+        dict: Arrays keyed by name, ready for np.savez or MapData
+    """
+    legend = source['legend']
+    symbols = list(legend)
+    codes = {symbol: index for index, symbol in enumerate(symbols)}
+
+    rows = source['ground']
+    try:
+        ground = np.array([[codes[symbol] for symbol in row] for row in rows], dtype=np.uint8)
+    except KeyError as e:
+        raise ValueError(f"Map ground uses {e} which is missing from the legend")
+    except ValueError:
+        raise ValueError("Map ground rows must all be the same length")
+
+    def table(records, fields):
+        """Integer table of records plus the string table their names index."""
+        names = sorted({record[fields[0]] for record in records})
+        index = {name: i for i, name in enumerate(names)}
+        data = np.array([[index[record[fields[0]]]] + [int(record.get(field, 0)) for field in fields[1:]]
+                         for record in records], dtype=np.int32).reshape(len(records), len(fields))
+        return data, np.array(names, dtype=str)
+
+    objects = [dict(record, wall=bool(record.get('wall', False))) for record in source.get('objects', [])]
+    object_table, object_names = table(objects, ('tile', 'x', 'y', 'wall'))
+
+    spawns = [dict(record, name=record.get('name', record['kind'])) for record in source.get('spawns', [])]
+    spawn_table, spawn_names = table(spawns, ('name', 'x', 'y', 'hp', 'attack', 'exp'))
+    kinds = np.array([SPAWN_KINDS.index(record['kind']) for record in spawns], dtype=np.int32)
+    spawn_table = np.column_stack((kinds, spawn_table)).astype(np.int32)
+
+    regions = source.get('regions', [])
+    region_table, region_names = table(regions, ('name', 'x', 'y', 'width', 'height'))
+
+    seed = source.get('seed')
+    return {
+        'version': np.array(CACHE_VERSION),
+        'name': np.array(source.get('name', '')),
+        'size': np.array([source['width'], source['height'], source['tile_size'],
+                          -1 if seed is None else seed], dtype=np.int64),
+        'ground': ground,
+        'legend_tiles': np.array([legend[symbol]['tile'] for symbol in symbols], dtype=str),
+        'legend_blocked': np.array([bool(legend[symbol].get('blocked', False)) for symbol in symbols]),
+        'objects': object_table,
+        'object_names': object_names,
+        'spawns': spawn_table,
+        'spawn_names': spawn_names,
+        'regions': region_table,
+        'region_names': region_names,
+    }
+
+def load_map_data(path, cache_dir=None):
+    """Load a map, compiling its source only when the cache is out of date.
+
+    The cache is an uncompressed .npz of the compiled arrays, tagged with
+    the SHA-1 of the source file, so an edited map is recompiled on its next
+    load and an unchanged one costs a single file read.
+
+    Args:
+        path (str): JSON map source
+        cache_dir (str): Directory for compiled maps, None to always compile
+
+    Returns:
+        MapData: The loaded map
+    """
+    with open(path, 'rb') as f:
+        source_bytes = f.read()
+    source_hash = hashlib.sha1(source_bytes).hexdigest()
+
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = os.path.join(cache_dir, os.path.splitext(os.path.basename(path))[0] + '.npz')
+        arrays = _read_cache(cache_path, source_hash)
+        if arrays is not None:
+            return MapData(arrays)
+
+    arrays = compile_map(json.loads(source_bytes))
+    if cache_path is not None:
+        _write_cache(cache_path, arrays, source_hash)
+    return MapData(arrays)
+
+def _read_cache(cache_path, source_hash):
+    """Compiled arrays from a cache file, or None if it is missing or stale."""
+    try:
+        with open(cache_path, 'rb') as f:
+            data = f.read()
+        with np.load(io.BytesIO(data), allow_pickle=False) as cache:
+            if str(cache['hash']) != source_hash or int(cache['version']) != CACHE_VERSION:
+                return None
+            return {key: cache[key] for key in cache.files}
+    except (OSError, ValueError, KeyError):
+        return None
+
+def _write_cache(cache_path, arrays, source_hash):
+    """Write compiled arrays next to their source hash, replacing any old cache."""
+    try:
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        temp_path = cache_path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            np.savez(f, hash=np.array(source_hash), **arrays)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"Could not cache map {cache_path}: {e}")
@@ -1,13 +1,38 @@
 import pygame
 import os
 import random
+import numpy as np
+from entities import rng
 from entities.tile import Tile
-from config import TILE_SIZE, MAP_WIDTH, MAP_HEIGHT
+from frameworks.collision_map import CollisionMap
+from frameworks.autotiler import Autotiler
+from frameworks.map_loader import load_map_data
+from use_cases.terrain_generator import TerrainGenerator, GROUND, WATER
+from config import TILE_SIZE, COLLISION_CELL_SIZE, PIXEL_PERFECT_COLLISION
+
+# Grass tiles mixed into the base layer
+GRASS_DETAILS = ['grass_detail1', 'grass_detail2', 'grass_detail3', 'grass_detail4', 'grass_detail5']
+
+# Ground tile names by index: plain grass, the five details and water
+GROUND_NAMES = np.array(['grass'] + GRASS_DETAILS + ['water'])
+WATER_INDEX = 6
+
+# Ground that can't be walked on
+BLOCKING_GROUND = ['water']
+
+# Trees grown in forests, by generator tree variant
+TREE_NAMES = [None, 'tree1', 'tree2']
+
+# Enemy archetypes that can appear in generated chunks
+CHUNK_ENEMY_TYPES = ["Goblin", "Skeleton", "Skeleton Archer", "Zombie", "Troll", "Forest Bandit"]
 
 class MapManager:
     def __init__(self):
         self.tiles = pygame.sprite.Group()
         self.walls = pygame.sprite.Group()
+        self.collision_map = None
+        self.map_data = None
+        self._terrain = None
         self.tileset = {}
         self.load_tileset()
     
@@ -50,108 +75,165 @@ class MapManager:
             'bridge': load_and_scale('BRIDGE - DAY.png'),
             'church': load_and_scale('CHURCH - DAY.png'),
         }
+        
+        # Dirt paths whose edges blend into the grass, one tileset entry per composed tile
+        try:
+            self.path_autotiler = Autotiler(
+                pygame.image.load(os.path.join(tileset_path, 'TERRAIN SET 1 - DAY.png')).convert_alpha(),
+                pygame.image.load(os.path.join(tileset_path, 'TERRAIN SET 2 - DAY.png')).convert_alpha(),
+                self.tileset['ground'], self.tileset['ground'].get_width())
+        except (pygame.error, FileNotFoundError, ValueError):
+            # Without the terrain sets paths stay plain ground tiles
+            self.path_autotiler = None
+            self.path_names = None
+        else:
+            self.path_names = np.array([f'path_{index}' for index in range(len(self.path_autotiler.tiles))])
+            for name, tile in zip(self.path_names.tolist(), self.path_autotiler.tiles):
+                self.tileset[name] = tile.convert_alpha()
 
-    def generate_map(self):
-        """Generate the game map with grass variations and decorative elements."""
+    def load_map(self, path, cache_dir=None):
+        """Build the map described by a map file.
+        
+        Args:
+            path (str): JSON map source
+            cache_dir (str): Directory for the compiled map cache
+        
+        Returns:
+            tuple: (tiles, walls) sprite groups
+        """
         # Clear existing tiles
         self.tiles.empty()
         self.walls.empty()
         
-        # Get tile size from a grass tile
-        tile_size = self.tileset['grass'].get_width()
+        self.map_data = map_data = load_map_data(path, cache_dir)
+        tile_size = map_data.tile_size
+        rows, cols = map_data.ground.shape
+        
+        # Base layer - named tiles from the legend, grass with variations and
+        # dirt paths blended into it, all picked for the whole map at once
+        names = map_data.legend_tiles[map_data.ground].astype(object)
+        grass = map_data.tile_mask('grass')
+        terrain = TerrainGenerator(rng.stream(rng.WORLD).getrandbits(32) if map_data.seed is None else map_data.seed)
+        names[grass] = GROUND_NAMES[terrain.details(0, 0, cols, rows)][grass]
+        path = map_data.tile_mask('path')
+        names[path] = self.autotile_paths(path)[path]
+        
+        tileset = self.tileset
+        self.tiles.add([Tile(col * tile_size, row * tile_size, tileset[name])
+                        for row, line in enumerate(names.tolist()) for col, name in enumerate(line)])
         
-        # Base layer - grass with variations
-        for y in range(0, MAP_HEIGHT, tile_size):
-            for x in range(0, MAP_WIDTH, tile_size):
-                # Randomly choose between grass variations
-                if random.random() < 0.7:  # 70% chance of basic grass
-                    grass = Tile(x, y, self.tileset['grass'])
-                else:
-                    # Choose a random grass detail
-                    detail_type = random.choice([
-                        'grass_detail1', 'grass_detail2', 'grass_detail3',
-                        'grass_detail4', 'grass_detail5'
-                    ])
-                    grass = Tile(x, y, self.tileset[detail_type])
-                self.tiles.add(grass)
-        
-        # Add paths and decorative elements
-        self.add_paths()
-        self.add_buildings()
-        self.add_trees()
+        # Buildings, trees and other placed objects
+        for name, x, y, is_wall in map_data.object_list():
+            tile = Tile(x, y, tileset[name], is_wall=is_wall)
+            self.tiles.add(tile)
+            if is_wall:
+                self.walls.add(tile)
+        
+        # Compile walls and blocked ground into a static collision grid for movement queries
+        self.collision_map = CollisionMap.compile(self.walls, map_data.width, map_data.height,
+                                                  COLLISION_CELL_SIZE, PIXEL_PERFECT_COLLISION,
+                                                  blocked=map_data.blocked, blocked_size=tile_size)
         
         return self.tiles, self.walls
     
-    def add_paths(self):
-        """Add dirt paths through the map."""
-        tile_size = self.tileset['ground'].get_width()
-        
-        # Create a main path from left to right
-        y = MAP_HEIGHT // 2 - tile_size // 2
-        for x in range(0, MAP_WIDTH, tile_size):
-            ground = Tile(x, y, self.tileset['ground'])
-            self.tiles.add(ground)
-        
-        # Create a crossing path from top to bottom
-        x = MAP_WIDTH // 2 - tile_size // 2
-        for y in range(0, MAP_HEIGHT, tile_size):
-            ground = Tile(x, y, self.tileset['ground'])
-            self.tiles.add(ground)
+    def generate_chunk(self, cx, cy, chunk_tiles, seed=0):
+        """
+        Describe one chunk of an endless world.
+        
+        The layout only depends on the seed and chunk coordinates, so a chunk
+        that was dropped from memory comes back exactly the same. Grass, bare
+        ground, water and forest come from seeded noise over world tile
+        coordinates, so the terrain runs on seamlessly across chunk edges.
+        
+        Args:
+            cx, cy (int): Chunk coordinates
+            chunk_tiles (int): Tiles per chunk side
+            seed (int): World seed
+        
+        Returns:
+            dict: 'ground' rows of tileset names, 'props' [name, x, y] walls and
+                'enemies' spawn records, all positions in world pixels
+        """
+        rng = random.Random(f"{seed}:{cx}:{cy}")
+        tile_size = self.tileset['grass'].get_width()
+        origin_x = cx * chunk_tiles * tile_size
+        origin_y = cy * chunk_tiles * tile_size
+        
+        # Base layer - terrain for the whole chunk in one go, with a ring of
+        # neighbouring tiles so path edges line up across chunk borders
+        tile_x, tile_y = cx * chunk_tiles - 1, cy * chunk_tiles - 1
+        terrain, detail, trees = self.terrain_generator(seed).generate(tile_x, tile_y, chunk_tiles + 2, chunk_tiles + 2)
+        
+        # Roads every third chunk row and column, so the world has a road grid
+        middle = chunk_tiles // 2
+        columns = np.arange(tile_x, tile_x + chunk_tiles + 2)
+        rows = np.arange(tile_y, tile_y + chunk_tiles + 2)
+        road = (((rows // chunk_tiles) % 3 == 0) & (rows % chunk_tiles == middle))[:, None] | \
+               (((columns // chunk_tiles) % 3 == 0) & (columns % chunk_tiles == middle))[None, :]
+        dirt = (terrain == GROUND) | road
+        paths = self.autotile_paths(dirt)[1:-1, 1:-1]
+        
+        # Props keep a tile clear of the roads
+        verge = road[1:-1, 1:-1] | road[:-2, 1:-1] | road[2:, 1:-1] | road[1:-1, :-2] | road[1:-1, 2:]
+        road, dirt = road[1:-1, 1:-1], dirt[1:-1, 1:-1]
+        terrain, detail, trees = terrain[1:-1, 1:-1], detail[1:-1, 1:-1], trees[1:-1, 1:-1]
+        
+        # Grass and water, then paths on top, and bridges where roads cross water
+        ground = GROUND_NAMES[np.where(terrain == WATER, WATER_INDEX, detail)].astype(object)
+        ground = np.where(dirt, paths, ground)
+        ground[road & (terrain == WATER)] = 'bridge'
+        ground = ground.tolist()
+        
+        # Forest trees off the roads
+        props = []
+        trees[verge] = 0
+        for row, col in np.argwhere(trees).tolist():
+            props.append([TREE_NAMES[trees[row, col]], origin_x + col * tile_size, origin_y + row * tile_size])
+        
+        # Houses and enemies go on open land, away from roads and each other
+        occupied = verge | (terrain == WATER) | (trees > 0)
+        
+        def free_tile():
+            for _ in range(10):
+                col, row = rng.randrange(chunk_tiles), rng.randrange(chunk_tiles)
+                if not occupied[row, col]:
+                    occupied[row, col] = True
+                    return col, row
+            return None
+        
+        for _ in range(rng.randint(0, 2)):
+            tile = free_tile()
+            if tile is not None:
+                props.append(['house1', origin_x + tile[0] * tile_size, origin_y + tile[1] * tile_size])
+        
+        enemies = []
+        for _ in range(rng.randint(0, 3)):
+            tile = free_tile()
+            if tile is not None:
+                enemies.append({
+                    'name': rng.choice(CHUNK_ENEMY_TYPES),
+                    'x': origin_x + tile[0] * tile_size, 'y': origin_y + tile[1] * tile_size, 'health': None,
+                })
+        
+        return {'ground': ground, 'props': props, 'enemies': enemies}
+    
+    def terrain_generator(self, seed):
+        """Noise terrain generator for a world seed, reused between chunks."""
+        if self._terrain is None or self._terrain.seed != (seed & 0xffffffff):
+            self._terrain = TerrainGenerator(seed)
+        return self._terrain
+    
+    def blocked_ground(self, ground):
+        """(rows, cols) bool grid of ground tiles that can't be walked on."""
+        return np.isin(np.array(ground), BLOCKING_GROUND)
     
-    def add_buildings(self):
-        """Add buildings and create collision walls."""
-        tile_size = self.tileset['house1'].get_width()
-        
-        # Add houses at specific positions
-        house_positions = [
-            (MAP_WIDTH // 4, MAP_HEIGHT // 4),
-            (MAP_WIDTH * 3 // 4, MAP_HEIGHT // 4),
-            (MAP_WIDTH // 4, MAP_HEIGHT * 3 // 4),
-            (MAP_WIDTH * 3 // 4, MAP_HEIGHT * 3 // 4),
-        ]
-        
-        for x, y in house_positions:
-            house = Tile(x - tile_size // 2, y - tile_size // 2, self.tileset['house1'], is_wall=True)
-            self.tiles.add(house)
-            self.walls.add(house)
-        
-        # Add church in center
-        church_size = self.tileset['church'].get_width()
-        church = Tile(
-            MAP_WIDTH // 2 - church_size // 2,
-            MAP_HEIGHT // 2 - church_size // 2,
-            self.tileset['church'],
-            is_wall=True
-        )
-        self.tiles.add(church)
-        self.walls.add(church)
+    def autotile_paths(self, solid):
+        """Tileset names for a bool grid of path cells, None where there is no path."""
+        if self.path_autotiler is None:
+            return np.where(solid, 'ground', None)
+        indices = self.path_autotiler.autotile(solid)
+        return np.where(solid, self.path_names[np.maximum(indices, 0)], None)
     
-    def add_trees(self):
-        """Add trees around the map edges."""
-        tile_size = self.tileset['tree1'].get_width()
-        spacing = tile_size * 2
-        
-        # Add trees along edges with random variation
-        for i in range(0, MAP_WIDTH, spacing):
-            if random.random() < 0.7:  # 70% chance to place a tree
-                # Top edge
-                tree = Tile(i, spacing, self.tileset['tree1'], is_wall=True)
-                self.tiles.add(tree)
-                self.walls.add(tree)
-                
-                # Bottom edge
-                tree = Tile(i, MAP_HEIGHT - spacing * 2, self.tileset['tree2'], is_wall=True)
-                self.tiles.add(tree)
-                self.walls.add(tree)
-        
-        for i in range(0, MAP_HEIGHT, spacing):
-            if random.random() < 0.7:
-                # Left edge
-                tree = Tile(spacing, i, random.choice([self.tileset['tree1'], self.tileset['tree2']]), is_wall=True)
-                self.tiles.add(tree)
-                self.walls.add(tree)
-                
-                # Right edge
-                tree = Tile(MAP_WIDTH - spacing * 2, i, random.choice([self.tileset['tree1'], self.tileset['tree2']]), is_wall=True)
-                self.tiles.add(tree)
-                self.walls.add(tree)
+    def build_props(self, props):
+        """Create wall tiles from [name, x, y] prop records."""
+        return [Tile(x, y, self.tileset[name], is_wall=True) for name, x, y in props]
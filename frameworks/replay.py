@@ -0,0 +1,183 @@
+import zlib
+import struct
+import pygame
+
+MAGIC = b'LRPL'
+REPLAY_VERSION = 2
+
+# File header: magic, format version, session seed, screen width and height,
+# and the slot the main menu offered to continue (-1 for none). The rest is
+# one zlib stream of frames, so a session that crashed still replays up to
+# the crash.
+HEADER = struct.Struct('<4sHQHHh')
+
+# Per frame: milliseconds simulated, event count, state checksum after the
+# frame, and bytes of save data the frame loaded (after its events)
+FRAME = struct.Struct('<IHII')
+
+# Per save slot read during a frame: length of the file's bytes that follow,
+# -1 if the slot was empty
+LOAD = struct.Struct('<i')
+
+# Per event: type code, key or button, key modifiers, mouse x, mouse y
+EVENT = struct.Struct('<BiHhh')
+
+# Event types InputController acts on, and their codes in the file
+EVENT_TYPES = (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN)
+EVENT_CODES = {event_type: code for code, event_type in enumerate(EVENT_TYPES)}
+
+class ReplayError(Exception):
+    """Raised for replay files that are missing, damaged or from another version."""
+
+def pack_event(event):
+    """Pack an input event, or return None for events the game ignores."""
+    code = EVENT_CODES.get(event.type)
+    if code is None:
+        return None
+    if event.type == pygame.MOUSEBUTTONDOWN:
+        return EVENT.pack(code, event.button, 0, *event.pos)
+    if event.type == pygame.QUIT:
+        return EVENT.pack(code, 0, 0, 0, 0)
+    return EVENT.pack(code, event.key, getattr(event, 'mod', 0), 0, 0)
+
+def unpack_event(data, offset=0):
+    """Rebuild a pygame event packed by pack_event."""
+    code, key, mod, x, y = EVENT.unpack_from(data, offset)
+    event_type = EVENT_TYPES[code]
+    if event_type == pygame.MOUSEBUTTONDOWN:
+        return pygame.event.Event(event_type, button=key, pos=(x, y))
+    if event_type == pygame.QUIT:
+        return pygame.event.Event(event_type)
+    return pygame.event.Event(event_type, key=key, mod=mod)
+
+class InputRecorder:
+    """Streams each frame's input, frame time and state checksum to a file.
+
+    Frames are compressed as they come and written through a buffered file,
+    so recording costs a few microseconds a frame. Save slots read during
+    the session are stored with the frame that read them, so the replay
+    does not depend on the save files on disk.
+    """
+
+    def __init__(self, path, seed, screen_size, continue_slot=None):
+        self.path = path
+        self.seed = seed
+        self.frames = 0
+        self._loads = []
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, REPLAY_VERSION, seed, *screen_size,
+                                     -1 if continue_slot is None else continue_slot))
+        self._compressor = zlib.compressobj(6)
+
+    def record_load(self, data):
+        """Keep the bytes of a save slot read this frame (None if it was empty)."""
+        self._loads.append(LOAD.pack(-1) if data is None else LOAD.pack(len(data)) + data)
+
+    def record(self, time_delta, events, checksum):
+        """Append one frame."""
+        packed = [data for data in map(pack_event, events) if data is not None]
+        loads = b''.join(self._loads)
+        self._loads.clear()
+        frame = FRAME.pack(time_delta, len(packed), checksum, len(loads)) + b''.join(packed) + loads
+        self._file.write(self._compressor.compress(frame))
+        self.frames += 1
+
+    def close(self):
+        """Finish the compressed stream and close the file."""
+        if self._file.closed:
+            return
+        self._file.write(self._compressor.flush())
+        self._file.close()
+        print(f"Recorded {self.frames} frames to {self.path}")
+
+class InputReplay:
+    """Feeds a recording back frame by frame and checks the state matches.
+
+    Attributes:
+        seed (int): Session seed the recording was made with
+        screen_size (tuple): Screen the session ran at; click positions and
+            the camera depend on it
+        continue_slot (int): Save slot the main menu offered to continue, or None
+        frame (int): Index of the frame last handed out
+        diverged_at (int): First frame whose checksum differed, or None
+    """
+
+    def __init__(self, path):
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            raise ReplayError(f"Could not read replay {path}: {e}")
+        if len(data) < HEADER.size:
+            raise ReplayError("Replay file is truncated")
+        magic, version, self.seed, width, height, continue_slot = HEADER.unpack_from(data)
+        self.screen_size = (width, height)
+        self.continue_slot = None if continue_slot < 0 else continue_slot
+        if magic != MAGIC:
+            raise ReplayError("Not a replay file")
+        if version != REPLAY_VERSION:
+            raise ReplayError(f"Replay format version {version} is not supported")
+
+        # An unfinished stream (the session crashed) still yields every complete frame
+        try:
+            self._body = zlib.decompressobj().decompress(data[HEADER.size:])
+        except zlib.error as e:
+            raise ReplayError(f"Replay file is damaged: {e}")
+        self._offset = 0
+        self._checksum = None
+        self._loads = []
+        self.frame = -1
+        self.diverged_at = None
+
+    def next_frame(self):
+        """Frame time and events of the next frame, or None at the end.
+
+        Returns:
+            tuple: (time_delta in ms, list of pygame events)
+        """
+        body, offset = self._body, self._offset
+        if offset + FRAME.size > len(body):
+            return None
+        time_delta, count, self._checksum, load_size = FRAME.unpack_from(body, offset)
+        offset += FRAME.size
+        if offset + count * EVENT.size + load_size > len(body):
+            return None
+        events = [unpack_event(body, offset + i * EVENT.size) for i in range(count)]
+        offset += count * EVENT.size
+
+        # Save slots this frame read, in the order it read them
+        end = offset + load_size
+        self._loads = []
+        while offset < end:
+            (length,) = LOAD.unpack_from(body, offset)
+            offset += LOAD.size
+            if length < 0:
+                self._loads.append(None)
+            else:
+                self._loads.append(body[offset:offset + length])
+                offset += length
+        self._offset = end
+        self.frame += 1
+        return time_delta, events
+
+    def next_load(self):
+        """Bytes of the save slot the recording read at this point, None if it was empty."""
+        if not self._loads:
+            print(f"Replay frame {self.frame} loads a save the recording did not")
+            return None
+        return self._loads.pop(0)
+
+    def check(self, checksum):
+        """Compare the state after the current frame with the recorded one.
+
+        Returns:
+            bool: False if this is the frame the replay first diverged
+        """
+        expected, self._checksum = self._checksum, None
+        # Nothing to compare once the recording ran out, or after the first divergence
+        if expected is None or self.diverged_at is not None or checksum == expected:
+            return True
+        self.diverged_at = self.frame
+        print(f"Replay diverged at frame {self.frame}: "
+              f"state checksum {checksum:08x}, recorded {expected:08x}")
+        return False
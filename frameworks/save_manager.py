@@ -0,0 +1,228 @@
+import os
+import zlib
+import queue
+import struct
+import threading
+from collections import namedtuple
+import numpy as np
+
+MAGIC = b'LSAV'
+SAVE_VERSION = 2
+
+# File header: magic, format version, save time, compressed payload size, payload CRC-32
+HEADER = struct.Struct('<4sHdII')
+
+# Payload records, all little-endian
+PLAYER_RECORD = struct.Struct('<BHIIiiiiiiffff?')  # id, level, exp, next level exp, health, max health,
+                                                    # attack, defense, crit chance, heal amount, x, y,
+                                                    # heal cooldown, volley cooldown, facing right
+WORLD_RECORD = struct.Struct('<?qHII')  # chunked, seed (-1 for none), strings, spawns, bosses
+STRING_LENGTH = struct.Struct('<H')
+BOSS_RECORD = struct.Struct('<Hi')       # boss spawn index, health
+ITEM_COUNT = struct.Struct('<H')         # inventory entries, each a string and an ITEM_RECORD
+ITEM_RECORD = struct.Struct('<I')        # item count
+SPAWN_RECORD = np.dtype([('name', '<u2'), ('x', '<f4'), ('y', '<f4'), ('health', '<i4')])
+
+# Player fields in PLAYER_RECORD order
+PLAYER_FIELDS = ('player_id', 'level', 'exp', 'exp_to_next_level', 'health', 'max_health', 'attack_power',
+                 'defense', 'critical_chance', 'skill3_heal_amount', 'x', 'y', 'skill3_cooldown',
+                 'arrow_cooldown', 'facing_right')
+
+class Snapshot(namedtuple('Snapshot', ('saved_at', 'player', 'chunked', 'seed', 'map_file',
+                                       'spawn_names', 'spawns', 'bosses', 'inventory'))):
+    """Everything a save restores, copied out of the running game.
+
+    Only plain values and NumPy arrays the game no longer writes to, so a
+    snapshot can be handed to the writer thread while play continues.
+
+    Attributes:
+        saved_at (float): time.time() when it was taken
+        player (dict): Player stats keyed by PLAYER_FIELDS
+        chunked (bool): Whether the world is the streamed chunk world
+        seed (int): World seed, None for an authored map
+        map_file (str): Map source for an authored map, '' otherwise
+        spawn_names (list): Archetype names indexed by spawns['name']
+        spawns (np.ndarray): SPAWN_RECORD per map enemy spawn, health -1 for
+            full health and 0 once defeated
+        bosses (list): (boss spawn index, health) for each boss still alive
+        inventory (dict): Item name -> count the player holds
+    """
+    __slots__ = ()
+
+class SaveError(Exception):
+    """Raised for save files that are missing, damaged or from another version."""
+
+def _pack_string(string):
+    data = string.encode('utf-8')
+    return STRING_LENGTH.pack(len(data)) + data
+
+def _unpack_string(body, offset):
+    """(string, offset after it)"""
+    (length,) = STRING_LENGTH.unpack_from(body, offset)
+    offset += STRING_LENGTH.size
+    return body[offset:offset + length].decode('utf-8'), offset + length
+
+def encode(snapshot):
+    """Pack a snapshot into the compressed, versioned save format."""
+    player = snapshot.player
+    strings = [snapshot.map_file] + list(snapshot.spawn_names)
+    spawns = np.ascontiguousarray(snapshot.spawns, dtype=SPAWN_RECORD)
+
+    parts = [PLAYER_RECORD.pack(*(player[field] for field in PLAYER_FIELDS)),
+             WORLD_RECORD.pack(snapshot.chunked, -1 if snapshot.seed is None else snapshot.seed,
+                               len(strings), len(spawns), len(snapshot.bosses))]
+    parts.extend(_pack_string(string) for string in strings)
+    parts.append(spawns.tobytes())
+    parts.extend(BOSS_RECORD.pack(index, health) for index, health in snapshot.bosses)
+    parts.append(ITEM_COUNT.pack(len(snapshot.inventory)))
+    for item, count in snapshot.inventory.items():
+        parts.append(_pack_string(item) + ITEM_RECORD.pack(count))
+
+    payload = zlib.compress(b''.join(parts), 6)
+    return HEADER.pack(MAGIC, SAVE_VERSION, snapshot.saved_at, len(payload), zlib.crc32(payload)) + payload
+
+def decode(data):
+    """Unpack a save file's bytes.
+
+    Raises:
+        SaveError: If the data isn't a complete save of this version
+    """
+    if len(data) < HEADER.size:
+        raise SaveError("Save file is truncated")
+    magic, version, saved_at, size, crc = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SaveError("Not a save file")
+    if version != SAVE_VERSION:
+        raise SaveError(f"Save format version {version} is not supported")
+    payload = data[HEADER.size:HEADER.size + size]
+    if len(payload) != size or zlib.crc32(payload) != crc:
+        raise SaveError("Save file is damaged")
+
+    body = zlib.decompress(payload)
+    offset = 0
+    player = dict(zip(PLAYER_FIELDS, PLAYER_RECORD.unpack_from(body, offset)))
+    offset += PLAYER_RECORD.size
+    chunked, seed, string_count, spawn_count, boss_count = WORLD_RECORD.unpack_from(body, offset)
+    offset += WORLD_RECORD.size
+
+    strings = []
+    for _ in range(string_count):
+        string, offset = _unpack_string(body, offset)
+        strings.append(string)
+
+    spawns = np.frombuffer(body, dtype=SPAWN_RECORD, count=spawn_count, offset=offset).copy()
+    offset += spawns.nbytes
+    bosses = [BOSS_RECORD.unpack_from(body, offset + i * BOSS_RECORD.size) for i in range(boss_count)]
+    offset += boss_count * BOSS_RECORD.size
+
+    inventory = {}
+    (item_count,) = ITEM_COUNT.unpack_from(body, offset)
+    offset += ITEM_COUNT.size
+    for _ in range(item_count):
+        item, offset = _unpack_string(body, offset)
+        (inventory[item],) = ITEM_RECORD.unpack_from(body, offset)
+        offset += ITEM_RECORD.size
+
+    return Snapshot(saved_at, player, chunked, None if seed < 0 else seed, strings[0], strings[1:], spawns, bosses,
+                    inventory)
+
+def write_atomic(path, data):
+    """Write a file so readers only ever see the old or the complete new contents."""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+class SaveManager:
+    """Numbered save slots on disk, written by a background thread.
+
+    save() only queues a snapshot. Encoding, compression and the atomic file
+    write happen on the writer thread, so the game loop never waits on disk.
+    Slot 0 is the autosave. A read-only manager (used by replays) loads
+    slots but drops every save.
+
+    Attributes:
+        recorder: InputRecorder told the bytes of every slot read, or None
+        replay: InputReplay whose recorded bytes are loaded instead of the
+            slot files, or None
+    """
+
+    def __init__(self, save_dir, slots=3, read_only=False):
+        self.save_dir = save_dir
+        self.slots = slots
+        self.read_only = read_only
+        self.recorder = None
+        self.replay = None
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def path(self, slot):
+        return os.path.join(self.save_dir, f"slot{slot}.sav")
+
+    def save(self, slot, snapshot):
+        """Queue a snapshot to be written to a slot in the background."""
+        if self.read_only:
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='save-writer', daemon=True)
+            self._thread.start()
+        self._queue.put((slot, snapshot))
+
+    def flush(self):
+        """Wait until every queued save is on disk."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            slot, snapshot = self._queue.get()
+            try:
+                os.makedirs(self.save_dir, exist_ok=True)
+                write_atomic(self.path(slot), encode(snapshot))
+            except (OSError, struct.error) as e:
+                print(f"Could not save to slot {slot}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def load(self, slot):
+        """Snapshot stored in a slot, or None if it is empty or unreadable."""
+        data = self._read(slot)
+        if data is None:
+            return None
+        try:
+            return decode(data)
+        except (SaveError, zlib.error, struct.error, ValueError) as e:
+            print(f"Could not load slot {slot}: {e}")
+            return None
+
+    def _read(self, slot):
+        """Raw bytes of a slot, or None if it is empty; a replay gets the recorded bytes."""
+        if self.replay is not None:
+            return self.replay.next_load()
+        try:
+            with open(self.path(slot), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = None
+        except OSError as e:
+            print(f"Could not load slot {slot}: {e}")
+            data = None
+        if self.recorder is not None:
+            self.recorder.record_load(data)
+        return data
+
+    def saved_at(self, slot):
+        """time.time() a slot was saved, read from its header, or None if empty."""
+        try:
+            with open(self.path(slot), 'rb') as f:
+                magic, version, saved_at, _, _ = HEADER.unpack(f.read(HEADER.size))
+        except (OSError, struct.error):
+            return None
+        return saved_at if magic == MAGIC and version == SAVE_VERSION else None
+
+    def latest_slot(self):
+        """Most recently saved slot, or None if there are no saves."""
+        times = [(self.saved_at(slot), slot) for slot in range(self.slots + 1)]
+        times = [item for item in times if item[0] is not None]
+        return max(times)[1] if times else None
@@ -0,0 +1,125 @@
+# Entity categories for filtered queries
+WALL = 'wall'
+ENEMY = 'enemy'
+BOSS = 'boss'
+NPC = 'npc'
+PLAYER = 'player'
+
+class SpatialHash:
+    """Uniform grid mapping cells to the entities whose rects overlap them.
+
+    Each category (walls, enemies, bosses, NPCs, the player) has its own cell
+    table, so filtered queries never look at other kinds of entity. Entities
+    are re-bucketed only when the range of cells they cover changes, so moving
+    within a cell costs a tuple comparison.
+
+    Buckets and results are insertion-ordered dicts used as sets, so queries
+    list entities in the same order on every run rather than in id() order.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}          # category -> {(cx, cy): {entity: None}}
+        self.entity_cells = {}   # entity -> (category, cell range)
+
+    def _cell_range(self, rect):
+        """Return the (min_x, min_y, max_x, max_y) cell span of a rect."""
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def insert(self, entity, category):
+        """Add an entity under a category using its current rect."""
+        cell_range = self._cell_range(entity.rect)
+        self.entity_cells[entity] = (category, cell_range)
+        table = self.cells.setdefault(category, {})
+        min_x, min_y, max_x, max_y = cell_range
+        for cy in range(min_y, max_y + 1):
+            for cx in range(min_x, max_x + 1):
+                table.setdefault((cx, cy), {})[entity] = None
+
+    def remove(self, entity):
+        """Remove an entity if present."""
+        entry = self.entity_cells.pop(entity, None)
+        if entry is None:
+            return
+        category, (min_x, min_y, max_x, max_y) = entry
+        table = self.cells[category]
+        for cy in range(min_y, max_y + 1):
+            for cx in range(min_x, max_x + 1):
+                bucket = table.get((cx, cy))
+                if bucket is not None:
+                    bucket.pop(entity, None)
+                    if not bucket:
+                        del table[(cx, cy)]
+
+    def update(self, entity):
+        """Re-bucket an entity after it moved, only if its cells changed."""
+        entry = self.entity_cells.get(entity)
+        if entry is None:
+            return
+        category, cell_range = entry
+        if cell_range != self._cell_range(entity.rect):
+            self.remove(entity)
+            self.insert(entity, category)
+
+    def _gather(self, cell_range, categories):
+        """Collect every entity in a cell range for the given categories."""
+        found = {}
+        min_x, min_y, max_x, max_y = cell_range
+        for category in categories if categories is not None else self.cells:
+            table = self.cells.get(category)
+            if not table:
+                continue
+            for cy in range(min_y, max_y + 1):
+                for cx in range(min_x, max_x + 1):
+                    bucket = table.get((cx, cy))
+                    if bucket:
+                        found.update(bucket)
+        return found
+
+    def query_rect(self, rect, categories=None):
+        """Return entities whose cells overlap rect (broadphase only).
+
+        Args:
+            rect (pygame.Rect): Area to search
+            categories (tuple): Categories to include, or None for all
+
+        Returns:
+            dict: Candidate entities as keys; callers still do their own precise test
+        """
+        return self._gather(self._cell_range(rect), categories)
+
+    def query_cell(self, cx, cy, categories=None):
+        """Return entities in a single cell."""
+        return self._gather((cx, cy, cx, cy), categories)
+
+    def query_radius(self, x, y, radius, categories=None):
+        """Return entities whose rect lies within radius of a point.
+
+        Args:
+            x, y (float): Centre of the search
+            radius (float): Search radius in pixels
+            categories (tuple): Categories to include, or None for all
+
+        Returns:
+            dict: Entities whose rect is touched by the circle, as keys
+        """
+        size = self.cell_size
+        cell_range = (int((x - radius) // size), int((y - radius) // size),
+                      int((x + radius) // size), int((y + radius) // size))
+        radius_sq = radius * radius
+        found = {}
+        for entity in self._gather(cell_range, categories):
+            # Distance from the point to the closest point on the rect
+            rect = entity.rect
+            dx = max(rect.left - x, 0, x - rect.right)
+            dy = max(rect.top - y, 0, y - rect.bottom)
+            if dx * dx + dy * dy <= radius_sq:
+                found[entity] = None
+        return found
+
+    def clear(self):
+        """Remove every entity."""
+        self.cells.clear()
+        self.entity_cells.clear()
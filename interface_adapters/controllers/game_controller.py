@@ -120,7 +120,7 @@ class GameController:
             
             # Draw battle log
             y_offset = 200
-            for i, log in enumerate(battle.battle_log[-5:]):
+            for i, log in enumerate(battle.battle_log.lines(5)):
                 self.renderer.draw_text(log, 50, y_offset + i * 30)
             
             # Draw actions
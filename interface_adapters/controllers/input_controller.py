@@ -1,9 +1,16 @@
 import pygame
-from config import GameState
+from config import GameState, QUICKSAVE_SLOT
 
 class InputController:
-    def __init__(self, game_logic):
+    def __init__(self, game_logic, recorder=None, replay=None):
         self.game_logic = game_logic
+        
+        # Session recording, or the recording played back instead of live input
+        self.recorder = recorder
+        self.replay = replay
+        self.frame_delta = None  # Recorded frame time while replaying
+        self.frame_events = []
+        
         self.key_config = {
             'move_left': [pygame.K_LEFT, pygame.K_a],
             'move_right': [pygame.K_RIGHT, pygame.K_d],
@@ -11,11 +18,16 @@ class InputController:
             'move_down': [pygame.K_DOWN, pygame.K_s],
             'interact': [pygame.K_e],
             'attack': [pygame.K_SPACE],
+            'ranged_attack': [pygame.K_f],
             'pause': [pygame.K_ESCAPE],
             'confirm': [pygame.K_RETURN],
             'battle_basic': [pygame.K_1],
             'battle_skill': [pygame.K_2],
-            'battle_heal': [pygame.K_3]
+            'battle_heal': [pygame.K_3],
+            'battle_target': [pygame.K_TAB],
+            'quicksave': [pygame.K_F5],
+            'quickload': [pygame.K_F9],
+            'continue': [pygame.K_c]
         }
         # Track movement keys
         self.movement_keys_pressed = {
@@ -29,7 +41,20 @@ class InputController:
         dx = 0
         dy = 0
         
-        for event in pygame.event.get():
+        if self.replay is not None:
+            # Live input can only stop a replay, the game sees the recorded events
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                return False
+            frame = self.replay.next_frame()
+            if frame is None:
+                print("Replay finished")
+                return False
+            self.frame_delta, events = frame
+        else:
+            events = pygame.event.get()
+        self.frame_events = events
+        
+        for event in events:
             if event.type == pygame.QUIT:
                 return False
             
@@ -68,8 +93,22 @@ class InputController:
                     elif self.game_logic.state == GameState.GAME_OVER:
                         self.game_logic.setup_new_game()
                         
+                elif (event.key in self.key_config['continue'] and self.game_logic.state == GameState.MAIN_MENU
+                      and self.game_logic.continue_slot is not None):
+                    # Continue from the most recent save
+                    self.game_logic.load_game(self.game_logic.continue_slot)
+                
+                elif event.key in self.key_config['quicksave'] and self.game_logic.state == GameState.WORLD:
+                    self.game_logic.save_game(QUICKSAVE_SLOT)
+                
+                elif event.key in self.key_config['quickload'] and self.game_logic.state == GameState.WORLD:
+                    self.game_logic.load_game(QUICKSAVE_SLOT)
+                
                 elif event.key in self.key_config['interact'] and self.game_logic.state == GameState.WORLD:
                     self.game_logic.handle_interaction()
+                
+                elif event.key in self.key_config['ranged_attack'] and self.game_logic.state == GameState.WORLD:
+                    self.game_logic.handle_ranged_attack()
                     
                 elif event.key in self.key_config['pause']:
                     # Handle pause functionality based on current state
@@ -100,6 +139,8 @@ class InputController:
                         self.game_logic.handle_battle_input("skill")
                     elif event.key in self.key_config['battle_heal']:
                         self.game_logic.handle_battle_input("heal")
+                    elif event.key in self.key_config['battle_target']:
+                        self.game_logic.handle_battle_input("target")
             
             elif event.type == pygame.KEYUP:
                 # Handle movement key releases
@@ -123,6 +164,9 @@ class InputController:
                         self.game_logic.handle_attack()
                     elif self.game_logic.state == GameState.BATTLE:
                         self.game_logic.handle_battle_input("basic_attack")
+                elif event.button == 3 and self.game_logic.state == GameState.WORLD:  # Right click
+                    # Click-to-move
+                    self.game_logic.handle_move_to(event.pos)
         
         # Calculate movement based on currently pressed keys
         if self.game_logic.state == GameState.WORLD:
@@ -139,4 +183,11 @@ class InputController:
             # Update player movement
             self.game_logic.handle_movement(dx, dy)
         
-        return True
\ No newline at end of file
+        return True
+    
+    def end_frame(self):
+        """Record the frame just simulated, or check it against the replay."""
+        if self.recorder is not None:
+            self.recorder.record(self.game_logic.frame_delta, self.frame_events, self.game_logic.state_checksum())
+        elif self.replay is not None:
+            self.replay.check(self.game_logic.state_checksum())
@@ -1,4 +1,6 @@
 import pygame
+from entities.ecs import EntityFacade
+from entities.components import HEALTH_BAR
 from config import WHITE, BLACK
 
 class Camera:
@@ -64,8 +66,8 @@ class Renderer:
         for sprite in sprite_group:
             self.draw_sprite(sprite, camera)
             
-            # Draw health bars for entities that have them
-            if hasattr(sprite, 'draw_health_bar'):
+            # Draw health bars for entities tagged to show them
+            if isinstance(sprite, EntityFacade) and sprite.has(HEALTH_BAR):
                 if camera:
                     # Get screen position for health bar
                     screen_rect = camera.apply(sprite)
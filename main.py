@@ -1,21 +1,52 @@
 # main.py
 import pygame
 import sys
+import argparse
+from entities import rng
+from frameworks.replay import InputRecorder, InputReplay, ReplayError
+from frameworks.combat_log_file import CombatLogWriter
 from interface_adapters.controllers.input_controller import InputController
 from use_cases.game_logic import GameLogic
+from config import RNG_SEED
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Lorma Saga")
+    parser.add_argument('--seed', type=int, default=RNG_SEED, help="Session seed for every random stream")
+    parser.add_argument('--record', metavar='FILE', help="Record the session's input to FILE")
+    parser.add_argument('--replay', metavar='FILE', help="Play back a recorded session")
+    parser.add_argument('--fast', action='store_true', help="Replay without the frame rate cap")
+    parser.add_argument('--combat-log', metavar='FILE', help="Stream every battle event to FILE for analysis")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    
+    # A replay runs with the seed it was recorded with
+    replay = None
+    if args.replay:
+        try:
+            replay = InputReplay(args.replay)
+        except ReplayError as e:
+            print(e)
+            sys.exit(1)
+        args.seed = replay.seed
+    seed = rng.seed_session(args.seed)
+    print(f"Session seed {seed}")
+    
     # Initialize Pygame
     pygame.init()
     
     # Initialize the mixer for audio
     pygame.mixer.init()
     
-    # Set up the display in fullscreen mode
-    info = pygame.display.Info()
-    SCREEN_WIDTH = info.current_w
-    SCREEN_HEIGHT = info.current_h
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
+    # Set up the display in fullscreen mode, or in a window the size of a replay's screen
+    if replay is not None:
+        screen = pygame.display.set_mode(replay.screen_size)
+    else:
+        info = pygame.display.Info()
+        SCREEN_WIDTH = info.current_w
+        SCREEN_HEIGHT = info.current_h
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
     pygame.display.set_caption("Lorma Saga")
     
     # Enable key repeat for better control
@@ -23,7 +54,19 @@ def main():
     
     # Initialize game systems
     game_logic = GameLogic()  # GameLogic now creates its own battle and dialogue systems
-    input_controller = InputController(game_logic)
+    recorder = None
+    if args.record:
+        recorder = InputRecorder(args.record, seed, screen.get_size(), game_logic.continue_slot)
+        game_logic.saves.recorder = recorder
+    input_controller = InputController(game_logic, recorder, replay)
+    combat_log_writer = CombatLogWriter(args.combat_log) if args.combat_log else None
+    game_logic.battle_system.battle_log.writer = combat_log_writer
+    if replay is not None:
+        # A replay never writes saves, and loads get the save data the recording
+        # read rather than whatever slot files are on disk now
+        game_logic.saves.read_only = True
+        game_logic.saves.replay = replay
+        game_logic.continue_slot = replay.continue_slot
     
     # Load and play background music
     try:
@@ -38,19 +81,35 @@ def main():
     clock = pygame.time.Clock()
     running = True
     
-    while running:
-        # Process input
-        running = input_controller.process_input()
-        
-        # Update game state
-        game_logic.update()
-        
-        # Render
-        game_logic.render(screen)
-        
-        # Cap the frame rate
-        clock.tick(60)
+    try:
+        while running:
+            # Process input
+            running = input_controller.process_input()
+            
+            # Update game state
+            game_logic.update(input_controller.frame_delta)
+            
+            # Render
+            game_logic.render(screen)
+            
+            # Record or verify the frame
+            input_controller.end_frame()
+            
+            # Cap the frame rate
+            if not args.fast:
+                clock.tick(60)
+    finally:
+        # Finish the recording and combat log however the game ends
+        if recorder is not None:
+            recorder.close()
+        if combat_log_writer is not None:
+            combat_log_writer.close()
     
+    # Autosave the session on exit; a replay never saves
+    if replay is None:
+        game_logic.save_on_exit()
+    else:
+        print("Replay matched" if replay.diverged_at is None else f"Replay diverged at frame {replay.diverged_at}")
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,232 @@
+import math
+import time
+import argparse
+import multiprocessing
+import numpy as np
+from collections import namedtuple
+from entities import combat
+from entities.turn_queue import TurnQueue
+from entities.archetype import ArchetypeRegistry
+from config import ENEMY_DATA_FILE
+
+# Simulator tuning. Kept here rather than in config so worker processes
+# only load the combat kernel and NumPy.
+SIM_BATCH = 100000  # Battles simulated together by one worker task
+SIM_SECONDS_PER_TURN = 1.5  # Assumed time per player turn, for turning the heal cooldown into turns
+SIM_HEAL_BELOW = 0.35  # Simulated player heals below this share of max health
+SIM_MAX_TURNS = 200  # Player actions before a simulated battle is abandoned
+
+# Player strategy: heal below a share of max health when the heal is ready
+# (heal_cooldown_turns player turns after the last heal), otherwise attack
+Policy = namedtuple('Policy', ('heal_below', 'heal_cooldown_turns', 'skill'))
+
+# Outcome of a batch of battles, one entry per battle. Turns count player actions.
+BattleResults = namedtuple('BattleResults', ('won', 'lost', 'turns', 'damage_taken'))
+
+def default_policy():
+    """Always use the skill, heal below SIM_HEAL_BELOW of max health."""
+    cooldown_turns = math.ceil(combat.HEAL_COOLDOWN / SIM_SECONDS_PER_TURN)
+    return Policy(SIM_HEAL_BELOW, cooldown_turns, True)
+
+def simulate_battles(stats, enemy_hp, enemy_attack, count, rng, enemies=1, policy=None,
+                     enemy_speed=combat.ENEMY_SPEED, max_turns=SIM_MAX_TURNS):
+    """Fight count independent battles of one player against identical enemies.
+
+    Every battle advances together: each round is the next action in the
+    turn order, taken in all battles still running, and every dice roll of
+    the round is drawn as one array.
+
+    Args:
+        stats (PlayerStats): Player going into each battle at full health
+        enemy_hp, enemy_attack (int): Stats of each enemy
+        count (int): Number of battles
+        rng (np.random.Generator): Source of the dice rolls
+        enemies (int): Enemies per battle; the skill hits all, the basic attack one
+        policy (Policy): Player strategy, default_policy() if None
+        enemy_speed (int): Enemy speed, setting the turn order
+        max_turns (int): Player actions before a battle counts as neither won nor lost
+
+    Returns:
+        BattleResults
+    """
+    policy = policy or default_policy()
+    health = np.full(count, stats.max_health, dtype=np.int64)
+    foes = np.full((count, enemies), enemy_hp, dtype=np.int64)
+    cooldown = np.zeros(count, dtype=np.int32)
+    turns = np.zeros(count, dtype=np.int32)
+    damage_taken = np.zeros(count, dtype=np.int64)
+    won = np.zeros(count, dtype=bool)
+    lost = np.zeros(count, dtype=bool)
+    running = np.arange(count)
+
+    dodge = combat.dodge_chance(stats.speed)
+    hit = combat.enemy_damage(enemy_attack, stats.defense)
+    heal_threshold = policy.heal_below * stats.max_health
+
+    # Speeds are the same in every battle, so they all share one turn order;
+    # a defeated enemy just skips its turns
+    order = TurnQueue()
+    order.add("player", stats.speed)
+    for enemy in range(enemies):
+        order.add(enemy, enemy_speed)
+
+    while len(running):
+        who = order.pop()
+        if who == "player":
+            heals = (cooldown[running] <= 0) & (health[running] < heal_threshold)
+            healing = running[heals]
+            health[healing] = combat.apply_heal(health[healing], stats.max_health, stats.heal_amount)
+            cooldown[healing] = policy.heal_cooldown_turns  # Ticks down with this turn
+
+            attacking = running[~heals]
+            if policy.skill:
+                # The skill hits every enemy
+                critical = combat.roll_succeeds(rng.integers(1, 101, size=(len(attacking), enemies)),
+                                                stats.critical_chance)
+                foes[attacking] = np.maximum(0, foes[attacking] - combat.attack_damage(stats.attack_power, True, critical))
+            else:
+                # The basic attack hits the first enemy still standing
+                target = np.argmax(foes[attacking] > 0, axis=1)
+                critical = combat.roll_succeeds(rng.integers(1, 101, size=len(attacking)), stats.critical_chance)
+                damage = combat.attack_damage(stats.attack_power, False, critical)
+                foes[attacking, target] = np.maximum(0, foes[attacking, target] - damage)
+
+            cooldown[running] -= 1
+            turns[running] += 1
+            winners = attacking[(foes[attacking] <= 0).all(axis=1)]
+            won[winners] = True
+            running = running[~won[running] & (turns[running] < max_turns)]
+        else:
+            attackers = running[foes[running, who] > 0]
+            dodged = combat.roll_succeeds(rng.integers(1, 101, size=len(attackers)), dodge)
+            struck = attackers[~dodged]
+            health[struck] -= hit
+            damage_taken[struck] += hit
+            fallen = health[running] <= 0
+            lost[running[fallen]] = True
+            running = running[~fallen]
+
+    return BattleResults(won, lost, turns, damage_taken)
+
+def _run_task(task):
+    """Pool worker: simulate one batch and reduce it to counts and histograms."""
+    level, name, enemy_hp, enemy_attack, count, enemies, policy, seed = task
+    results = simulate_battles(combat.player_stats(level), enemy_hp, enemy_attack, count,
+                               np.random.default_rng(seed), enemies, policy)
+    return ((level, name), count, int(results.won.sum()), int(results.lost.sum()),
+            np.bincount(results.turns[results.won]), np.bincount(results.damage_taken))
+
+def _add_histograms(a, b):
+    if a is None:
+        return b
+    if len(a) < len(b):
+        a, b = b, a
+    a = a.copy()
+    a[:len(b)] += b
+    return a
+
+def _percentile(histogram, q):
+    """Value below which q percent of a histogram's samples fall."""
+    if histogram is None or histogram.sum() == 0:
+        return 0
+    cumulative = np.cumsum(histogram)
+    return int(np.searchsorted(cumulative, cumulative[-1] * q / 100.0))
+
+def _mean(histogram):
+    if histogram is None or histogram.sum() == 0:
+        return 0.0
+    return float(np.dot(np.arange(len(histogram)), histogram) / histogram.sum())
+
+def run_simulation(levels, archetypes, battles, enemies=1, policy=None, seed=None, workers=None):
+    """Simulate battles for every (player level, archetype) pair on a process pool.
+
+    Args:
+        levels (list): Player levels
+        archetypes (list): Archetype objects to fight
+        battles (int): Battles per pair, split into SIM_BATCH sized tasks
+        enemies (int): Enemies per battle
+        policy (Policy): Player strategy, default_policy() if None
+        seed (int): Seed for every task's dice, None for a fresh one
+        workers (int): Pool size, None for one per CPU
+
+    Returns:
+        dict: (level, archetype name) -> stats dict
+    """
+    policy = policy or default_policy()
+    tasks = []
+    for level in levels:
+        for archetype in archetypes:
+            for start in range(0, battles, SIM_BATCH):
+                tasks.append([level, archetype.name, archetype.hp, archetype.attack,
+                              min(SIM_BATCH, battles - start), enemies, policy])
+    # Independent dice for every task from one seed
+    for task, task_seed in zip(tasks, np.random.SeedSequence(seed).spawn(len(tasks))):
+        task.append(task_seed)
+
+    totals = {}
+    with multiprocessing.Pool(workers) as pool:
+        for key, count, wins, losses, turns, damage in pool.imap_unordered(_run_task, tasks):
+            total = totals.setdefault(key, {'battles': 0, 'wins': 0, 'losses': 0, 'turns': None, 'damage': None})
+            total['battles'] += count
+            total['wins'] += wins
+            total['losses'] += losses
+            total['turns'] = _add_histograms(total['turns'], turns)
+            total['damage'] = _add_histograms(total['damage'], damage)
+
+    report = {}
+    for key, total in totals.items():
+        report[key] = {
+            'battles': total['battles'],
+            'win_rate': total['wins'] / total['battles'],
+            'timeouts': total['battles'] - total['wins'] - total['losses'],
+            'turns_mean': _mean(total['turns']),
+            'turns_p50': _percentile(total['turns'], 50),
+            'turns_p90': _percentile(total['turns'], 90),
+            'damage_mean': _mean(total['damage']),
+            'damage_p50': _percentile(total['damage'], 50),
+            'damage_p90': _percentile(total['damage'], 90),
+        }
+    return report
+
+def print_report(report):
+    print(f"{'Level':>5}  {'Archetype':<22} {'Win %':>7} {'Turns':>6} {'p50':>4} {'p90':>4} "
+          f"{'Dmg taken':>9} {'p50':>5} {'p90':>5}")
+    for (level, name), row in sorted(report.items()):
+        print(f"{level:>5}  {name:<22} {row['win_rate'] * 100:>6.2f}% {row['turns_mean']:>6.2f} "
+              f"{row['turns_p50']:>4} {row['turns_p90']:>4} {row['damage_mean']:>9.1f} "
+              f"{row['damage_p50']:>5} {row['damage_p90']:>5}")
+
+def parse_levels(text):
+    """'1-5,8' -> [1, 2, 3, 4, 5, 8]"""
+    levels = []
+    for part in text.split(','):
+        low, _, high = part.partition('-')
+        levels.extend(range(int(low), int(high or low) + 1))
+    return levels
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate battles headlessly and report balance numbers")
+    parser.add_argument('--levels', default='1-5', help="Player levels, e.g. 1-5,8")
+    parser.add_argument('--archetypes', help="Comma-separated archetype names (default: all)")
+    parser.add_argument('--battles', type=int, default=100000, help="Battles per level and archetype")
+    parser.add_argument('--enemies', type=int, default=1, help="Enemies per battle")
+    parser.add_argument('--heal-below', type=float, default=SIM_HEAL_BELOW, help="Heal below this share of max health")
+    parser.add_argument('--basic', action='store_true', help="Use the basic attack instead of the skill")
+    parser.add_argument('--seed', type=int, help="Seed for reproducible numbers")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    registry = ArchetypeRegistry.load(ENEMY_DATA_FILE)
+    names = args.archetypes.split(',') if args.archetypes else registry.names
+    policy = default_policy()._replace(heal_below=args.heal_below, skill=not args.basic)
+
+    start = time.perf_counter()
+    report = run_simulation(parse_levels(args.levels), [registry.get(name) for name in names], args.battles,
+                            args.enemies, policy, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+    print_report(report)
+    total = sum(row['battles'] for row in report.values())
+    print(f"{total} battles in {elapsed:.2f}s")
+
+if __name__ == '__main__':
+    main()
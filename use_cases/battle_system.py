@@ -1,20 +1,52 @@
-import random
 import pygame
 import math
+import numpy as np
+from entities import combat, rng
+from entities.components import HEALTH, MAX_HEALTH
+from entities.turn_queue import TurnQueue
+from use_cases import combat_log
+from use_cases.combat_log import CombatLog
+from use_cases.tween_system import TweenSystem, OUT_QUAD, IN_OUT_SINE, YOYO, PINGPONG
+from config import BATTLE_MIN_CELL, BATTLE_MAX_CELL, BATTLE_LUNGE_TIME, BATTLE_FLASH_TIME
 
 class BattleSystem:
     def __init__(self, screen_width=800, screen_height=600, map_width=1600, map_height=1200):
         self.current_turn = "player"
-        self.battle_log = []
+        self.battle_log = CombatLog()
         self.turn_counter = 0
         self.player = None
         self.enemies = []  
         self.battle_active = False
+        self.dice = rng.generator(rng.COMBAT)     # Crits and dodges, rolled for every target at once
+        self.screen_rng = rng.stream(rng.SCREEN)  # Background decoration only
+        
+        # Enemy state as arrays, one entry per enemy in self.enemies
+        self.handles = np.zeros(0, dtype=np.int64)
+        self.enemy_health = np.zeros(0, dtype=np.int64)
+        self.enemy_max_health = np.zeros(0, dtype=np.int64)
+        self.enemy_attack = np.zeros(0, dtype=np.int64)
+        self.target = 0
+        
+        # Who acts next, by speed; enemies due before the player's next action attack together
+        self.turns = TurnQueue()
+        self.attackers = np.zeros(0, dtype=np.int64)
+        
+        # Lunges, hit flashes and idle bobbing; enemies wait for the player's lunge to finish
+        self.tweens = TweenSystem()
+        self.acting = False
         
         # Battle UI elements
         self.font = pygame.font.Font(None, 32)
+        self.name_font = pygame.font.Font(None, 24)
         self.battle_bg_color = (50, 50, 50)
         self.text_color = (255, 255, 255)
+        
+        # Scaled enemy frames and name labels, reused every frame of a battle
+        self._frames = {}
+        self._labels = {}
+        self.log_font = pygame.font.Font(None, 20)
+        self._log_lines = {}  # Event sequence number -> rendered line, for the lines on screen
+        self._layout = None
 
     def start_battle(self, player, enemies):
         """
@@ -29,12 +61,54 @@ class BattleSystem:
         # Ensure enemies is always a list
         self.enemies = [enemies] if not isinstance(enemies, list) else enemies
         
-        # Determine first turn based on highest speed
-        speeds = [enemy.speed for enemy in self.enemies]
-        self.current_turn = "player" if player.speed > max(speeds) else "enemy"
+        # Health lives in the world; the battle works on arrays and writes damage back in one call
+        self.world = player.world
+        self.handles = np.array([enemy.entity for enemy in self.enemies], dtype=np.int64)
+        self.enemy_health = self.world.get_many(self.handles, HEALTH).astype(np.int64)
+        self.enemy_max_health = np.maximum(1, self.world.get_many(self.handles, MAX_HEALTH).astype(np.int64))
+        self.enemy_attack = np.array([enemy.attack for enemy in self.enemies], dtype=np.int64)
+        self.target = 0
+        self._frames.clear()
+        self._layout = None
+        
+        # Idle bobbing, each enemy half a second out of step with the last
+        self.tweens.clear()
+        self.acting = False
+        self.tweens.play(("bob", "player"), -3, 3, 0.63, IN_OUT_SINE, PINGPONG, delay=-0.315)
+        self.tweens.play_many([("bob", i) for i in range(len(self.enemies))], -3, 3, 0.63, IN_OUT_SINE, PINGPONG,
+                              delay=-0.315 - 0.5 * np.arange(len(self.enemies)))
+        
+        # Turn order follows speed; the player goes first on a tie
+        self.turns = TurnQueue()
+        self.turns.add("player", player.speed)
+        for i, enemy in enumerate(self.enemies):
+            self.turns.add(i, enemy.speed)
         
-        self.battle_log = [f"Battle with {', '.join(enemy.name for enemy in self.enemies)} has begun!"]
+        self.battle_log.clear()
+        if len(self.enemies) == 1:
+            self.battle_log.add(combat_log.BATTLE_START, self.battle_log.name_id(self.enemies[0].name))
+        else:
+            self.battle_log.add(combat_log.BATTLE_START_GROUP, len(self.enemies))
         self.battle_active = True
+        self.next_turn()
+    
+    def next_turn(self):
+        """Run the turn order up to the player's next action.
+        
+        Enemies due first are gathered, in order, for enemy_turn(); defeated
+        enemies leave the order as they come up.
+        """
+        attackers = []
+        while True:
+            who = self.turns.pop()
+            if who == "player" or who is None:
+                break
+            if self.enemy_health[who] > 0:
+                attackers.append(who)
+            else:
+                self.turns.remove(who)
+        self.attackers = np.array(attackers, dtype=np.int64)
+        self.current_turn = "enemy" if attackers else "player"
 
     def draw(self, screen):
         """Render the battle screen."""
@@ -51,10 +125,6 @@ class BattleSystem:
         bar_height = 20
         bar_x = x - bar_width // 2
         
-        # Ensure health values are valid
-        if not hasattr(entity, 'health') or not hasattr(entity, 'max_health'):
-            return
-        
         # Prevent division by zero and negative health
         max_health = max(1, entity.max_health)
         current_health = max(0, entity.health)
@@ -78,46 +148,73 @@ class BattleSystem:
             name_rect = name_text.get_rect(center=(x, y - 10))
             screen.blit(name_text, name_rect)
 
+    def living_enemies(self):
+        """Indices of the enemies still standing."""
+        return np.flatnonzero(self.enemy_health > 0)
+    
+    def current_target(self):
+        """Index of the enemy single-target attacks hit, moving on from a fallen target."""
+        if self.enemy_health[self.target] <= 0:
+            living = self.living_enemies()
+            if len(living):
+                # Next standing enemy after the old target, wrapping around
+                self.target = int(living[np.searchsorted(living, self.target) % len(living)])
+        return self.target
+    
+    def next_target(self):
+        """Move the single-target selection to the next standing enemy."""
+        living = self.living_enemies()
+        if len(living):
+            self.target = int(living[np.searchsorted(living, self.target, side='right') % len(living)])
+    
     def player_attack(self, attack_type):
-        for enemy in self.enemies:
-            # Base damage calculation based on attack type
-            if attack_type == "basic":
-                base_damage = self.player.attack_power
-                attack_name = "attacks"
-            elif attack_type == "skill":
-                base_damage = int(self.player.attack_power * 1.5)
-                attack_name = "uses skill on"
-            
-            # Check for critical hit based on critical chance
-            is_critical = False
-            damage = base_damage
-            if hasattr(self.player, 'critical_chance') and random.randint(1, 100) <= self.player.critical_chance:
-                damage = int(damage * 1.5)  # 50% more damage on critical hit
-                is_critical = True
-            
-            # Apply damage to enemy
-            enemy.health = max(0, enemy.health - damage)
-            
-            # Create battle log entry
-            if is_critical:
-                self.battle_log.append(f"CRITICAL HIT! Player {attack_name} {enemy.name} for {damage} damage!")
-            else:
-                self.battle_log.append(f"Player {attack_name} {enemy.name} for {damage} damage!")
+        """Resolve a player attack: the basic attack hits the current target, the skill hits every enemy.
+        
+        Crits, damage and health for all targets are worked out as arrays, so
+        an area skill costs the same few operations against one enemy or fifty.
+        
+        Returns:
+            str: 'victory' if every enemy is down, otherwise None
+        """
+        skill = attack_type == "skill"
+        targets = self.living_enemies() if skill else np.array([self.current_target()])
+        
+        # Critical hits deal 50% more damage
+        critical = combat.roll_succeeds(self.dice.integers(1, 101, size=len(targets)), self.player.critical_chance)
+        damage = np.broadcast_to(combat.attack_damage(self.player.attack_power, skill, critical), targets.shape)
+        
+        # Apply damage to the enemies and their world entities
+        self.enemy_health[targets] = np.maximum(0, self.enemy_health[targets] - damage)
+        self.world.set_many(self.handles[targets], HEALTH, self.enemy_health[targets])
+        self.log_attack(targets, damage, critical, skill)
+        self.animate_player_action(("lunge", "player"))
+        self.tweens.play_many([("flash", i) for i in targets.tolist()], 1, 0, BATTLE_FLASH_TIME)
     
         # Check if all enemies are defeated
-        defeated_enemies = [enemy for enemy in self.enemies if enemy.health <= 0]
-        if len(defeated_enemies) == len(self.enemies):
-            self.battle_log.append(f"All enemies have been defeated!")
+        if not (self.enemy_health > 0).any():
+            self.battle_log.add(combat_log.VICTORY)
             # Award experience points
-            exp_gained = sum(25 for _ in self.enemies)  # 25 XP per enemy
+            exp_gained = int(combat.victory_exp(len(self.enemies)))
             leveled_up = self.player.gain_exp(exp_gained)
-            self.battle_log.append(f"Gained {exp_gained} experience!")
+            self.battle_log.add(combat_log.EXP_GAINED, exp_gained)
             if leveled_up:
-                self.battle_log.append(f"Level Up! Player is now level {self.player.level}!")
+                self.battle_log.add(combat_log.LEVEL_UP, self.player.level)
             return "victory"
     
-        self.current_turn = "enemy"
+        self.next_turn()
         return None
+    
+    def log_attack(self, targets, damage, critical, skill):
+        """Log one event for a player attack, summarising hits on several enemies."""
+        if len(targets) == 1:
+            if skill:
+                template = combat_log.SKILL_CRITICAL if critical[0] else combat_log.SKILL
+            else:
+                template = combat_log.ATTACK_CRITICAL if critical[0] else combat_log.ATTACK
+            self.battle_log.add(template, self.battle_log.name_id(self.enemies[targets[0]].name), int(damage[0]))
+            return
+        defeated = int((self.enemy_health[targets] == 0).sum())
+        self.battle_log.add(combat_log.SKILL_GROUP, len(targets), int(damage.sum()), int(critical.sum()), defeated)
 
     def process_attack(self, player):
         """Process a basic attack from the player."""
@@ -131,13 +228,9 @@ class BattleSystem:
         
     def process_heal(self):
         """Process a healing action from the player."""
-        if not hasattr(self.player, 'skill3_heal_amount'):
-            self.battle_log.append("Healing skill not available!")
-            return None
-        
         # Check if healing is on cooldown
-        if hasattr(self.player, 'skill3_cooldown') and self.player.skill3_cooldown > 0:
-            self.battle_log.append(f"Healing on cooldown: {self.player.skill3_cooldown//60 + 1}s remaining")
+        if self.player.skill3_cooldown > 0:
+            self.battle_log.add(combat_log.HEAL_COOLDOWN, math.ceil(self.player.skill3_cooldown))
             return None
             
         # Calculate healing amount
@@ -145,71 +238,95 @@ class BattleSystem:
         
         # Apply healing (ensure it doesn't exceed max health)
         old_health = self.player.health
-        self.player.health = min(self.player.max_health, self.player.health + heal_amount)
+        self.player.health = int(combat.apply_heal(self.player.health, self.player.max_health, heal_amount))
         actual_heal = self.player.health - old_health
         
         # Set cooldown
         self.player.skill3_cooldown = self.player.skill3_cooldown_max
         
         # Add to battle log
-        self.battle_log.append(f"Player used healing! Restored {actual_heal} HP!")
+        self.battle_log.add(combat_log.HEAL, actual_heal)
         print(f"Healed player for {actual_heal} HP. Current health: {self.player.health}/{self.player.max_health}")
         
-        # Switch turns to enemy
-        self.current_turn = "enemy"
+        # Let the enemies due before the player's next turn act
+        self.animate_player_action(("glow", "player"))
+        self.next_turn()
         return "heal"
     
+    def animate_player_action(self, key):
+        """Play a player action's tween; the enemies' turn waits until it ends."""
+        self.acting = True
+        self.tweens.play(key, 0, 1, BATTLE_LUNGE_TIME, OUT_QUAD, YOYO, on_complete=self.action_finished)
+    
+    def action_finished(self, key):
+        self.acting = False
+    
     def enemy_turn(self):
         """
-        Process enemy turns for multiple enemies.
+        Process the enemy actions due before the player's turn at once.
+        
+        Enemies still attack in turn order (a fast one may act twice) and the
+        player falling ends the turn, found from a running total of the damage
+        instead of a loop.
         
         Returns:
             str: 'defeat' if player is defeated, otherwise None
         """
-        for enemy in self.enemies:
-            if enemy.health > 0:
-                # Check if player dodges the attack based on speed
-                dodge_chance = min(5 + (self.player.speed * 2), 30) if hasattr(self.player, 'speed') else 0
-                if random.randint(1, 100) <= dodge_chance:
-                    # Player dodges the attack
-                    self.battle_log.append(f"{enemy.name} attacks but player dodges!")
-                    continue
-                
-                # Calculate base damage
-                base_damage = enemy.attack
-                
-                # Apply player defense if available
-                if hasattr(self.player, 'defense'):
-                    # Defense reduces damage (minimum 1 damage)
-                    reduced_damage = max(1, base_damage - self.player.defense)
-                    self.player.health -= reduced_damage
-                    self.battle_log.append(f"{enemy.name} attacks player for {reduced_damage} damage! (Reduced by defense)")
-                else:
-                    # No defense attribute, apply full damage
-                    self.player.health -= base_damage
-                    self.battle_log.append(f"{enemy.name} attacks player for {base_damage} damage!")
-                
-                # Check if player is defeated
-                if self.player.health <= 0:
-                    self.battle_log.append("Player defeated!")
-                    return "defeat"
+        attackers = self.attackers
+        if not len(attackers):
+            self.current_turn = "player"
+            return None
+        dodged = combat.roll_succeeds(self.dice.integers(1, 101, size=len(attackers)),
+                                      combat.dodge_chance(self.player.speed))
+        # Defense reduces damage (minimum 1 damage)
+        damage = np.where(dodged, 0, combat.enemy_damage(self.enemy_attack[attackers], self.player.defense))
+        
+        # Attacks up to and including the one that fells the player land
+        dealt = np.cumsum(damage)
+        fatal = np.flatnonzero(dealt >= self.player.health)
+        landed = int(fatal[0]) + 1 if len(fatal) else len(attackers)
+        total = int(dealt[landed - 1]) if landed else 0
+        self.player.health -= total
+        self.log_enemy_attacks(attackers[:landed], damage[:landed], dodged[:landed], total)
+        self.tweens.play_many([("lunge", i) for i in attackers[:landed].tolist()], 0, 1, BATTLE_LUNGE_TIME,
+                              OUT_QUAD, YOYO)
+        if total:
+            self.tweens.play(("flash", "player"), 1, 0, BATTLE_FLASH_TIME)
+        
+        # Check if player is defeated
+        if self.player.health <= 0:
+            self.battle_log.add(combat_log.PLAYER_DEFEATED)
+            return "defeat"
         
         # After all enemies have attacked, switch turn back to player
         self.current_turn = "player"
-        self.battle_log.append("Your turn!")
+        self.battle_log.add(combat_log.YOUR_TURN)
         return None
+    
+    def log_enemy_attacks(self, attackers, damage, dodged, total):
+        """Log an enemy turn, one summary event for several attackers."""
+        if len(attackers) == 1:
+            name_id = self.battle_log.name_id(self.enemies[attackers[0]].name)
+            if dodged[0]:
+                self.battle_log.add(combat_log.ENEMY_DODGED, name_id)
+            else:
+                self.battle_log.add(combat_log.ENEMY_HIT, name_id, int(damage[0]))
+            return
+        dodges = int(dodged.sum())
+        self.battle_log.add(combat_log.ENEMY_GROUP, len(attackers), len(attackers) - dodges, total, dodges)
                 
-    def update(self):
-        """Update battle state, including cooldowns."""
+    def update(self, dt=0.0):
+        """Update battle state (cooldowns tick in the world's CooldownSystem).
+        
+        Args:
+            dt (float): Seconds since the last frame, for the battle animations
+        """
         if not self.battle_active or not self.player:
             return
+        self.tweens.update(dt)
             
-        # Update player cooldowns
-        if hasattr(self.player, 'skill3_cooldown') and self.player.skill3_cooldown > 0:
-            self.player.skill3_cooldown -= 1
-            
-        # Process enemy turn if it's their turn
-        if self.current_turn == "enemy":
+        # Process enemy turn once the player's action has played out
+        if self.current_turn == "enemy" and not self.acting:
             self.enemy_turn()
     
     def is_battle_over(self):
@@ -219,8 +336,7 @@ class BattleSystem:
             return True
         
         # Check if all enemies are defeated
-        defeated_enemies = [enemy for enemy in self.enemies if enemy.health <= 0]
-        return len(defeated_enemies) == len(self.enemies)
+        return not (self.enemy_health > 0).any()
 
     def _draw_battle_background(self, screen):
         """Draw a gradient battle background with decorative elements."""
@@ -234,10 +350,10 @@ class BattleSystem:
         
         # Draw some decorative elements
         for i in range(20):
-            x = random.randint(0, screen_width)
-            y = random.randint(0, screen_height)
-            radius = random.randint(1, 3)
-            alpha = random.randint(50, 150)
+            x = self.screen_rng.randint(0, screen_width)
+            y = self.screen_rng.randint(0, screen_height)
+            radius = self.screen_rng.randint(1, 3)
+            alpha = self.screen_rng.randint(50, 150)
             color = (100, 100, 255, alpha)
             star_surface = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
             pygame.draw.circle(star_surface, color, (radius, radius), radius)
@@ -256,9 +372,7 @@ class BattleSystem:
         self._draw_battle_background(screen)
         
         # Calculate participant positioning
-        num_enemies = len(self.enemies)
         player_x = screen_width // 4
-        enemy_base_x = 3 * screen_width // 4
         y = screen_height // 2
         
         # =====================
@@ -332,11 +446,10 @@ class BattleSystem:
         pygame.draw.rect(char_panel, (100, 100, 255), (exp_bar_x, exp_bar_y, fill_width, exp_bar_height))
         
         # Skill cooldown indicator
-        if hasattr(self.player, 'skill3_cooldown'):
-            skill_cooldown = f"Healing: {'Ready' if self.player.skill3_cooldown <= 0 else f'{self.player.skill3_cooldown}s'}"
-            cooldown_color = (0, 255, 0) if self.player.skill3_cooldown <= 0 else (255, 255, 0)
-            cooldown_text = font_stats.render(skill_cooldown, True, cooldown_color)
-            char_panel.blit(cooldown_text, (10, 220))
+        skill_cooldown = f"Healing: {'Ready' if self.player.skill3_cooldown <= 0 else f'{math.ceil(self.player.skill3_cooldown)}s'}"
+        cooldown_color = (0, 255, 0) if self.player.skill3_cooldown <= 0 else (255, 255, 0)
+        cooldown_text = font_stats.render(skill_cooldown, True, cooldown_color)
+        char_panel.blit(cooldown_text, (10, 220))
         
         # Add panel to screen
         screen.blit(char_panel, (panel_x, panel_y))
@@ -345,12 +458,15 @@ class BattleSystem:
         # Draw Participants
         # =====================
         # Draw player sprite with subtle animation
-        bob_offset = int(math.sin(pygame.time.get_ticks() * 0.005) * 3)
+        bob_offset = int(self.tweens.get(("bob", "player")))
+        player_x += int(self.tweens.get(("lunge", "player")) * 40)
         
         # Create a bright circle behind the player for emphasis
         glow_radius = max(self.player.rect.width, self.player.rect.height) + 20
         glow_surface = pygame.Surface((glow_radius*2, glow_radius*2), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surface, (70, 70, 255, 70), (glow_radius, glow_radius), glow_radius)
+        heal_glow = self.tweens.get(("glow", "player"))  # Turns green while healing
+        glow_color = (70, 70 + int(150 * heal_glow), 255 - int(100 * heal_glow), 70 + int(100 * heal_glow))
+        pygame.draw.circle(glow_surface, glow_color, (glow_radius, glow_radius), glow_radius)
         screen.blit(glow_surface, (player_x - glow_radius, y - glow_radius + bob_offset))
         
         # Draw the player sprite at 1.5x size for better visibility
@@ -359,47 +475,13 @@ class BattleSystem:
         player_pos = (player_x - player_display_width // 2, y - player_display_height // 2 + bob_offset)
         
         # Scale the player image
-        player_image = pygame.transform.scale(self.player.image, (player_display_width, player_display_height))
+        player_image = self._scaled(self.player.image, (player_display_width, player_display_height))
         screen.blit(player_image, player_pos)
+        self._draw_flash(screen, player_image, player_pos, self.tweens.get(("flash", "player")))
         
-        # Draw enemy sprites with spacing proportional to count
-        enemy_spacing = min(150, 300 // num_enemies)  # Adjust spacing based on number of enemies
-        for i, enemy in enumerate(self.enemies):
-            # Create more dynamic positioning for multiple enemies
-            if num_enemies == 1:
-                enemy_x = enemy_base_x
-            else:
-                offset = (i - (num_enemies-1)/2) * enemy_spacing
-                enemy_x = enemy_base_x + offset
-            
-            # Add subtle animation for enemies
-            enemy_bob = int(math.sin((pygame.time.get_ticks() + i*500) * 0.005) * 3)
-            enemy_pos = (enemy_x - enemy.rect.width // 2, y - enemy.rect.height // 2 + enemy_bob)
-            
-            # Draw enlarged enemy sprite for better visibility
-            enlarged_size = (int(enemy.rect.width * 1.5), int(enemy.rect.height * 1.5))
-            enlarged_image = pygame.transform.scale(enemy.image, enlarged_size)
-            screen.blit(enlarged_image, (enemy_pos[0] - enlarged_size[0]//4, enemy_pos[1] - enlarged_size[1]//4))
-            
-            # Draw enemy name and health above the sprite
-            font = pygame.font.Font(None, 24)
-            name_text = font.render(enemy.name, True, (255, 255, 255))
-            name_rect = name_text.get_rect(center=(enemy_x, y - enemy.rect.height - 20))
-            screen.blit(name_text, name_rect)
-            
-            # Draw health bar
-            health_ratio = enemy.health / enemy.max_health
-            health_width = 80
-            health_height = 10
-            health_x = enemy_x - health_width // 2
-            health_y = y - enemy.rect.height - 10
-            
-            # Background
-            pygame.draw.rect(screen, (70, 70, 70), (health_x, health_y, health_width, health_height))
-            # Filled portion
-            fill_width = int(health_width * health_ratio)
-            health_color = (0, 255, 0) if health_ratio > 0.5 else ((255, 165, 0) if health_ratio > 0.25 else (255, 0, 0))
-            pygame.draw.rect(screen, health_color, (health_x, health_y, fill_width, health_height))
+        # Draw enemies in a grid to the right of the player
+        self._draw_enemies(screen, pygame.Rect(screen_width // 2 + 20, 70,
+                                               screen_width // 2 - 40, screen_height - 160))
         
         # =====================
         # Draw Battle Log
@@ -415,17 +497,20 @@ class BattleSystem:
         pygame.draw.rect(log_panel, (255, 255, 255), (0, 0, log_width, log_height), 1)  # White border
         
         # Draw log title
-        font_log_title = pygame.font.Font(None, 24)
-        log_title = font_log_title.render("Battle Log", True, (255, 255, 255))
+        log_title = self._label("Battle Log")
         log_panel.blit(log_title, (log_width//2 - log_title.get_width()//2, 5))
         
-        # Draw log entries
-        font_log = pygame.font.Font(None, 20)
+        # Draw log entries, formatting and rendering each event once while it is shown
+        lines = {}
         entry_y = 30
-        for message in self.battle_log[-4:]:  # Show last 4 messages
-            log_text = font_log.render(message, True, (255, 255, 255))
+        for sequence in self.battle_log.recent(4):  # Show last 4 messages
+            log_text = self._log_lines.get(sequence)
+            if log_text is None:
+                log_text = self.log_font.render(self.battle_log.text(sequence), True, (255, 255, 255))
+            lines[sequence] = log_text
             log_panel.blit(log_text, (10, entry_y))
             entry_y += 22
+        self._log_lines = lines
         
         screen.blit(log_panel, (log_x, log_y))
         
@@ -442,6 +527,107 @@ class BattleSystem:
         if self.current_turn == "player":
             self._draw_battle_buttons(screen)
             
+    def _grid_layout(self, count, area):
+        """Columns, rows and cell size fitting count enemies in area, cached per battle.
+        
+        Cells shrink as enemies are added until BATTLE_MIN_CELL, after which
+        the grid keeps that size and scrolls.
+        """
+        key = (count, area.size)
+        if self._layout is None or self._layout[0] != key:
+            best = (1, count, 0)
+            for columns in range(1, count + 1):
+                rows = math.ceil(count / columns)
+                cell = min(area.width // columns, area.height // rows, BATTLE_MAX_CELL)
+                if cell > best[2]:
+                    best = (columns, rows, cell)
+            if best[2] < BATTLE_MIN_CELL:
+                columns = max(1, area.width // BATTLE_MIN_CELL)
+                best = (columns, math.ceil(count / columns), BATTLE_MIN_CELL)
+            self._layout = (key, best)
+        return self._layout[1]
+    
+    def _scaled(self, image, size):
+        """Sprite image scaled to size, scaled once per battle rather than every frame."""
+        key = (id(image), size)
+        frame = self._frames.get(key)
+        if frame is None:
+            frame = self._frames[key] = pygame.transform.scale(image, size)
+        return frame
+    
+    def _draw_flash(self, screen, frame, pos, strength):
+        """Draw a white copy of a frame over it, fading with strength (0 to 1)."""
+        if strength <= 0:
+            return
+        key = ("flash", id(frame))
+        flash = self._frames.get(key)
+        if flash is None:
+            flash = self._frames[key] = frame.copy()
+            flash.fill((255, 255, 255), special_flags=pygame.BLEND_RGB_MAX)
+        flash.set_alpha(int(200 * strength))
+        screen.blit(flash, pos)
+    
+    def _label(self, text):
+        """Rendered enemy name, kept for the rest of the session."""
+        label = self._labels.get(text)
+        if label is None:
+            label = self._labels[text] = self.name_font.render(text, True, (255, 255, 255))
+        return label
+    
+    def _draw_enemies(self, screen, area):
+        """Draw the standing enemies as a grid, scrolled to keep the target in view."""
+        columns, rows, cell = self._grid_layout(len(self.enemies), area)
+        visible_rows = max(1, area.height // cell)
+        target = self.current_target()
+        first_row = min(max(0, target // columns - visible_rows // 2), max(0, rows - visible_rows))
+        
+        # Centre the grid in the area
+        left = area.x + (area.width - columns * cell) // 2
+        top = area.y + (area.height - min(rows, visible_rows) * cell) // 2
+        show_names = cell >= 96
+        size = int(cell * (0.55 if show_names else 0.7))
+        
+        start = first_row * columns
+        for i in range(start, min(len(self.enemies), start + visible_rows * columns)):
+            health = self.enemy_health[i]
+            if health <= 0:
+                continue
+            enemy = self.enemies[i]
+            row, column = divmod(i - start, columns)
+            cell_x = left + column * cell
+            cell_y = top + row * cell
+            centre_x = cell_x + cell // 2
+            
+            if i == target:
+                pygame.draw.rect(screen, (255, 255, 0), (cell_x + 2, cell_y + 2, cell - 4, cell - 4), 2)
+            
+            # Idle bob, and a lunge towards the player when attacking
+            sprite_x = centre_x - size // 2 - int(self.tweens.get(("lunge", i)) * cell * 0.3)
+            sprite_y = cell_y + (cell - size) // 2 + int(self.tweens.get(("bob", i)))
+            frame = self._scaled(enemy.image, (size, size))
+            screen.blit(frame, (sprite_x, sprite_y))
+            self._draw_flash(screen, frame, (sprite_x, sprite_y), self.tweens.get(("flash", i)))
+            
+            # Draw enemy name above the sprite
+            if show_names:
+                name_text = self._label(enemy.name)
+                screen.blit(name_text, name_text.get_rect(center=(centre_x, cell_y + 12)))
+            
+            # Draw health bar under the sprite
+            health_ratio = health / self.enemy_max_health[i]
+            health_width = cell - 16
+            health_x = cell_x + 8
+            health_y = cell_y + cell - 12
+            pygame.draw.rect(screen, (70, 70, 70), (health_x, health_y, health_width, 6))
+            health_color = (0, 255, 0) if health_ratio > 0.5 else ((255, 165, 0) if health_ratio > 0.25 else (255, 0, 0))
+            pygame.draw.rect(screen, health_color, (health_x, health_y, int(health_width * health_ratio), 6))
+        
+        # Count of standing enemies, useful once the grid scrolls
+        if len(self.enemies) > 1:
+            standing = self.name_font.render(f"{len(self.living_enemies())}/{len(self.enemies)} standing  [Tab] target",
+                                             True, (255, 255, 255))
+            screen.blit(standing, (area.right - standing.get_width(), area.y - 18))
+    
     def _draw_battle_background(self, screen):
         """Draw an enhanced battle background."""
         screen_width = screen.get_width()
@@ -458,8 +644,8 @@ class BattleSystem:
         
         # Draw some decorative lines
         for i in range(10):
-            start_y = random.randint(0, screen_height)
-            end_y = random.randint(0, screen_height)
+            start_y = self.screen_rng.randint(0, screen_height)
+            end_y = self.screen_rng.randint(0, screen_height)
             pygame.draw.line(screen, (0, 0, 50), (0, start_y), (screen_width, end_y), 1)
             
     def _draw_battle_buttons(self, screen):
@@ -0,0 +1,104 @@
+import numpy as np
+from entities import game_clock
+from config import COMBAT_LOG_SIZE
+
+# Message templates, by id
+(BATTLE_START, BATTLE_START_GROUP, ATTACK, ATTACK_CRITICAL, SKILL, SKILL_CRITICAL, SKILL_GROUP,
+ HEAL, HEAL_COOLDOWN, ENEMY_HIT, ENEMY_DODGED, ENEMY_GROUP, YOUR_TURN, PLAYER_DEFEATED, VICTORY,
+ EXP_GAINED, LEVEL_UP, LOOT) = range(18)
+
+# Text of each template, and which of its arguments are name ids
+TEMPLATES = (
+    ("Battle with {0} has begun!", (0,)),
+    ("Battle with {0} enemies has begun!", ()),
+    ("Player attacks {0} for {1} damage!", (0,)),
+    ("CRITICAL HIT! Player attacks {0} for {1} damage!", (0,)),
+    ("Player uses skill on {0} for {1} damage!", (0,)),
+    ("CRITICAL HIT! Player uses skill on {0} for {1} damage!", (0,)),
+    ("Player uses skill on {0} enemies for {1} damage ({2} critical, {3} defeated)!", ()),
+    ("Player used healing! Restored {0} HP!", ()),
+    ("Healing on cooldown: {0}s remaining", ()),
+    ("{0} attacks player for {1} damage! (Reduced by defense)", (0,)),
+    ("{0} attacks but player dodges!", (0,)),
+    ("{0} enemies attack: {1} hit for {2} damage, {3} dodged!", ()),
+    ("Your turn!", ()),
+    ("Player defeated!", ()),
+    ("All enemies have been defeated!", ()),
+    ("Gained {0} experience!", ()),
+    ("Level Up! Player is now level {0}!", ()),
+    ("Found {1} {0}!", (0,)),
+)
+
+MAX_ARGS = 4
+
+def format_event(template, args, names):
+    """Text of one event, looking its name arguments up in names."""
+    text, name_args = TEMPLATES[template]
+    values = list(args)
+    for i in name_args:
+        values[i] = names[values[i]]
+    return text.format(*values)
+
+class CombatLog:
+    """Battle messages as a fixed-size ring buffer of structured events.
+
+    Each event is a template id and up to MAX_ARGS ints in preallocated
+    arrays, so logging an action stores a few numbers and never builds a
+    string; text is formatted only for the lines on screen. Names are
+    stored once and referred to by id. The buffer keeps the last
+    COMBAT_LOG_SIZE events however long the session runs.
+
+    Attributes:
+        total (int): Events ever added, i.e. the sequence number of the next
+        writer: Optional CombatLogWriter streaming every event to disk
+    """
+
+    def __init__(self, capacity=COMBAT_LOG_SIZE, writer=None):
+        self.capacity = capacity
+        self.templates = np.zeros(capacity, dtype=np.uint8)
+        self.args = np.zeros((capacity, MAX_ARGS), dtype=np.int32)
+        self.total = 0
+        self.start = 0  # Sequence number of the current battle's first event
+        self.names = []
+        self._name_ids = {}
+        self.writer = writer
+
+    def name_id(self, name):
+        """Id of a name for use as an event argument."""
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+            if self.writer is not None:
+                self.writer.write_name(name_id, name)
+        return name_id
+
+    def add(self, template, *args):
+        """Log an event: a template id and its integer arguments."""
+        args = args + (0,) * (MAX_ARGS - len(args))
+        row = self.total % self.capacity
+        self.templates[row] = template
+        self.args[row] = args
+        self.total += 1
+        if self.writer is not None:
+            self.writer.write(game_clock.get_ticks(), template, args)
+
+    def clear(self):
+        """Start a new battle; earlier events are no longer shown."""
+        self.start = self.total
+
+    def recent(self, count):
+        """Sequence numbers of the last count events of this battle still held."""
+        return range(max(self.start, self.total - count, self.total - self.capacity), self.total)
+
+    def text(self, sequence):
+        """Formatted text of a held event."""
+        row = sequence % self.capacity
+        return format_event(self.templates[row], self.args[row].tolist(), self.names)
+
+    def lines(self, count):
+        """Text of the last count events of this battle."""
+        return [self.text(sequence) for sequence in self.recent(count)]
+
+    def __len__(self):
+        return len(self.recent(self.capacity))
@@ -0,0 +1,263 @@
+import math
+import numpy as np
+from entities import rng
+from use_cases.lod_scheduler import LODScheduler
+from config import MAP_WIDTH, MAP_HEIGHT, LOD_NEAR_RADIUS, LOD_FAR_RADIUS, LOD_MID_INTERVAL, LOD_HYSTERESIS
+
+# Behaviour states
+IDLE = 0
+WANDER = 1
+CHASE = 2
+
+class EnemySimulation:
+    """Structure-of-arrays simulation of every world enemy.
+
+    Positions, velocities, timers and behaviour states live in preallocated
+    NumPy arrays, and one update() advances the idle/wander/chase state
+    machine for all of them with vectorised operations. Enemy sprites bind
+    to a slot and read their rect and animation frame from these arrays.
+
+    An LODScheduler picks which slots tick each frame, so distant enemies
+    update at a reduced rate or sleep entirely.
+    """
+
+    def __init__(self, capacity=8192, hash_cell_size=128):
+        self.capacity = capacity
+        self.hash_cell_size = hash_cell_size
+
+        # Per-enemy state (one slot per enemy)
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)    # Top-left corner
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.size = np.zeros((capacity, 2), dtype=np.int32)
+        self.speed = np.zeros(capacity, dtype=np.float32)       # Pixels per second
+        self.state = np.zeros(capacity, dtype=np.int8)
+        self.timer = np.zeros(capacity, dtype=np.float32)       # Seconds left in state
+        self.direction = np.zeros((capacity, 2), dtype=np.float32)
+        self.aggro_radius = np.zeros(capacity, dtype=np.float32)
+        self.pulse = np.zeros(capacity, dtype=np.float32)       # Animation phase in radians
+        self.cells = np.zeros((capacity, 4), dtype=np.int32)    # Spatial hash cell range
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        # Sprite bound to each slot, so moved slots can be mapped back to entities
+        self.entities = [None] * capacity
+
+        # Free list of dead slots, used as a stack
+        self._free = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self._free_count = capacity
+        self._high_water = 0
+
+        # Timing, matching the original per-sprite wander loop
+        self.idle_time = 2.0
+        self.wander_time = 1.0
+        self.leash_factor = 1.5  # Chase ends beyond aggro_radius * leash_factor
+        self.pulse_speed = 6.0   # Radians per second
+
+        # Area enemies are kept inside (left, top, right, bottom)
+        self.bounds = (0, 0, MAP_WIDTH, MAP_HEIGHT)
+
+        # Compiled wall grid, shared chase field and sight checks, all optional
+        self.collision_map = None
+        self.flow_field = None
+        self.line_of_sight = None
+
+        # Distance-based activity bands
+        self.lod = LODScheduler(capacity, LOD_NEAR_RADIUS, LOD_FAR_RADIUS, LOD_MID_INTERVAL, LOD_HYSTERESIS)
+
+        self.rng = rng.generator(rng.AI)
+
+    def add(self, entity, x, y, width, height, speed=60, aggro_radius=0):
+        """Bind an entity to a free slot.
+
+        Args:
+            entity: Sprite that reads its state from the slot
+            x, y (float): Top-left position
+            width, height (int): Collision size
+            speed (float): Movement speed in pixels per second
+            aggro_radius (float): Distance at which it starts chasing, 0 to never chase
+
+        Returns:
+            int: Slot index, or -1 if the pool is full
+        """
+        if self._free_count == 0:
+            return -1
+        self._free_count -= 1
+        slot = int(self._free[self._free_count])
+        self._high_water = max(self._high_water, slot + 1)
+
+        self.pos[slot] = (x, y)
+        self.vel[slot] = 0
+        self.size[slot] = (width, height)
+        self.speed[slot] = speed
+        self.state[slot] = IDLE
+        # Stagger the first move so enemies don't all start walking together
+        self.timer[slot] = self.rng.uniform(0, self.idle_time)
+        self.direction[slot] = 0
+        self.aggro_radius[slot] = aggro_radius
+        self.pulse[slot] = 0
+        self.cells[slot] = self._cell_ranges(self.pos[slot:slot + 1], self.size[slot:slot + 1])[0]
+        self.alive[slot] = True
+        self.entities[slot] = entity
+        self.lod.reset(slot)
+        if self.line_of_sight is not None:
+            self.line_of_sight.invalidate(slot)
+        return slot
+
+    def remove(self, slot):
+        """Free a slot."""
+        if not self.alive[slot]:
+            return
+        self.alive[slot] = False
+        self.entities[slot] = None
+        self._free[self._free_count] = slot
+        self._free_count += 1
+
+        if slot + 1 == self._high_water:
+            live = np.flatnonzero(self.alive[:self._high_water])
+            self._high_water = int(live[-1]) + 1 if len(live) else 0
+
+    def _cell_ranges(self, pos, size):
+        """Spatial hash cell span (min_x, min_y, max_x, max_y) for each rect."""
+        top_left = pos.astype(np.int32)
+        bottom_right = top_left + size - 1
+        return np.concatenate((top_left, bottom_right), axis=1) // self.hash_cell_size
+
+    def update(self, dt, target_x, target_y, center=None):
+        """Advance the enemies scheduled for this frame.
+
+        Args:
+            dt (float): Elapsed time in seconds
+            target_x, target_y (float): World position enemies chase
+            center (tuple): Centre of activity for LOD bands, defaults to the target
+
+        Returns:
+            list: Entities whose spatial hash cells changed this step
+        """
+        end = self._high_water
+        if end == 0:
+            return []
+
+        center_x, center_y = center if center is not None else (target_x, target_y)
+        middle = self.pos[:end] + self.size[:end] * 0.5
+        idx, step = self.lod.schedule(dt, middle[:, 0], middle[:, 1], self.alive[:end], center_x, center_y)
+        if len(idx) == 0:
+            return []
+
+        # Work on the ticking subset only, then scatter the results back
+        state = self.state[idx]
+        timer = self.timer[idx] - step
+        pos = self.pos[idx]
+        size = self.size[idx]
+        self.pulse[idx] = (self.pulse[idx] + self.pulse_speed * step) % (2 * math.pi)
+
+        # Distance from each enemy's centre to the target
+        offset = np.array((target_x, target_y), dtype=np.float32) - middle[idx]
+        dist = np.hypot(offset[:, 0], offset[:, 1])
+        aggro = self.aggro_radius[idx]
+
+        # Chase transitions take priority over the wander timers
+        start_chase = (state != CHASE) & (dist < aggro)
+        if self.line_of_sight is not None and start_chase.any():
+            # Only enemies that can see the target start chasing
+            spotters = np.flatnonzero(start_chase)
+            eyes = middle[idx[spotters]]
+            start_chase[spotters] = self.line_of_sight.query(idx[spotters], eyes[:, 0], eyes[:, 1],
+                                                             target_x, target_y)
+        stop_chase = (state == CHASE) & (dist > aggro * self.leash_factor)
+        state[start_chase] = CHASE
+        state[stop_chase] = IDLE
+        timer[stop_chase] = self.idle_time
+
+        # Idle -> wander in a random 8-way (or zero) direction
+        direction = self.direction[idx]
+        start_wander = (state == IDLE) & (timer <= 0)
+        count = int(start_wander.sum())
+        if count:
+            state[start_wander] = WANDER
+            timer[start_wander] = self.wander_time
+            direction[start_wander] = self.rng.integers(-1, 2, (count, 2))
+
+        # Wander -> idle
+        stop_wander = (state == WANDER) & (timer <= 0)
+        state[stop_wander] = IDLE
+        timer[stop_wander] = self.idle_time
+
+        # Velocity from state
+        speed = self.speed[idx, None]
+        vel = np.zeros_like(pos)
+        wander = state == WANDER
+        vel[wander] = direction[wander] * speed[wander]
+        chase = state == CHASE
+        if chase.any():
+            heading = offset[chase] / np.maximum(dist[chase], 1.0)[:, None]
+            if self.flow_field is not None:
+                # Follow the field around walls, straight at the target once in its cell
+                chasers = middle[idx][chase]
+                field = self.flow_field.directions_at(chasers[:, 0], chasers[:, 1])
+                has_path = field.any(axis=1)
+                heading[has_path] = field[has_path]
+            vel[chase] = heading * speed[chase]
+
+        self._integrate(pos, vel * step[:, None], size)
+
+        self.state[idx] = state
+        self.timer[idx] = timer
+        self.direction[idx] = direction
+        self.vel[idx] = vel
+        self.pos[idx] = pos
+
+        # Report only the entities that crossed into new hash cells
+        cells = self._cell_ranges(pos, size)
+        changed = (cells != self.cells[idx]).any(axis=1)
+        self.cells[idx] = cells
+        entities = self.entities
+        return [entities[i] for i in idx[changed].tolist()]
+
+    def wake_region(self, x, y, radius, duration=2.0):
+        """Wake every enemy within radius of a point, whatever its band."""
+        end = self._high_water
+        middle = self.pos[:end] + self.size[:end] * 0.5
+        dist_sq = (middle[:, 0] - x) ** 2 + (middle[:, 1] - y) ** 2
+        self.lod.wake(np.flatnonzero(self.alive[:end] & (dist_sq <= radius * radius)), duration)
+
+    def _integrate(self, pos, step, size):
+        """Move one axis at a time, cancelling moves that would enter a wall."""
+        width = size[:, 0]
+        height = size[:, 1]
+        collision_map = self.collision_map
+
+        for axis in (0, 1):
+            moving = np.flatnonzero(step[:, axis])
+            if len(moving) == 0:
+                continue
+            old = pos[moving, axis].copy()
+            pos[moving, axis] += step[moving, axis]
+
+            if collision_map is not None:
+                # Enemies already overlapping a wall may still walk out of it
+                x, y = pos[moving, 0], pos[moving, 1]
+                w, h = width[moving], height[moving]
+                now_blocked = collision_map.rects_blocked(x, y, w, h)
+                if axis == 0:
+                    was_blocked = collision_map.rects_blocked(old, y, w, h)
+                else:
+                    was_blocked = collision_map.rects_blocked(x, old, w, h)
+                cancel = now_blocked & ~was_blocked
+                pos[moving[cancel], axis] = old[cancel]
+
+        # Keep enemies within map bounds
+        left, top, right, bottom = self.bounds
+        np.clip(pos[:, 0], left, right - width, out=pos[:, 0])
+        np.clip(pos[:, 1], top, bottom - height, out=pos[:, 1])
+
+    def clear(self):
+        """Free every slot."""
+        self.alive[:] = False
+        self.entities = [None] * self.capacity
+        self._free[:] = np.arange(self.capacity - 1, -1, -1, dtype=np.int32)
+        self._free_count = self.capacity
+        self._high_water = 0
+
+    @property
+    def live_count(self):
+        """Number of enemies currently simulated."""
+        return self.capacity - self._free_count
@@ -0,0 +1,123 @@
+import numpy as np
+
+# Sentinel distance for cells the target can't be reached from
+UNREACHABLE = np.iinfo(np.int32).max
+
+# Neighbour offsets (dx, dy) used when descending the distance field
+_NEIGHBOURS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (1, -1), (-1, 1), (1, 1))
+
+class FlowField:
+    """Shared navigation field toward a single target.
+
+    A breadth-first search spreads outward from the target's cell across the
+    walkable grid, and every cell stores a unit direction toward its lowest
+    neighbour. Any number of pursuers then look up their heading with one
+    array index, and the field is only rebuilt when the target changes cell.
+    """
+
+    def __init__(self, walkable, cell_size, origin_x=0, origin_y=0):
+        """
+        Args:
+            walkable (np.ndarray): (rows, cols) bool grid, True where movement is allowed
+            cell_size (int): Size of one grid cell in pixels
+            origin_x, origin_y (int): World position of the grid's top-left corner
+        """
+        self.walkable = walkable
+        self.cell_size = cell_size
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.rows, self.cols = walkable.shape
+
+        self.distance = np.full(walkable.shape, UNREACHABLE, dtype=np.int32)
+        self.direction = np.zeros((self.rows, self.cols, 2), dtype=np.float32)
+        self.target_cell = None
+
+    @classmethod
+    def from_collision_map(cls, collision_map, cell_size):
+        """Build a field over a CollisionMap coarsened to cell_size pixels."""
+        return cls(collision_map.walkable_grid(cell_size), cell_size,
+                   collision_map.origin_x, collision_map.origin_y)
+
+    def update(self, target_x, target_y):
+        """Rebuild the field if the target moved into a different cell.
+
+        Returns:
+            bool: True if the field was rebuilt
+        """
+        cell = (min(max((int(target_x) - self.origin_x) // self.cell_size, 0), self.cols - 1),
+                min(max((int(target_y) - self.origin_y) // self.cell_size, 0), self.rows - 1))
+        if cell == self.target_cell:
+            return False
+        self.target_cell = cell
+        self._build_distances(cell)
+        self._build_directions()
+        return True
+
+    def _build_distances(self, cell):
+        """Breadth-first wavefront from the target over 4-connected walkable cells."""
+        walkable = self.walkable
+        distance = self.distance
+        distance.fill(UNREACHABLE)
+
+        # Standing in a wall cell still seeds the search so neighbours get a path
+        frontier = np.zeros(walkable.shape, dtype=bool)
+        frontier[cell[1], cell[0]] = True
+        unvisited = walkable.copy()
+        unvisited[cell[1], cell[0]] = False
+
+        step = 0
+        while frontier.any():
+            distance[frontier] = step
+            step += 1
+
+            # Expand the whole wavefront by one cell in each direction at once
+            grown = np.zeros_like(frontier)
+            grown[1:, :] |= frontier[:-1, :]
+            grown[:-1, :] |= frontier[1:, :]
+            grown[:, 1:] |= frontier[:, :-1]
+            grown[:, :-1] |= frontier[:, 1:]
+            frontier = grown & unvisited
+            unvisited &= ~frontier
+
+    def _build_directions(self):
+        """Point every reachable cell at its closest neighbour to the target."""
+        rows, cols = self.rows, self.cols
+        padded = np.full((rows + 2, cols + 2), UNREACHABLE, dtype=np.int64)
+        padded[1:-1, 1:-1] = self.distance
+        open_padded = np.zeros((rows + 2, cols + 2), dtype=bool)
+        open_padded[1:-1, 1:-1] = self.walkable
+
+        best = self.distance.astype(np.int64)
+        best_dx = np.zeros((rows, cols), dtype=np.float32)
+        best_dy = np.zeros((rows, cols), dtype=np.float32)
+
+        for dx, dy in _NEIGHBOURS:
+            neighbour = padded[1 + dy:1 + dy + rows, 1 + dx:1 + dx + cols]
+            if dx and dy:
+                # No cutting corners past a wall
+                side_x = open_padded[1:1 + rows, 1 + dx:1 + dx + cols]
+                side_y = open_padded[1 + dy:1 + dy + rows, 1:1 + cols]
+                neighbour = np.where(side_x & side_y, neighbour, UNREACHABLE)
+            better = neighbour < best
+            best = np.where(better, neighbour, best)
+            best_dx[better] = dx
+            best_dy[better] = dy
+
+        length = np.hypot(best_dx, best_dy)
+        length[length == 0] = 1
+        self.direction[..., 0] = best_dx / length
+        self.direction[..., 1] = best_dy / length
+
+    def directions_at(self, x, y):
+        """Look up headings for arrays of world positions.
+
+        Args:
+            x, y (np.ndarray): World positions in pixels
+
+        Returns:
+            np.ndarray: (n, 2) unit directions, zero where there is no path
+                or the position is already in the target's cell
+        """
+        cell_x = np.clip(((x - self.origin_x) // self.cell_size).astype(np.int32), 0, self.cols - 1)
+        cell_y = np.clip(((y - self.origin_y) // self.cell_size).astype(np.int32), 0, self.rows - 1)
+        return self.direction[cell_y, cell_x]
@@ -1,14 +1,40 @@
 import pygame
-import random
+import math
+import time
+import zlib
+import numpy as np
+from entities import combat, game_clock, rng
 from entities.player import Player
 from entities.enemy import Enemy
+from entities.archetype import ArchetypeRegistry
+from entities.loot import LootTables
+from entities.ecs import World
+from entities.components import BOSS as BOSS_TAG
 
 from entities.boss import Boss
 from frameworks.map_manager import MapManager
+from frameworks.chunk_manager import ChunkManager
+from frameworks.save_manager import SaveManager, Snapshot, SPAWN_RECORD, PLAYER_FIELDS
+from frameworks.spatial_hash import SpatialHash, WALL, ENEMY, BOSS, NPC, PLAYER
+from use_cases import combat_log
 from use_cases.battle_system import BattleSystem
 from use_cases.dialogue_system import DialogueSystem
+from use_cases.particle_system import ParticleSystem
+from use_cases.tween_system import TweenSystem, OUT_QUAD, OUT_BACK
+from use_cases.projectile_system import ProjectileSystem
+from use_cases.enemy_simulation import EnemySimulation
+from use_cases.flow_field import FlowField
+from use_cases.path_service import PathService
+from use_cases.line_of_sight import LineOfSight
+from use_cases.spawn_pool import SpawnPool
+from use_cases.world_systems import CooldownSystem, RangedAttackSystem
 from interface_adapters.views.renderer import Camera
-from config import GameState, TILE_SIZE, MAP_WIDTH, MAP_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT
+from config import (GameState, TILE_SIZE, MAP_WIDTH, MAP_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT, FPS,
+                    COLLISION_CELL_SIZE, PIXEL_PERFECT_COLLISION, CHUNKED_WORLD, WORLD_SEED, CHUNK_TILES,
+                    CHUNK_WORLD_SIZE, CHUNK_LOAD_RADIUS, CHUNK_PREFETCH_SECONDS, CHUNK_MEMORY_BUDGET,
+                    CHUNK_SAVE_DIR, MAP_FILE, MAP_CACHE_DIR, ENEMY_DATA_FILE, LOOT_DATA_FILE,
+                    SPAWN_ACTIVATE_RADIUS, SPAWN_PARK_RADIUS, SAVE_DIR, SAVE_SLOTS, AUTOSAVE_INTERVAL,
+                    BATTLE_JOIN_RADIUS, BATTLE_MAX_ENEMIES, MOVE_STUCK_TIME)
 
 class GameLogic:
     def __init__(self):
@@ -17,11 +43,52 @@ class GameLogic:
         self.enemies = pygame.sprite.Group()
         self.walls = pygame.sprite.Group()
         self.bosses = pygame.sprite.Group()
+        self.npcs = pygame.sprite.Group()
         
         # Initialize game systems
         self.battle_system = BattleSystem()
         self.dialogue_system = DialogueSystem()
         self.map_manager = MapManager()
+        self.particles = ParticleSystem()
+        self.ui_tweens = TweenSystem(capacity=32)  # Menu and screen transitions
+        self.transition_state = None
+        self.projectiles = ProjectileSystem()
+        
+        # Spatial index of every world entity, queried by category
+        self.spatial_hash = SpatialHash()
+        self.collision_map = None
+        self.flow_field = None
+        self.path_service = None
+        self.move_path = None  # Click-to-move path the player is following
+        self.move_best_distance = math.inf  # Closest the player has come to the path's next waypoint
+        self.move_progress_time = 0  # Game time that distance last shrank
+        
+        # World size, and the chunk streamer when the world is chunked
+        self.world_width = MAP_WIDTH
+        self.world_height = MAP_HEIGHT
+        self.chunks = None
+        self.loaded_map_file = None  # Authored map whose tiles and walls are currently built
+        
+        # Save slots, written in the background, and the slot "continue" loads
+        self.saves = SaveManager(SAVE_DIR, SAVE_SLOTS)
+        self.continue_slot = self.saves.latest_slot()
+        self.autosave_timer = 0.0
+        
+        # Array-backed movement and AI for every world enemy
+        self.enemy_sim = EnemySimulation(hash_cell_size=self.spatial_hash.cell_size)
+        
+        # Component storage for the player, enemies and bosses, and the systems run over it
+        self.world = World()
+        self.cooldowns = CooldownSystem(self.world)
+        self.ranged_attacks = RangedAttackSystem(self.world, self.enemy_sim)
+        
+        # Shared per-type enemy data, and map spawns waiting for the player to come near
+        self.archetypes = ArchetypeRegistry.load(ENEMY_DATA_FILE)
+        self.loot = LootTables.load(LOOT_DATA_FILE)
+        self.loot_rng = rng.generator(rng.LOOT)
+        self.spawn_pool = SpawnPool(SPAWN_ACTIVATE_RADIUS, SPAWN_PARK_RADIUS)
+        self.interaction_radius = 80
+        self.prompted_npcs = set()
         
         # Initialize camera
         self.camera = Camera(MAP_WIDTH, MAP_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT)
@@ -31,13 +98,19 @@ class GameLogic:
         self.previous_state = None
         
         # Create player but don't add to sprite group yet
-        self.player = Player(400, 300)  # Start position
+        self.player = Player(self.world, 400, 300)  # Start position
         
         # Load map tiles
         self.map_manager.load_tileset()
         
-        # Initialize last update time
+        # Initialize last update time, and the game time entities read
         self.last_update = pygame.time.get_ticks()
+        self.frame_delta = 0
+        game_clock.clock.reset()
+        
+        # Cosmetic randomness, kept off the gameplay streams
+        self.effects_rng = rng.stream(rng.EFFECTS)
+        self.screen_rng = rng.stream(rng.SCREEN)
         
 
         
@@ -57,34 +130,95 @@ class GameLogic:
         self.pause_button_rect = None
         self.pause_background = None
         self.capture_screen_for_pause = False
+        
+        # Frames between dust puffs while the player walks
+        self.dust_interval = 6
+        self.dust_timer = 0
     
-    def setup_new_game(self):
-        """Initialize a new game."""
-        # Clear all sprite groups
+    def setup_new_game(self, snapshot=None):
+        """Initialize a new game, or restore a saved one.
+        
+        Restoring a save of the map that is already built keeps its tiles,
+        walls and navigation grids, so loading skips the map compile a new
+        game pays for.
+        
+        Args:
+            snapshot (Snapshot): Save to restore, None to start a new game
+        """
+        chunked = CHUNKED_WORLD if snapshot is None else snapshot.chunked
+        map_file = MAP_FILE if snapshot is None else snapshot.map_file
+        reuse_map = (snapshot is not None and not chunked and self.chunks is None
+                     and self.loaded_map_file == map_file)
+        
+        # Clear all sprite groups, freeing the world entities of the old enemies and bosses
         self.all_sprites.empty()
-        self.enemies.empty()
-        self.walls.empty()
-        self.bosses.empty()
+        for sprite in self.enemies.sprites() + self.bosses.sprites():
+            sprite.kill()
+        if not reuse_map:
+            self.walls.empty()
+        self.npcs.empty()
+        self.particles.clear()
+        self.projectiles.clear()
+        self.spatial_hash.clear()
+        self.enemy_sim.clear()
+        self.move_path = None
+        self.autosave_timer = 0.0
+        
+        self.projectiles.spatial_hash = self.spatial_hash
         
         # Generate map
-        self.tiles, self.walls = self.map_manager.generate_map()
-        
-        # Set player ID based on selection
-        self.player.set_player_id(self.selected_player_id)
+        if chunked:
+            start = None if snapshot is None else (int(snapshot.player['x']), int(snapshot.player['y']))
+            self.setup_chunked_world(WORLD_SEED if snapshot is None else snapshot.seed, start)
+            self.loaded_map_file = None
+        elif not reuse_map:
+            self.chunks = None
+            self.tiles, self.walls = self.map_manager.load_map(map_file, MAP_CACHE_DIR)
+            self.loaded_map_file = map_file
+            map_data = self.map_manager.map_data
+            self.world_width, self.world_height = map_data.width, map_data.height
+            self.set_collision_map(self.map_manager.collision_map)
+        self.camera.width, self.camera.height = self.world_width, self.world_height
+        
+        if snapshot is None:
+            if not chunked:
+                for start in self.map_manager.map_data.spawn_list('player'):
+                    self.place_player(start['x'], start['y'])
+            
+            # Set player ID based on selection
+            self.player.set_player_id(self.selected_player_id)
+        else:
+            self.restore_player(snapshot.player)
+            self.player.inventory = dict(snapshot.inventory)
         
         # Add player to sprite group
         self.all_sprites.add(self.player)
         
         # Show opening story dialogue
-        self.show_opening_story()
-        
-
-        
-        # Spawn multiple enemies
-        self.spawn_enemies()
+        if snapshot is None:
+            self.show_opening_story()
+        
+        # The village has fixed enemies and a boss, chunks spawn their own
+        if self.chunks is None:
+            if snapshot is None:
+                # Spawn multiple enemies
+                self.spawn_enemies()
+                
+                # Spawn the boss
+                self.spawn_boss()
+            else:
+                self.restore_spawns(snapshot)
+            
+            # Index world entities for spatial queries (enemies index themselves as they spawn)
+            for wall in self.walls:
+                self.spatial_hash.insert(wall, WALL)
+            for boss in self.bosses:
+                self.spatial_hash.insert(boss, BOSS)
         
-        # Spawn the boss
-        self.spawn_boss()
+        for npc in self.npcs:
+            self.spatial_hash.insert(npc, NPC)
+        self.spatial_hash.insert(self.player, PLAYER)
+        self.prompted_npcs = set()
         
         # Add walls to all_sprites
         for wall in self.walls:
@@ -96,85 +230,257 @@ class GameLogic:
         # Change state to world
         self.state = GameState.WORLD
     
-    def spawn_enemies(self):
-        # Create a wide variety of enemies in multiple locations across the map
-        enemy_positions = [
-            # Orc Encampment
-            (300, 250, "Orc Guard", 50, 10, 25),
-            (350, 300, "Orc Warrior", 55, 12, 30),
-            (250, 200, "Orc Archer", 45, 8, 20),
-            
-            # Dark Mage Area
-            (700, 450, "Dark Mage", 60, 12, 30),
-            (750, 500, "Shadow Apprentice", 40, 9, 22),
-            (650, 400, "Necromancer", 70, 15, 35),
-            
-            # Goblin Territory
-            (350, 650, "Goblin", 40, 8, 20),
-            (400, 700, "Goblin Scout", 35, 6, 15),
-            (300, 600, "Goblin Shaman", 45, 10, 25),
-            
-            # Undead Zone
-            (850, 250, "Skeleton", 45, 9, 22),
-            (900, 300, "Skeleton Archer", 40, 7, 18),
-            (800, 200, "Skeletal Knight", 60, 12, 30),
-            
-            # Zombie Swamp
-            (1250, 350, "Zombie", 70, 11, 35),
-            (1300, 400, "Zombie Brute", 80, 13, 40),
-            (1200, 300, "Plague Zombie", 65, 10, 30),
-            
-            # Troll Mountains
-            (1550, 650, "Troll", 80, 15, 40),
-            (1600, 700, "Mountain Troll", 90, 17, 45),
-            (1500, 600, "Troll Berserker", 85, 16, 42),
-            
-            # Additional Areas
-            (500, 100, "Forest Bandit", 55, 11, 28),
-            (1000, 800, "Desert Raider", 60, 12, 32),
-            (200, 750, "Mountain Golem", 100, 20, 50),
-            (1700, 200, "Ice Witch", 65, 14, 35),
-            (50, 500, "Wild Werewolf", 75, 16, 38),
-            (1800, 600, "Thunder Mage", 55, 13, 30),
-            
-            # Random scattered enemies
-            (600, 100, "Wandering Mercenary", 50, 10, 25),
-            (1100, 450, "Lost Warrior", 55, 11, 28),
-            (250, 800, "Rogue Assassin", 45, 9, 22),
-            (1600, 100, "Cursed Knight", 70, 14, 35)
-        ]
+    def set_collision_map(self, collision_map, keep_paths=False):
+        """Point movement, navigation and sight at a compiled wall grid.
         
-        for pos in enemy_positions:
-            x, y, name, hp, attack, exp = pos
-            enemy = Enemy(x, y, name, hp, attack, exp)
-            self.enemies.add(enemy)
-            self.all_sprites.add(enemy)
+        Args:
+            collision_map (CollisionMap): Walls of the map, or of the active chunks
+            keep_paths (bool): Patch the new walls into the running path service,
+                so click-to-move carries on (used when chunks stream in or out)
+        """
+        # Player, enemy and arrow movement all test against the compiled wall grid
+        self.collision_map = collision_map
+        self.player.collision_map = collision_map
+        self.projectiles.collision_map = collision_map
+        self.enemy_sim.collision_map = collision_map
+        
+        # Enemies and arrows stay inside the area the grid covers
+        bounds = (collision_map.origin_x, collision_map.origin_y,
+                  collision_map.origin_x + collision_map.width, collision_map.origin_y + collision_map.height)
+        self.enemy_sim.bounds = bounds
+        self.projectiles.bounds = bounds
+        
+        # One navigation field toward the player, shared by every chasing enemy
+        self.flow_field = FlowField.from_collision_map(collision_map, TILE_SIZE)
+        self.enemy_sim.flow_field = self.flow_field
+        
+        # Enemies only start chasing a player they can see
+        origin = (collision_map.origin_x, collision_map.origin_y)
+        self.enemy_sim.line_of_sight = LineOfSight.from_walkable(self.flow_field.walkable, TILE_SIZE,
+                                                                 self.enemy_sim.capacity, *origin)
+        
+        # Point-to-point A* for click-to-move, on tiles the player's collision box fits on
+        box = self.player.collision_box
+        walkable = collision_map.box_walkable_grid(TILE_SIZE, box.width, box.height)
+        if keep_paths and self.path_service is not None:
+            self.path_service.set_grid(walkable, origin)
+        else:
+            self.path_service = PathService(walkable, TILE_SIZE, origin=origin)
+            self.move_path = None
+    
+    def place_player(self, x, y):
+        """Move the player's top-left corner to a world position."""
+        self.player.rect.topleft = (x, y)
+        self.player.collision_rect.centerx = self.player.rect.centerx
+        self.player.collision_rect.bottom = self.player.rect.bottom
+    
+    def setup_chunked_world(self, seed=WORLD_SEED, start=None):
+        """Start an endless world streamed in chunks around the player.
         
-        # Create the final boss in a specific location
-        self.final_boss = Enemy(
-            MAP_WIDTH - 300, MAP_HEIGHT - 300,
-            "Grandmaster Mary-Ann", 300, 20, 500,
-        )
-        self.enemies.add(self.final_boss)
-        self.all_sprites.add(self.final_boss)
+        Args:
+            seed (int): World seed
+            start (tuple): Player's top-left position, None for the starting crossroads
+        """
+        self.walls = pygame.sprite.Group()
+        self.chunks = ChunkManager(self.map_manager, CHUNK_TILES, CHUNK_WORLD_SIZE, seed,
+                                   CHUNK_LOAD_RADIUS, CHUNK_PREFETCH_SECONDS, CHUNK_MEMORY_BUDGET,
+                                   CHUNK_SAVE_DIR, COLLISION_CELL_SIZE, PIXEL_PERFECT_COLLISION, FPS)
+        self.chunks.on_activate = self.activate_chunk
+        self.chunks.on_deactivate = self.park_chunk
+        self.world_width = self.world_height = self.chunks.world_size
+        
+        if start is None:
+            # Start on the road crossing of a chunk near the middle of the world
+            start_chunk = CHUNK_WORLD_SIZE // 2 // 3 * 3
+            crossing = start_chunk * self.chunks.chunk_size + (CHUNK_TILES // 2 + 0.5) * self.chunks.tile_size
+            start = (crossing - self.player.rect.width // 2, crossing - self.player.rect.height // 2)
+        self.place_player(*start)
+        
+        self.chunks.update(*self.player.rect.center)
+        self.set_collision_map(self.chunks.stitch_collision())
+    
+    def update_chunks(self):
+        """Stream chunks around the view and rebuild the wall grid when they change."""
+        view_x = -self.camera.x_offset + SCREEN_WIDTH // 2
+        view_y = -self.camera.y_offset + SCREEN_HEIGHT // 2
+        if self.chunks.update(view_x, view_y, self.player.vel_x, self.player.vel_y):
+            self.set_collision_map(self.chunks.stitch_collision(), keep_paths=True)
     
-    def spawn_boss(self):
-        """Spawn the Mzana boss in a specific location on the map."""
-        # Position the boss in a dramatic location (center of a special area)
-        boss_x = MAP_WIDTH - 300
-        boss_y = MAP_HEIGHT - 300
+    def activate_chunk(self, chunk):
+        """Bring a chunk's walls and parked enemies into the running world."""
+        for wall in chunk.props:
+            self.walls.add(wall)
+            self.spatial_hash.insert(wall, WALL)
+        
+        for record in chunk.enemy_records:
+            self.spawn_enemy(record['name'], record['x'], record['y'], record['health'])
+        chunk.enemy_records = []
+    
+    def park_chunk(self, chunk):
+        """Take a chunk's walls out of the world and park the enemies standing in it."""
+        for wall in chunk.props:
+            self.walls.remove(wall)
+            self.spatial_hash.remove(wall)
+        
+        area = pygame.Rect(chunk.x, chunk.y, chunk.size, chunk.size)
+        for enemy in [enemy for enemy in self.enemies if area.collidepoint(enemy.rect.center)]:
+            chunk.enemy_records.append({
+                'name': enemy.name, 'x': enemy.rect.x, 'y': enemy.rect.y, 'health': enemy.health,
+            })
+            self.despawn_enemy(enemy)
+    
+    def spawn_enemies(self):
+        """Queue the map's enemy spawns, creating those near the player straight away."""
+        self.spawn_pool.load(self.map_manager.map_data.spawn_list('enemy'))
+        self.update_spawns(*self.player.rect.center)
+    
+    def spawn_enemy(self, name, x, y, health=None):
+        """Create an enemy from its archetype and add it to the running world.
         
-        # Create the Mzana boss with high health and attack power
-        mzana = Boss(boss_x, boss_y, name="Mzana", health=500, attack=25, exp=150)
+        Args:
+            name (str): Archetype name
+            x, y (int): Top-left position
+            health (int): Current health, full health if None
         
-        # Add to sprite groups
-        self.bosses.add(mzana)
-        self.all_sprites.add(mzana)
+        Returns:
+            Enemy: The new enemy
+        """
+        enemy = Enemy(self.world, x, y, self.archetypes.get(name), health)
+        enemy.bind(self.enemy_sim)
+        self.enemies.add(enemy)
+        self.spatial_hash.insert(enemy, ENEMY)
+        return enemy
+    
+    def despawn_enemy(self, enemy):
+        """Take an enemy out of the running world."""
+        # A map enemy leaving with no health was beaten and stays gone, saves included
+        if enemy.health <= 0 and enemy.spawn_index >= 0 and not enemy.has(BOSS_TAG):
+            self.spawn_pool.defeat(enemy.spawn_index)
+        enemy.kill()
+        self.spatial_hash.remove(enemy)
+    
+    def update_spawns(self, center_x, center_y):
+        """Create enemies for spawns near the view and park those far from it."""
+        pool = self.spawn_pool
+        for enemy in [enemy for enemy in self.enemies if enemy.spawn_index >= 0]:
+            x, y = enemy.rect.center
+            if pool.should_park(x, y, center_x, center_y):
+                pool.park(enemy.spawn_index, enemy.rect.x, enemy.rect.y, enemy.health)
+                self.despawn_enemy(enemy)
+        
+        for index, name, x, y, health in pool.activate(center_x, center_y):
+            self.spawn_enemy(name, x, y, health).spawn_index = index
+    
+    def spawn_boss(self, saved_health=None):
+        """Spawn the bosses listed in the map file.
         
-        print(f"Boss '{mzana.name}' spawned at ({boss_x}, {boss_y})")
+        Args:
+            saved_health (dict): Boss spawn index -> health from a save, where
+                bosses missing from it were already defeated. None for a new game.
+        """
+        for index, spawn in enumerate(self.map_manager.map_data.spawn_list('boss')):
+            if saved_health is not None and index not in saved_health:
+                continue
+            boss = Boss(self.world, spawn['x'], spawn['y'], name=spawn['name'], health=spawn['hp'],
+                        attack=spawn['attack'], exp=spawn['exp'])
+            boss.spawn_index = index
+            if saved_health is not None:
+                boss.health = saved_health[index]
+            
+            # Add to sprite groups
+            self.bosses.add(boss)
+            self.all_sprites.add(boss)
+            
+            print(f"Boss '{boss.name}' spawned at ({spawn['x']}, {spawn['y']})")
     
 
         
+    def take_snapshot(self):
+        """Copy the state a save restores out of the running game.
+        
+        Only copies small arrays and a few numbers, so it is cheap enough to
+        run on the main thread; the writer thread does the rest.
+        """
+        player = self.player
+        stats = {field: getattr(player, field) for field in PLAYER_FIELDS if field not in ('x', 'y')}
+        stats['x'], stats['y'] = player.rect.topleft
+        
+        if self.chunks is not None:
+            # Chunk enemies come back from the seed (or CHUNK_SAVE_DIR)
+            return Snapshot(time.time(), stats, True, self.chunks.seed, '', [], np.zeros(0, dtype=SPAWN_RECORD), [],
+                            dict(player.inventory))
+        
+        pool = self.spawn_pool
+        names = sorted(set(pool.archetypes))
+        name_index = {name: i for i, name in enumerate(names)}
+        spawns = np.zeros(len(pool), dtype=SPAWN_RECORD)
+        spawns['name'] = [name_index[name] for name in pool.archetypes]
+        spawns['x'] = pool.x
+        spawns['y'] = pool.y
+        spawns['health'] = pool.health
+        
+        # Live enemies are ahead of their records
+        for enemy in self.enemies:
+            if enemy.spawn_index >= 0:
+                spawns[enemy.spawn_index] = (spawns['name'][enemy.spawn_index],
+                                             enemy.rect.x, enemy.rect.y, enemy.health)
+        
+        bosses = [(boss.spawn_index, boss.health) for boss in self.bosses if boss.spawn_index >= 0]
+        return Snapshot(time.time(), stats, False, None, self.loaded_map_file, names, spawns, bosses,
+                        dict(player.inventory))
+    
+    def save_game(self, slot=0):
+        """Snapshot the game and write it to a slot in the background (slot 0 is the autosave)."""
+        self.saves.save(slot, self.take_snapshot())
+        self.continue_slot = slot
+        print(f"Saved to slot {slot}")
+    
+    def load_game(self, slot):
+        """Restore the game saved in a slot.
+        
+        Returns:
+            bool: False if the slot is empty or unreadable
+        """
+        # Make sure a save still being written is read complete
+        self.saves.flush()
+        snapshot = self.saves.load(slot)
+        if snapshot is None:
+            return False
+        self.setup_new_game(snapshot)
+        print(f"Loaded slot {slot}")
+        return True
+    
+    def save_on_exit(self):
+        """Autosave a game in progress and wait for every save to reach the disk."""
+        state = self.previous_state if self.state == GameState.PAUSED else self.state
+        if state in (GameState.WORLD, GameState.DIALOGUE):
+            self.save_game(0)
+        self.saves.flush()
+    
+    def restore_player(self, stats):
+        """Apply saved player stats and position."""
+        self.selected_player_id = stats['player_id']
+        self.player.set_player_id(stats['player_id'])
+        for field in PLAYER_FIELDS:
+            if field not in ('x', 'y'):
+                setattr(self.player, field, stats[field])
+        self.place_player(int(stats['x']), int(stats['y']))
+    
+    def current_zone(self):
+        """Loot zone the player is in: 'wilds' in the generated world, else the map region, if any."""
+        if self.chunks is not None:
+            return 'wilds'
+        return self.map_manager.map_data.region_at(*self.player.rect.center)
+    
+    def restore_spawns(self, snapshot):
+        """Bring back the map's enemies and bosses as they were saved."""
+        spawns = snapshot.spawns
+        names = snapshot.spawn_names
+        self.spawn_pool.restore([names[i] for i in spawns['name'].tolist()], spawns['x'], spawns['y'],
+                                spawns['health'])
+        self.update_spawns(*self.player.rect.center)
+        self.spawn_boss(dict(snapshot.bosses))
+    
     def update_world(self, dx, dy):
         """Update the world state."""
         # Move player and check for collisions
@@ -253,17 +559,39 @@ class GameLogic:
                 pass
     
     def check_enemy_collision(self):
-        # Check collisions with regular enemies
-        for enemy in self.enemies:
+        # Check collisions with regular enemies near the player
+        for enemy in self.spatial_hash.query_rect(self.player.rect, (ENEMY,)):
             if self.player.rect.colliderect(enemy.rect):
                 self.start_battle(enemy)
                 break
                 
-        # Check collisions with boss enemies
-        for boss in self.bosses:
+        # Check collisions with boss enemies near the player
+        for boss in self.spatial_hash.query_rect(self.player.rect, (BOSS,)):
             if self.player.rect.colliderect(boss.rect):
                 self.start_battle(boss)
                 break
+    
+    def handle_interaction(self):
+        """Talk to the closest NPC within interaction range."""
+        player_x, player_y = self.player.rect.center
+        nearby = self.spatial_hash.query_radius(player_x, player_y, self.interaction_radius, (NPC,))
+        if not nearby:
+            return
+        
+        npc = min(nearby, key=lambda n: (n.rect.centerx - player_x) ** 2 + (n.rect.centery - player_y) ** 2)
+        self.state = GameState.DIALOGUE
+        self.dialogue_system.start_dialogue([npc.get_next_dialogue()])
+    
+    def update_interaction_prompts(self):
+        """Show the interaction indicator only on NPCs in range."""
+        player_x, player_y = self.player.rect.center
+        nearby = self.spatial_hash.query_radius(player_x, player_y, self.interaction_radius, (NPC,))
+        for npc in self.prompted_npcs:
+            if npc not in nearby:
+                npc.show_indicator = False
+        for npc in nearby:
+            npc.show_indicator = True
+        self.prompted_npcs = nearby
                 
     def start_battle(self, enemy):
         """Start a battle with an enemy."""
@@ -276,12 +604,18 @@ class GameLogic:
         """Handle battle actions from player input.
         
         Args:
-            action_type (str): Type of action ("basic_attack", "skill", or "heal")
+            action_type (str): Type of action ("basic_attack", "skill", "heal" or "target")
         """
         if self.state != GameState.BATTLE:
             return
         
-        if action_type == "basic_attack":
+        result = None
+        if action_type == "target":
+            self.battle_system.next_target()
+        elif self.battle_system.current_turn != "player":
+            # Enemies due before the player have not acted yet
+            return
+        elif action_type == "basic_attack":
             result = self.battle_system.player_attack("basic")
         elif action_type == "skill":
             result = self.battle_system.player_attack("skill")
@@ -292,25 +626,27 @@ class GameLogic:
         if result == "victory":
             # Remove all defeated enemies
             defeated_enemies = [enemy for enemy in self.battle_system.enemies if enemy.health <= 0]
+            # Drop tables are picked first, as a despawned enemy no longer carries its boss tag
+            tables = [self.loot.table_for(enemy.name, enemy.has(BOSS_TAG)) for enemy in defeated_enemies]
             for enemy in defeated_enemies:
-                enemy.kill()  # This removes it from all sprite groups
+                self.despawn_enemy(enemy)
             
-            # Check if player gained enough XP to level up
-            if hasattr(self.player, 'exp') and hasattr(self.player, 'gain_exp'):
-                # When player defeats an enemy, gains XP based on enemy's level/difficulty
-                for enemy in defeated_enemies:
-                    if hasattr(enemy, 'exp_reward'):
-                        exp_gained = enemy.exp_reward
-                    else:
-                        # Default XP if enemy doesn't have a specific reward
-                        exp_gained = 25
-                    
-                    # Apply XP gain and check for level up
-                    leveled_up = self.player.gain_exp(exp_gained)
-                    
-                    if leveled_up:
-                        # Show level up notification
-                        self.show_level_up_notification()
+            # Each enemy beaten in battle is worth a flat EXP_PER_ENEMY
+            for enemy in defeated_enemies:
+                leveled_up = self.player.gain_exp(combat.EXP_PER_ENEMY)
+                
+                if leveled_up:
+                    # Show level up notification
+                    self.show_level_up_notification()
+            
+            # Every kill rolls its archetype's drop table and the zone's
+            items = self.loot.roll(self.loot_rng, tables, self.current_zone())
+            self.player.add_items(items)
+            log = self.battle_system.battle_log
+            for item, count in items.items():
+                log.add(combat_log.LOOT, log.name_id(item), count)
+            if items:
+                print("Loot: " + ", ".join(f"{count} {item}" for item, count in items.items()))
             
             # Return to world state
             self.state = GameState.WORLD
@@ -329,30 +665,29 @@ class GameLogic:
         """Handle player movement and collision."""
         if self.state != GameState.WORLD:
             return
-            
-        # Store original position
-        original_x = self.player.rect.x
-        original_y = self.player.rect.y
         
-        # Update player position
+        # Keyboard input cancels click-to-move, otherwise keep following the path
+        if dx or dy:
+            self.move_path = None
+        elif self.move_path is not None:
+            dx, dy = self.follow_move_path()
+            
+        # Update player position, sliding along walls via the collision map
         self.player.move(dx, dy)
         
-        # Check wall collisions
-        collision_occurred = False
-        for wall in self.walls:
-            if self.player.collision_rect.colliderect(wall.rect):
-                collision_occurred = True
-                break
+        self.spatial_hash.update(self.player)
         
-        # If collision occurred, restore original position
-        if collision_occurred:
-            self.player.rect.x = original_x
-            self.player.rect.y = original_y
-            self.player.collision_rect.centerx = self.player.rect.centerx
-            self.player.collision_rect.bottom = self.player.rect.bottom
+        # Kick up dust behind the player's feet while walking
+        if self.player.moving:
+            self.dust_timer -= 1
+            if self.dust_timer <= 0:
+                self.dust_timer = self.dust_interval
+                self.particles.emit('dash_dust', self.player.collision_rect.centerx,
+                                    self.player.collision_rect.bottom - 20, count=1,
+                                    speed=(5, 15), lifetime=(0.4, 0.5))
         
         # Keep player in bounds of the map
-        map_rect = pygame.Rect(0, 0, MAP_WIDTH, MAP_HEIGHT)
+        map_rect = pygame.Rect(0, 0, self.world_width, self.world_height)
         if not map_rect.contains(self.player.rect):
             self.player.rect.clamp_ip(map_rect)
             self.player.collision_rect.centerx = self.player.rect.centerx
@@ -360,14 +695,72 @@ class GameLogic:
         
         # Update camera to follow player
         self.camera.update(self.player)
-    
 
     
-    def update(self):
-        """Update game state."""
+    def handle_move_to(self, screen_pos):
+        """Walk the player to a clicked point along an A* path."""
+        if self.state != GameState.WORLD or self.path_service is None:
+            return
+        
+        goal_x = screen_pos[0] - self.camera.x_offset
+        goal_y = screen_pos[1] - self.camera.y_offset
+        start_x, start_y = self.player.collision_box.center
+        
+        def on_path(path):
+            self.move_path = path
+            self.move_best_distance = math.inf
+            self.move_progress_time = game_clock.get_ticks()
+        self.move_path = None
+        self.path_service.request(start_x, start_y, goal_x, goal_y, on_path)
+    
+    def follow_move_path(self):
+        """Return the direction toward the next waypoint of the click-to-move path."""
+        path = self.move_path
+        feet_x, feet_y = self.player.collision_box.center
+        now = game_clock.get_ticks()
+        while not path.done:
+            waypoint_x, waypoint_y = path.next_waypoint()
+            dx = waypoint_x - feet_x
+            dy = waypoint_y - feet_y
+            distance = math.hypot(dx, dy)
+            # Close enough to this waypoint, aim for the next one
+            if distance <= 6:
+                path.advance()
+                self.move_best_distance = math.inf
+                self.move_progress_time = now
+                continue
+            
+            # Give up if something holds the player back from the waypoint
+            if distance < self.move_best_distance - 1:
+                self.move_best_distance = distance
+                self.move_progress_time = now
+            elif now - self.move_progress_time > MOVE_STUCK_TIME:
+                print("Click-to-move is blocked, stopping")
+                break
+            return dx / distance, dy / distance
+        
+        self.move_path = None
+        return 0, 0
+    
+    def update(self, time_delta=None):
+        """Update game state.
+        
+        Args:
+            time_delta (int): Milliseconds since the last frame, None to
+                measure them (replays pass the recorded value)
+        """
         current_time = pygame.time.get_ticks()
-        time_delta = current_time - self.last_update
+        if time_delta is None:
+            time_delta = current_time - self.last_update
         self.last_update = current_time
+        self.frame_delta = time_delta
+        game_clock.clock.advance(time_delta)
+        
+        # Menu transitions play whatever the state
+        if self.state != self.transition_state:
+            self.transition_state = self.state
+            self.start_transition(self.state)
+        self.ui_tweens.update(time_delta / 1000.0)
         
         # Handle volume slider dragging (in any state)
         if self.volume_dragging:
@@ -397,9 +790,28 @@ class GameLogic:
         # Update based on current state
         if self.state == GameState.WORLD:
             # Update all sprites
-            if hasattr(self.player, 'update'):
-                self.player.update()
+            self.player.update()
             self.all_sprites.update()
+            self.cooldowns.update(time_delta / 1000.0)
+            
+            # Stream world chunks or map spawns around the view
+            view_center = (-self.camera.x_offset + SCREEN_WIDTH // 2, -self.camera.y_offset + SCREEN_HEIGHT // 2)
+            if self.chunks is not None:
+                self.update_chunks()
+            else:
+                self.update_spawns(*view_center)
+            
+            # Advance enemies near the camera, then re-bucket those that changed cells
+            target = self.player.collision_rect.center
+            self.flow_field.update(target[0], target[1])
+            for enemy in self.enemy_sim.update(time_delta / 1000.0, target[0], target[1], view_center):
+                self.spatial_hash.update(enemy)
+            self.spatial_hash.update(self.player)
+            
+            self.update_interaction_prompts()
+            
+            # Resolve real-time melee hits for the active attack frame
+            self.update_melee()
             
             # Check for collisions
             self.check_enemy_collision()
@@ -407,12 +819,32 @@ class GameLogic:
             # Check player health
             self.check_player_health()
             
-            # Update skill cooldowns
-            if hasattr(self.player, 'skill3_cooldown') and self.player.skill3_cooldown > 0:
-                self.player.skill3_cooldown -= 1
+            # Ambient motes drifting around the visible area
+            if self.effects_rng.random() < 0.1:
+                self.particles.emit('mote',
+                                    -self.camera.x_offset + self.effects_rng.randint(0, SCREEN_WIDTH),
+                                    -self.camera.y_offset + self.effects_rng.randint(0, SCREEN_HEIGHT),
+                                    count=1, speed=(5, 20), lifetime=(2.0, 4.0))
+            
+            # Run queued path searches within this frame's node budget
+            self.path_service.process()
+            
+            # Fire and advance arrows
+            self.update_archers()
+            self.update_projectiles(time_delta / 1000.0)
+            
+            # Advance particles (time_delta is in milliseconds)
+            self.particles.update(time_delta / 1000.0)
+            
+            # Autosave now and then while exploring
+            self.autosave_timer += time_delta / 1000.0
+            if self.autosave_timer >= AUTOSAVE_INTERVAL:
+                self.autosave_timer = 0.0
+                self.save_game(0)
         
         elif self.state == GameState.BATTLE:
-            self.battle_system.update()
+            self.cooldowns.update(time_delta / 1000.0)
+            self.battle_system.update(time_delta / 1000.0)
             
             # Check if battle is over
             if self.battle_system.is_battle_over():
@@ -424,20 +856,131 @@ class GameLogic:
             # Check if dialogue is finished
             if self.dialogue_system.is_dialogue_finished():
                 self.state = GameState.WORLD
+    
+    def start_transition(self, state):
+        """Start the tweens a screen plays when it opens."""
+        if state == GameState.MAIN_MENU:
+            # Title grows in and settles at 1.2x
+            self.ui_tweens.play('title_scale', 0.5, 1.2, 0.6, OUT_BACK)
+        elif state == GameState.PAUSED:
+            self.ui_tweens.play('pause_fade', 0, 1, 0.2, OUT_QUAD)
+    
+    def state_checksum(self):
+        """CRC-32 of the simulated state, compared frame by frame during a replay.
         
-        # Update last update time
-        self.last_update = current_time
+        Covers the game state, the player, every component column, the enemy
+        simulation, arrows and map spawns. Particles and screen decoration are
+        cosmetic and left out.
+        """
+        player = self.player
+        crc = zlib.crc32(np.array([self.state.value, *player.rect, player.level, player.exp,
+                                   player.attack_power, player.defense], dtype=np.int64).tobytes())
+        crc = zlib.crc32(self.battle_system.current_turn.encode('utf-8'), crc)
+        crc = zlib.crc32(repr(sorted(player.inventory.items())).encode('utf-8'), crc)
+        for table in self.world.tables.values():
+            crc = zlib.crc32(table.handles[:table.count].tobytes(), crc)
+            # Column order follows component names, not set order, so it is the same every run
+            for component in sorted(table.columns, key=lambda c: c.name):
+                crc = zlib.crc32(table.column(component).tobytes(), crc)
+        for array in (self.enemy_sim.pos, self.enemy_sim.state, self.enemy_sim.alive,
+                      self.projectiles.pos, self.projectiles.alive,
+                      self.spawn_pool.x, self.spawn_pool.y, self.spawn_pool.health):
+            crc = zlib.crc32(array.tobytes(), crc)
+        return crc
     
     def handle_attack(self):
         """Handle player attack input."""
         if self.state == GameState.WORLD:
             self.player.attack()
+            
+            # Sparks in front of the swing
+            direction = 0 if self.player.facing_right else math.pi
+            spark_x = self.player.rect.centerx + (40 if self.player.facing_right else -40)
+            self.particles.emit('hit_spark', spark_x, self.player.rect.centery, count=12,
+                                speed=(60, 160), direction=direction, spread=math.pi / 2,
+                                lifetime=(0.2, 0.4))
+    
+    def handle_ranged_attack(self):
+        """Fire the player's arrow volley in the facing direction."""
+        if self.state != GameState.WORLD or self.player.arrow_cooldown > 0:
+            return
+        
+        self.player.arrow_cooldown = self.player.arrow_cooldown_max
+        
+        # Fan the volley around the facing direction
+        facing = 0 if self.player.facing_right else math.pi
+        count = self.player.arrow_volley_size
+        angles = [facing + (i - (count - 1) / 2) * 0.12 for i in range(count)]
+        self.projectiles.fire_volley(self.player.rect.centerx, self.player.rect.centery, angles,
+                                     speed=500, damage=self.player.attack_power,
+                                     owner=ProjectileSystem.OWNER_PLAYER)
+        
+        # Wake sleeping enemies the volley can reach (speed x lifetime)
+        self.enemy_sim.wake_region(self.player.rect.centerx, self.player.rect.centery, 1000)
+    
+    def update_archers(self):
+        """Let ranged enemies shoot at the player when in range."""
+        player_x, player_y = self.player.rect.center
+        for archer, x, y, angle in self.ranged_attacks.update(player_x, player_y):
+            self.projectiles.fire(x, y, angle, speed=300, damage=archer.attack,
+                                  owner=ProjectileSystem.OWNER_ENEMY)
+    
+    def update_projectiles(self, dt):
+        """Move arrows and apply damage for anything they hit."""
+        hits = self.projectiles.update(dt, {
+            ProjectileSystem.OWNER_PLAYER: (ENEMY, BOSS),
+            ProjectileSystem.OWNER_ENEMY: (PLAYER,),
+        })
+        
+        for target, damage, x, y in hits:
+            self.particles.emit('hit_spark', x, y, count=6, speed=(40, 120), lifetime=(0.15, 0.3))
+            
+            if target is self.player:
+                # Defense reduces arrow damage (minimum 1 damage)
+                self.player.health -= max(1, damage - self.player.defense)
+                self.check_player_health()
+            elif target.take_damage(damage):
+                self.defeat_in_world(target)
+    
+    def update_melee(self):
+        """Test the player's active hitboxes against nearby enemies."""
+        hitboxes = self.player.get_active_hitboxes()
+        if not hitboxes:
+            return
+        
+        damage = int(self.player.attack_power * self.player.clips["attack"].damage_scale)
+        for hitbox in hitboxes:
+            # Only enemies sharing a cell with the hitbox are tested
+            for enemy in self.spatial_hash.query_rect(hitbox, (ENEMY, BOSS)):
+                if enemy in self.player.attack_hits or not hitbox.colliderect(enemy.hurtbox):
+                    continue
+                
+                # Each swing hits an enemy at most once
+                self.player.attack_hits.add(enemy)
+                self.particles.emit('hit_spark', *hitbox.center, count=8, speed=(60, 140), lifetime=(0.15, 0.3))
+                if enemy.take_damage(damage):
+                    self.defeat_in_world(enemy)
+    
+    def defeat_in_world(self, enemy):
+        """Remove an enemy killed outside of battle and award its XP."""
+        self.despawn_enemy(enemy)
+        self.player.gain_exp(enemy.exp)
     
     def start_battle(self, enemy):
-        """Start a battle with an enemy."""
+        """Start a battle with an enemy and the enemies close around it (bosses fight alone)."""
         if self.state == GameState.WORLD:
             self.state = GameState.BATTLE
-            self.battle_system.start_battle(self.player, enemy)
+            self.battle_system.start_battle(self.player, self.battle_group(enemy))
+    
+    def battle_group(self, enemy):
+        """The enemy touched plus up to BATTLE_MAX_ENEMIES - 1 others within BATTLE_JOIN_RADIUS, nearest first."""
+        if enemy.has(BOSS_TAG):
+            return [enemy]
+        x, y = enemy.rect.center
+        nearby = [other for other in self.spatial_hash.query_radius(x, y, BATTLE_JOIN_RADIUS, (ENEMY,))
+                  if other is not enemy]
+        nearby.sort(key=lambda other: (other.rect.centerx - x) ** 2 + (other.rect.centery - y) ** 2)
+        return [enemy] + nearby[:BATTLE_MAX_ENEMIES - 1]
     
     def _render_world(self, screen):
         """Helper method to render the game world with seamless edge wrapping."""
@@ -448,15 +991,19 @@ class GameLogic:
         camera_x = -self.camera.x_offset
         camera_y = -self.camera.y_offset
         
+        # A chunked world is too large to wrap, draw only the ground under the view
+        if self.chunks is not None:
+            self.chunks.draw_ground(screen, self.camera, self.map_manager.tileset)
+        
         # Draw tiles with wrapping for a seamless world
-        for tile in self.tiles:
+        for tile in (self.tiles if self.chunks is None else ()):
             # Calculate base position with camera offset
             base_x = tile.rect.x + self.camera.x_offset
             base_y = tile.rect.y + self.camera.y_offset
             
             # Calculate modulo positions for wrapping
-            wrap_x = base_x % MAP_WIDTH
-            wrap_y = base_y % MAP_HEIGHT
+            wrap_x = base_x % self.world_width
+            wrap_y = base_y % self.world_height
             
             # Determine if we need to draw this tile on screen
             if wrap_x < screen_width and wrap_y < screen_height:
@@ -464,100 +1011,77 @@ class GameLogic:
                 
             # Draw additional copies if needed for seamless wrapping
             if wrap_x + tile.rect.width > screen_width:
-                screen.blit(tile.image, (wrap_x - MAP_WIDTH, wrap_y))
+                screen.blit(tile.image, (wrap_x - self.world_width, wrap_y))
             if wrap_y + tile.rect.height > screen_height:
-                screen.blit(tile.image, (wrap_x, wrap_y - MAP_HEIGHT))
+                screen.blit(tile.image, (wrap_x, wrap_y - self.world_height))
             if wrap_x + tile.rect.width > screen_width and wrap_y + tile.rect.height > screen_height:
-                screen.blit(tile.image, (wrap_x - MAP_WIDTH, wrap_y - MAP_HEIGHT))
+                screen.blit(tile.image, (wrap_x - self.world_width, wrap_y - self.world_height))
         
-        # Render walls with similar wrapping logic
-        for wall in self.walls:
-            base_x = wall.rect.x + self.camera.x_offset
-            base_y = wall.rect.y + self.camera.y_offset
-            screen.blit(wall.image, (base_x, base_y))
-            
-            # Wrap horizontally if needed
-            if base_x < 0:
-                screen.blit(wall.image, (base_x + MAP_WIDTH, base_y))
-            elif base_x > screen_width - wall.rect.width:
-                screen.blit(wall.image, (base_x - MAP_WIDTH, base_y))
-                
-            # Wrap vertically if needed
-            if base_y < 0:
-                screen.blit(wall.image, (base_x, base_y + MAP_HEIGHT))
-            elif base_y > screen_height - wall.rect.height:
-                screen.blit(wall.image, (base_x, base_y - MAP_HEIGHT))
+        # Render walls near the view
+        for wall, x, y in self._visible_entities(screen, (WALL,)):
+            screen.blit(wall.image, (x, y))
         
         # Render player at center
         screen.blit(self.player.image, self.camera.apply(self.player))
         
-        # Render enemies with wrapping behavior
-        for enemy in self.enemies:
-            base_x = enemy.rect.x + self.camera.x_offset
-            base_y = enemy.rect.y + self.camera.y_offset
-            
-            # Only render if potentially visible
-            if -enemy.rect.width <= base_x <= screen_width and -enemy.rect.height <= base_y <= screen_height:
-                screen.blit(enemy.image, (base_x, base_y))
-                
-            # Wrap horizontally if needed
-            if base_x < 0:
-                screen.blit(enemy.image, (base_x + MAP_WIDTH, base_y))
-            elif base_x > screen_width - enemy.rect.width:
-                screen.blit(enemy.image, (base_x - MAP_WIDTH, base_y))
-                
-            # Wrap vertically if needed
-            if base_y < 0:
-                screen.blit(enemy.image, (base_x, base_y + MAP_HEIGHT))
-            elif base_y > screen_height - enemy.rect.height:
-                screen.blit(enemy.image, (base_x, base_y - MAP_HEIGHT))
+        # Render NPCs and their interaction indicators
+        for npc, x, y in self._visible_entities(screen, (NPC,)):
+            screen.blit(npc.image, (x, y))
+            if npc.show_indicator:
+                screen.blit(npc.indicator_image, (x + (npc.rect.width - npc.indicator_image.get_width()) // 2,
+                                                  y + npc.indicator_offset))
+        
+        # Render enemies near the view
+        for enemy, x, y in self._visible_entities(screen, (ENEMY,)):
+            screen.blit(enemy.image, (x, y))
+        
+        # Render bosses with their health bars
+        for boss, x, y in self._visible_entities(screen, (BOSS,)):
+            screen.blit(boss.image, (x, y))
+            boss.draw_health_bar(screen, x, y)
+        
+        # Render arrows and particles on top of the world
+        self.projectiles.draw(screen, self.camera)
+        self.particles.draw(screen, self.camera)
+    
+    def _visible_entities(self, screen, categories):
+        """Return (entity, screen_x, screen_y) for entities in view, including wrapped copies.
         
-
-            
-        # Render bosses with the same wrapping logic
-        for boss in self.bosses:
-            base_x = boss.rect.x + self.camera.x_offset
-            base_y = boss.rect.y + self.camera.y_offset
-            
-            if -boss.rect.width <= base_x <= screen_width and -boss.rect.height <= base_y <= screen_height:
-                screen.blit(boss.image, (base_x, base_y))
-                
-                # Draw boss health bar
-                if hasattr(boss, 'draw_health_bar'):
-                    boss.draw_health_bar(screen, base_x, base_y)
-                
-            # Wrap horizontally if needed
-            if base_x < 0:
-                screen.blit(boss.image, (base_x + MAP_WIDTH, base_y))
-                # Draw health bar for wrapped boss too
-                if hasattr(boss, 'draw_health_bar'):
-                    boss.draw_health_bar(screen, base_x + MAP_WIDTH, base_y)
-            elif base_x > screen_width - boss.rect.width:
-                screen.blit(boss.image, (base_x - MAP_WIDTH, base_y))
-                if hasattr(boss, 'draw_health_bar'):
-                    boss.draw_health_bar(screen, base_x - MAP_WIDTH, base_y)
-                
-            # Wrap vertically if needed
-            if base_y < 0:
-                screen.blit(boss.image, (base_x, base_y + MAP_HEIGHT))
-                if hasattr(boss, 'draw_health_bar'):
-                    boss.draw_health_bar(screen, base_x, base_y + MAP_HEIGHT)
-            elif base_y > screen_height - boss.rect.height:
-                screen.blit(boss.image, (base_x, base_y - MAP_HEIGHT))
-                if hasattr(boss, 'draw_health_bar'):
-                    boss.draw_health_bar(screen, base_x, base_y - MAP_HEIGHT)
+        The world wraps at the map edges, so the view is also queried shifted by
+        one map width/height wherever it hangs over an edge.
+        """
+        screen_width, screen_height = screen.get_size()
+        view = pygame.Rect(-self.camera.x_offset, -self.camera.y_offset, screen_width, screen_height)
+        map_rect = pygame.Rect(0, 0, self.world_width, self.world_height)
+        
+        visible = []
+        for wrap_x in (0, -self.world_width, self.world_width):
+            for wrap_y in (0, -self.world_height, self.world_height):
+                region = view.move(wrap_x, wrap_y)
+                if not region.colliderect(map_rect):
+                    continue
+                for entity in self.spatial_hash.query_rect(region, categories):
+                    if entity.rect.colliderect(region):
+                        visible.append((entity,
+                                        entity.rect.x - region.x,
+                                        entity.rect.y - region.y))
+        
+        # Draw lower entities last so they overlap the ones behind them
+        visible.sort(key=lambda item: item[2] + item[0].rect.height)
+        return visible
     
     def draw_pause_screen(self, screen):
         """Draw the pause screen overlay."""
         # Create a semi-transparent overlay
         overlay = pygame.Surface((screen.get_width(), screen.get_height()), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))  # Semi-transparent black
+        fade = self.ui_tweens.get('pause_fade', 1.0)
+        overlay.fill((0, 0, 0, int(180 * fade)))  # Semi-transparent black, fading in
         screen.blit(overlay, (0, 0))
         
-        # Add pause title
+        # Add pause title, dropping into place as the overlay fades in
         font = pygame.font.Font(None, 64)
         pause_text = font.render("PAUSED", True, (255, 255, 255))
-        text_rect = pause_text.get_rect(center=(screen.get_width() // 2, screen.get_height() // 4))
+        text_rect = pause_text.get_rect(center=(screen.get_width() // 2, screen.get_height() // 4 - int(40 * (1 - fade))))
         screen.blit(pause_text, text_rect)
         
         # Button dimensions and spacing
@@ -742,8 +1266,8 @@ class GameLogic:
                                     (10, 70, int(exp_bar_width * exp_progress), exp_bar_height))
             
             # Display heal cooldown in the world state if applicable
-            if hasattr(self.player, 'skill3_cooldown') and self.player.skill3_cooldown > 0:
-                cooldown_text = font.render(f"Heal Cooldown: {self.player.skill3_cooldown//60 + 1}s", True, (255, 200, 200))
+            if self.player.skill3_cooldown > 0:
+                cooldown_text = font.render(f"Heal Cooldown: {math.ceil(self.player.skill3_cooldown)}s", True, (255, 200, 200))
                 screen.blit(cooldown_text, (10, 95))
         
         elif self.state == GameState.DIALOGUE:
@@ -770,9 +1294,9 @@ class GameLogic:
                 
                 # Draw some decorative elements for visual interest
                 for i in range(10):
-                    x = random.randint(0, screen.get_width())
-                    y = random.randint(0, screen.get_height())
-                    size = random.randint(2, 5)
+                    x = self.screen_rng.randint(0, screen.get_width())
+                    y = self.screen_rng.randint(0, screen.get_height())
+                    size = self.screen_rng.randint(2, 5)
                     pygame.draw.circle(screen, (255, 255, 255, 50), (x, y), size)
             else:
                 # Use the existing snapshot
@@ -816,7 +1340,7 @@ class GameLogic:
         if not hasattr(self, 'tiles'):
             # If tiles haven't been generated yet, create them for the background
             self.map_manager.load_tileset()  # Make sure to load the tileset if not already loaded
-            self.tiles, _ = self.map_manager.generate_map()
+            self.tiles, _ = self.map_manager.load_map(MAP_FILE, MAP_CACHE_DIR)
 
         # Render the map tiles to the screen (without camera offset for the main menu)
         for tile in self.tiles:
@@ -834,7 +1358,7 @@ class GameLogic:
         title_rect = title_text.get_rect(center=(screen.get_width() // 2, screen.get_height() // 4))
 
         # Add animation effect (title appearing from a smaller size to normal)
-        scale_factor = 1.2  # Initial scale size
+        scale_factor = self.ui_tweens.get('title_scale', 1.2)
         scaled_title = pygame.transform.scale(title_text, (int(title_rect.width * scale_factor), int(title_rect.height * scale_factor)))
         title_rect = scaled_title.get_rect(center=(screen.get_width() // 2, screen.get_height() // 4))
         
@@ -855,6 +1379,12 @@ class GameLogic:
         
         screen.blit(prompt_text, prompt_rect)
         
+        # Offer to continue when there is a save
+        if self.continue_slot is not None:
+            continue_font = pygame.font.Font(None, 32)
+            continue_text = continue_font.render("Press C to Continue", True, (200, 200, 200))
+            screen.blit(continue_text, continue_text.get_rect(center=(screen.get_width() // 2, prompt_rect.bottom + 20)))
+        
         # Add volume control slider at the bottom of the screen
         volume_y = screen.get_height() - 70
         slider_width = 250
@@ -1116,6 +1646,8 @@ class GameLogic:
             if hasattr(self, 'main_menu_button_rect') and self.main_menu_button_rect is not None:
                 if self.main_menu_button_rect.collidepoint(pos):
                     print("Main Menu button clicked, returning to main menu")
+                    if self.previous_state in (GameState.WORLD, GameState.DIALOGUE):
+                        self.save_game(0)
                     self.state = GameState.MAIN_MENU
                     return True
                 
@@ -1123,6 +1655,7 @@ class GameLogic:
             if hasattr(self, 'exit_button_rect') and self.exit_button_rect is not None:
                 if self.exit_button_rect.collidepoint(pos):
                     print("Exit button clicked, terminating game")
+                    self.save_on_exit()
                     pygame.quit()
                     import sys
                     sys.exit()
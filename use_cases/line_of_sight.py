@@ -0,0 +1,125 @@
+import numpy as np
+
+class LineOfSight:
+    """Batched visibility tests over an opacity grid.
+
+    Rays are traced cell by cell with a DDA (Amanatides-Woo) walk, advancing
+    every ray in the batch one cell per NumPy step. Rays run between cell
+    centres, so a result depends only on the two endpoint cells and is
+    cached per caller slot until either endpoint moves to another cell.
+    """
+
+    def __init__(self, opaque, cell_size, capacity=8192, origin_x=0, origin_y=0):
+        """
+        Args:
+            opaque (np.ndarray): (rows, cols) bool grid, True where sight is blocked
+            cell_size (int): Size of one grid cell in pixels
+            capacity (int): Number of caller slots with a cached result
+            origin_x, origin_y (int): World position of the grid's top-left corner
+        """
+        self.opaque = opaque
+        self.cell_size = cell_size
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.rows, self.cols = opaque.shape
+
+        # Last endpoints and answer per slot; -1 means nothing cached
+        self.cached_from = np.full(capacity, -1, dtype=np.int32)
+        self.cached_to = np.full(capacity, -1, dtype=np.int32)
+        self.cached_visible = np.zeros(capacity, dtype=bool)
+
+    @classmethod
+    def from_walkable(cls, walkable, cell_size, capacity=8192, origin_x=0, origin_y=0):
+        """Build from a walkability grid, treating every unwalkable cell as opaque."""
+        return cls(~walkable, cell_size, capacity, origin_x, origin_y)
+
+    def _cells(self, x, y):
+        """Clamped cell coordinates for world positions."""
+        cell_x = np.clip(((np.asarray(x) - self.origin_x) // self.cell_size).astype(np.int32), 0, self.cols - 1)
+        cell_y = np.clip(((np.asarray(y) - self.origin_y) // self.cell_size).astype(np.int32), 0, self.rows - 1)
+        return cell_x, cell_y
+
+    def query(self, slots, from_x, from_y, to_x, to_y):
+        """Visibility for a batch of rays, reusing cached answers where possible.
+
+        Args:
+            slots (np.ndarray): Caller slot per ray, used as the cache key
+            from_x, from_y (np.ndarray): Ray origins in world pixels
+            to_x, to_y (float or np.ndarray): Ray targets in world pixels
+
+        Returns:
+            np.ndarray: Bool per ray, True if nothing opaque lies between the endpoints
+        """
+        slots = np.asarray(slots)
+        from_cx, from_cy = self._cells(from_x, from_y)
+        to_cx, to_cy = self._cells(to_x, to_y)
+        from_cell = from_cy * self.cols + from_cx
+        to_cell = np.broadcast_to(to_cy * self.cols + to_cx, from_cell.shape)
+
+        stale = (self.cached_from[slots] != from_cell) | (self.cached_to[slots] != to_cell)
+        if stale.any():
+            visible = self.trace(np.broadcast_to(from_cx, stale.shape)[stale],
+                                 np.broadcast_to(from_cy, stale.shape)[stale],
+                                 np.broadcast_to(to_cx, stale.shape)[stale],
+                                 np.broadcast_to(to_cy, stale.shape)[stale])
+            stale_slots = slots[stale]
+            self.cached_from[stale_slots] = from_cell[stale]
+            self.cached_to[stale_slots] = to_cell[stale]
+            self.cached_visible[stale_slots] = visible
+        return self.cached_visible[slots]
+
+    def trace(self, x0, y0, x1, y1):
+        """Walk rays between cell centres, all rays in lockstep.
+
+        Args:
+            x0, y0, x1, y1 (np.ndarray): Start and end cells
+
+        Returns:
+            np.ndarray: Bool per ray, True if no opaque cell lies strictly between
+        """
+        count = len(x0)
+        visible = np.ones(count, dtype=bool)
+        if count == 0:
+            return visible
+
+        x = x0.astype(np.int32)
+        y = y0.astype(np.int32)
+        delta_x = (x1 - x0).astype(np.float64)
+        delta_y = (y1 - y0).astype(np.float64)
+        step_x = np.sign(delta_x).astype(np.int32)
+        step_y = np.sign(delta_y).astype(np.int32)
+
+        # Ray parameter t runs 0..1 from centre to centre. Crossing one cell
+        # takes t_delta, and the first boundary is half a cell away.
+        with np.errstate(divide='ignore'):
+            t_delta_x = np.where(step_x != 0, 1.0 / np.abs(delta_x), np.inf)
+            t_delta_y = np.where(step_y != 0, 1.0 / np.abs(delta_y), np.inf)
+        t_max_x = t_delta_x * 0.5
+        t_max_y = t_delta_y * 0.5
+
+        # Rays needing more cells just keep walking; finished ones drop out
+        active = (x != x1) | (y != y1)
+        opaque = self.opaque
+        while active.any():
+            ray = np.flatnonzero(active)
+            along_x = t_max_x[ray] < t_max_y[ray]
+            ray_x = ray[along_x]
+            ray_y = ray[~along_x]
+            x[ray_x] += step_x[ray_x]
+            t_max_x[ray_x] += t_delta_x[ray_x]
+            y[ray_y] += step_y[ray_y]
+            t_max_y[ray_y] += t_delta_y[ray_y]
+
+            arrived = (x[ray] == x1[ray]) & (y[ray] == y1[ray])
+            blocked = ~arrived & opaque[y[ray], x[ray]]
+            visible[ray[blocked]] = False
+            active[ray[arrived | blocked]] = False
+
+        return visible
+
+    def invalidate(self, slots=None):
+        """Forget cached answers, for example after a wall changes."""
+        if slots is None:
+            self.cached_from[:] = -1
+        else:
+            self.cached_from[slots] = -1
@@ -0,0 +1,91 @@
+import numpy as np
+
+# Activity bands, nearest first
+NEAR = 0
+MID = 1
+FAR = 2
+
+class LODScheduler:
+    """Decides which simulation slots tick this frame based on distance.
+
+    Near slots tick every frame. Mid-range slots tick every mid_interval
+    frames with the time they missed folded into one larger step, staggered
+    by slot so the work is spread evenly. Far slots sleep until they come
+    back into range or are woken explicitly. Bands only change once an
+    entity is hysteresis pixels past a boundary, so entities standing on a
+    boundary don't flip between bands every frame.
+    """
+
+    def __init__(self, capacity, near_radius=700, far_radius=1400, mid_interval=4, hysteresis=100):
+        self.near_radius = near_radius
+        self.far_radius = far_radius
+        self.mid_interval = mid_interval
+        self.hysteresis = hysteresis
+
+        self.band = np.zeros(capacity, dtype=np.int8)
+        self.pending = np.zeros(capacity, dtype=np.float32)     # Seconds skipped since the last tick
+        self.wake_timer = np.zeros(capacity, dtype=np.float32)  # Seconds held awake by wake()
+        self.frame = 0
+
+    def reset(self, slot):
+        """Start a newly added slot in the near band."""
+        self.band[slot] = NEAR
+        self.pending[slot] = 0
+        self.wake_timer[slot] = 0
+
+    def wake(self, slots, duration=2.0):
+        """Force slots into the near band for at least duration seconds."""
+        self.band[slots] = NEAR
+        self.pending[slots] = 0
+        self.wake_timer[slots] = np.maximum(self.wake_timer[slots], duration)
+
+    def _bands(self, dist_sq, margin):
+        """Band for each distance with both boundaries shifted by margin."""
+        near = self.near_radius + margin
+        far = self.far_radius + margin
+        return (dist_sq > near * near).astype(np.int8) + (dist_sq > far * far)
+
+    def schedule(self, dt, x, y, alive, center_x, center_y):
+        """Update bands and pick the slots that tick this frame.
+
+        Args:
+            dt (float): Frame time in seconds
+            x, y (np.ndarray): Slot positions, one entry per slot in use
+            alive (np.ndarray): Bool mask of slots in use
+            center_x, center_y (float): Centre of activity (usually the camera)
+
+        Returns:
+            tuple: (slot indices to tick, per-slot step in seconds)
+        """
+        end = len(x)
+        band = self.band[:end]
+        pending = self.pending[:end]
+        wake_timer = self.wake_timer[:end]
+        wake_timer -= dt
+
+        dx = x - center_x
+        dy = y - center_y
+        dist_sq = dx * dx + dy * dy
+
+        # Move outward only past boundary + hysteresis, inward only past boundary - hysteresis
+        outward = self._bands(dist_sq, self.hysteresis)
+        inward = self._bands(dist_sq, -self.hysteresis)
+        new_band = np.where(outward > band, outward, np.where(inward < band, inward, band))
+        new_band[wake_timer > 0] = NEAR
+
+        # Sleepers don't catch up on the time they were asleep
+        pending[(band == FAR) & (new_band != FAR)] = 0
+        band[:] = new_band
+
+        mid = band == MID
+        pending[mid] += dt
+
+        stagger = (np.arange(end) + self.frame) % self.mid_interval == 0
+        tick = alive & ((band == NEAR) | (mid & stagger))
+        self.frame += 1
+
+        slots = np.flatnonzero(tick)
+        step = np.where(band[slots] == NEAR, np.float32(dt), pending[slots])
+        pending[slots] = 0
+        return slots, step
+
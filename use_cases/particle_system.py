@@ -0,0 +1,216 @@
+import os
+import math
+import numpy as np
+import pygame
+from entities import rng
+
+class ParticleSystem:
+    """Array-backed particle engine for dust, hit sparks and ambient effects.
+
+    Every particle lives in a slot of a set of preallocated NumPy arrays
+    (structure-of-arrays), so updating thousands of particles is a handful of
+    vectorised operations and no per-particle Python objects are created.
+    """
+
+    def __init__(self, capacity=20000):
+        self.capacity = capacity
+
+        # Per-particle state (one slot per particle)
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.ones(capacity, dtype=np.float32)
+        self.effect = np.zeros(capacity, dtype=np.int16)
+        self.frame = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        # Free list of dead slots, used as a stack (top is at _free_count - 1).
+        # Live particles are tracked up to a high-water mark so updates only
+        # touch [:_high_water] instead of the whole pool.
+        self._free = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self._free_count = capacity
+        self._high_water = 0
+
+        # Effect definitions, frames are flattened into one list for drawing
+        self.frames = []
+        self.effect_ids = {}
+        self._frame_offset = []
+        self._frame_count = []
+        self._gravity = []
+        self._drag = []
+        self._half_size = []
+
+        self.rng = rng.generator(rng.EFFECTS)
+        self.load_effects()
+
+    def load_effects(self):
+        """Load the dust sheets and build the procedural spark and mote frames."""
+        dust_path = os.path.join('assets', 'The Male adventurer - Free')
+
+        dash_dust = self._load_strip(os.path.join(dust_path, 'Dash', 'Dust', 'Dash_Dust_Down.png'), 6)
+
+        self.register_effect('dash_dust', dash_dust or self._create_circle_frames((200, 180, 140), 6, 6), gravity=0, drag=3.0)
+        self.register_effect('hit_spark', self._create_circle_frames((255, 220, 80), 4, 5), gravity=400, drag=1.5)
+        self.register_effect('mote', self._create_circle_frames((180, 255, 180), 3, 4), gravity=-10, drag=0.2)
+
+    def _load_strip(self, path, frame_count):
+        """Slice a horizontal sprite strip into frames, or return None if missing."""
+        try:
+            sheet = pygame.image.load(path).convert_alpha()
+        except (pygame.error, FileNotFoundError):
+            print(f"Particle sheet not found: {path}")
+            return None
+
+        width = sheet.get_width() // frame_count
+        height = sheet.get_height()
+        return [sheet.subsurface((i * width, 0, width, height)).copy() for i in range(frame_count)]
+
+    def _create_circle_frames(self, color, radius, frame_count):
+        """Create a shrinking, fading circle animation as a fallback effect."""
+        frames = []
+        size = radius * 2 + 2
+        for i in range(frame_count):
+            fade = 1 - i / frame_count
+            surface = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(surface, (*color, int(255 * fade)), (size // 2, size // 2), max(1, math.ceil(radius * fade)))
+            frames.append(surface)
+        return frames
+
+    def register_effect(self, name, frames, gravity=0.0, drag=0.0):
+        """Register an effect animation.
+
+        Args:
+            name (str): Effect key used by emit()
+            frames (list): Animation frames, played once over a particle's lifetime
+            gravity (float): Downward acceleration in pixels/s^2
+            drag (float): Velocity damping per second
+
+        Returns:
+            int: Effect id
+        """
+        effect_id = len(self._frame_offset)
+        self.effect_ids[name] = effect_id
+        self._frame_offset.append(len(self.frames))
+        self._frame_count.append(len(frames))
+        self._gravity.append(gravity)
+        self._drag.append(drag)
+        self._half_size.append((frames[0].get_width() // 2, frames[0].get_height() // 2))
+        self.frames.extend(frames)
+
+        # Per-effect lookup arrays indexed by the particle's effect id
+        self._offset_lut = np.array(self._frame_offset, dtype=np.int32)
+        self._count_lut = np.array(self._frame_count, dtype=np.int32)
+        self._gravity_lut = np.array(self._gravity, dtype=np.float32)
+        self._drag_lut = np.array(self._drag, dtype=np.float32)
+        self._half_size_lut = np.array(self._half_size, dtype=np.float32)
+        return effect_id
+
+    def emit(self, name, x, y, count=1, speed=(20, 60), direction=0.0, spread=2 * math.pi, lifetime=(0.3, 0.6)):
+        """Spawn a burst of particles.
+
+        Args:
+            name (str): Registered effect name
+            x, y (float): World position of the burst
+            count (int): Number of particles to spawn
+            speed (tuple): Min/max initial speed in pixels per second
+            direction (float): Centre angle of the burst in radians
+            spread (float): Angular width of the burst in radians
+            lifetime (tuple): Min/max lifetime in seconds
+
+        Returns:
+            int: Number of particles actually spawned (the pool may be full)
+        """
+        count = min(count, self._free_count)
+        if count <= 0:
+            return 0
+
+        # Pop slots off the free list
+        slots = self._free[self._free_count - count:self._free_count]
+        self._free_count -= count
+        self._high_water = max(self._high_water, int(slots.max()) + 1)
+
+        angles = direction + (self.rng.random(count, dtype=np.float32) - 0.5) * spread
+        speeds = self.rng.uniform(speed[0], speed[1], count).astype(np.float32)
+
+        self.pos[slots, 0] = x
+        self.pos[slots, 1] = y
+        self.vel[slots, 0] = np.cos(angles) * speeds
+        self.vel[slots, 1] = np.sin(angles) * speeds
+        self.age[slots] = 0
+        self.lifetime[slots] = self.rng.uniform(lifetime[0], lifetime[1], count)
+        self.effect[slots] = self.effect_ids[name]
+        self.frame[slots] = self._offset_lut[self.effect_ids[name]]
+        self.alive[slots] = True
+        return count
+
+    def update(self, dt):
+        """Advance every live particle by dt seconds."""
+        end = self._high_water
+        if end == 0:
+            return
+
+        alive = self.alive[:end]
+        effect = self.effect[:end]
+        vel = self.vel[:end]
+
+        # Integrate motion for the whole active range at once
+        vel *= np.maximum(0.0, 1.0 - self._drag_lut[effect] * dt)[:, None]
+        vel[:, 1] += self._gravity_lut[effect] * dt
+        self.pos[:end] += vel * dt
+        self.age[:end] += dt
+
+        # Pick the animation frame from normalised age
+        progress = np.minimum(self.age[:end] / self.lifetime[:end], 0.999)
+        counts = self._count_lut[effect]
+        self.frame[:end] = self._offset_lut[effect] + (progress * counts).astype(np.int32)
+
+        # Recycle expired slots back onto the free list
+        expired = np.flatnonzero(alive & (self.age[:end] >= self.lifetime[:end]))
+        if len(expired):
+            alive[expired] = False
+            self._free[self._free_count:self._free_count + len(expired)] = expired[::-1]
+            self._free_count += len(expired)
+
+            # Shrink the active range if the tail has died off
+            live = np.flatnonzero(alive)
+            self._high_water = int(live[-1]) + 1 if len(live) else 0
+
+    def draw(self, screen, camera):
+        """Draw all on-screen particles with a single Surface.blits call."""
+        end = self._high_water
+        if end == 0:
+            return
+
+        half = self._half_size_lut[self.effect[:end]]
+        screen_x = self.pos[:end, 0] - half[:, 0] + camera.x_offset
+        screen_y = self.pos[:end, 1] - half[:, 1] + camera.y_offset
+
+        # Cull particles outside the view before building the blit list
+        width, height = screen.get_size()
+        visible = np.flatnonzero(
+            self.alive[:end] &
+            (screen_x > -64) & (screen_x < width) &
+            (screen_y > -64) & (screen_y < height)
+        )
+        if len(visible) == 0:
+            return
+
+        frames = self.frames
+        screen.blits([
+            (frames[f], (x, y))
+            for f, x, y in zip(self.frame[visible].tolist(),
+                               screen_x[visible].astype(np.int32).tolist(),
+                               screen_y[visible].astype(np.int32).tolist())
+        ], doreturn=False)
+
+    def clear(self):
+        """Kill every particle and reset the free list."""
+        self.alive[:] = False
+        self._free[:] = np.arange(self.capacity - 1, -1, -1, dtype=np.int32)
+        self._free_count = self.capacity
+        self._high_water = 0
+
+    @property
+    def live_count(self):
+        """Number of particles currently alive."""
+        return self.capacity - self._free_count
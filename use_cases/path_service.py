@@ -0,0 +1,380 @@
+import heapq
+import math
+import weakref
+import numpy as np
+from collections import OrderedDict, deque
+
+# Neighbour steps (dx, dy, cost); diagonals may not cut past wall corners
+_STEPS = (
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (-1, -1, math.sqrt(2)),
+)
+_DIAGONAL_EXTRA = math.sqrt(2) - 2
+
+class Path:
+    """A list of grid cells from start to goal, followed one waypoint at a time.
+
+    The path service keeps handed-out paths up to date, so a follower only
+    needs to call next_waypoint()/advance() each frame.
+    """
+
+    def __init__(self, cells, cols, cell_size, origin=(0, 0)):
+        self.cells = list(cells)  # Flat cell indices (y * cols + x)
+        self.cols = cols
+        self.cell_size = cell_size
+        self.origin = origin      # World position of the grid's top-left corner
+        self.index = 0            # Next waypoint
+        self.blocked = False      # Set when a wall cut the path and no route remains
+
+    @property
+    def done(self):
+        """True once every waypoint has been reached or the path is blocked."""
+        return self.blocked or self.index >= len(self.cells)
+
+    def next_waypoint(self):
+        """World-space centre of the next cell to walk to, or None when done."""
+        if self.done:
+            return None
+        cell = self.cells[self.index]
+        return (self.origin[0] + (cell % self.cols + 0.5) * self.cell_size,
+                self.origin[1] + (cell // self.cols + 0.5) * self.cell_size)
+
+    def advance(self):
+        """Move on to the following waypoint."""
+        self.index += 1
+
+class PathRequest:
+    """Handle for a queued search. path is set (or stays None) once done is True."""
+
+    def __init__(self, start, goal, callback=None):
+        self.start = start
+        self.goal = goal
+        self.callback = callback
+        self.path = None
+        self.done = False
+
+class PathService:
+    """A* over the walkability grid with a per-frame node budget.
+
+    Requests are queued and searched in order by process(), which stops
+    expanding nodes once the frame's budget is spent and resumes next frame.
+    Node scores live in preallocated buffers reused by every search, with a
+    generation stamp instead of clearing them between searches. Recent
+    results are kept in an LRU cache, and paths already handed out are
+    patched locally when a wall appears on them, including when streamed
+    chunks swap in a new grid (set_grid).
+    """
+
+    def __init__(self, walkable, cell_size, cache_size=256, node_budget=2000, repair_budget=400, origin=(0, 0)):
+        """
+        Args:
+            walkable (np.ndarray): (rows, cols) bool grid, True where movement is allowed
+            cell_size (int): Size of one grid cell in pixels
+            cache_size (int): Number of (start, goal) results to remember
+            node_budget (int): Nodes expanded per process() call
+            repair_budget (int): Nodes a local repair may expand before a full replan
+            origin (tuple): World position of the grid's top-left corner
+        """
+        self.rows, self.cols = walkable.shape
+        self.cell_size = cell_size
+        self.origin = origin
+        self.walkable = walkable.ravel().tolist()
+        self.cache_size = cache_size
+        self.node_budget = node_budget
+        self.repair_budget = repair_budget
+
+        # Reusable node buffers, valid only where stamp matches the search generation
+        count = self.rows * self.cols
+        self.g_score = [0.0] * count
+        self.parent = [-1] * count
+        self.stamp = [0] * count
+        self.closed = [0] * count
+        self.generation = 0
+
+        self.cache = OrderedDict()  # (start, goal) -> tuple of cells
+        self.pending = deque()
+        self._search = None         # (request, heap, generation) being expanded
+        self._paths = weakref.WeakSet()
+
+    def cell_at(self, x, y):
+        """Flat cell index for a world position, clamped to the grid."""
+        cx = min(max((int(x) - self.origin[0]) // self.cell_size, 0), self.cols - 1)
+        cy = min(max((int(y) - self.origin[1]) // self.cell_size, 0), self.rows - 1)
+        return cy * self.cols + cx
+
+    def request(self, start_x, start_y, goal_x, goal_y, callback=None):
+        """Queue a path search between two world positions.
+
+        Cached results are returned immediately. Otherwise the search runs
+        inside later process() calls, and callback(path) fires when it ends
+        (path is None if the goal can't be reached).
+
+        Returns:
+            PathRequest: Handle for polling the result
+        """
+        request = PathRequest(self.cell_at(start_x, start_y), self.cell_at(goal_x, goal_y), callback)
+        cells = self._cached(request.start, request.goal)
+        if cells is not None:
+            self._finish(request, cells)
+        else:
+            self.pending.append(request)
+        return request
+
+    def cancel(self, request):
+        """Drop a queued request if it hasn't finished yet."""
+        if self._search is not None and self._search[0] is request:
+            self._search = None
+        elif request in self.pending:
+            self.pending.remove(request)
+
+    def process(self, budget=None):
+        """Expand queued searches until the node budget for this frame is spent."""
+        budget = self.node_budget if budget is None else budget
+        while budget > 0:
+            if self._search is None:
+                if not self.pending:
+                    return
+                request = self.pending.popleft()
+                cells = self._cached(request.start, request.goal)
+                if cells is not None:
+                    self._finish(request, cells)
+                    continue
+                self._search = (request, self._begin(request.start), self.generation)
+
+            request, heap, generation = self._search
+            budget, result = self._expand(heap, generation, request.goal, budget)
+            if result is not None or not heap:
+                self._search = None
+                if result is not None:
+                    self._remember(request.start, request.goal, result)
+                self._finish(request, result)
+
+    def set_blocked(self, cx, cy, blocked=True):
+        """Change one cell's walkability and fix up anything that depended on it.
+
+        Blocking a cell drops cached paths through it and patches live paths
+        with a short local search around the new wall. A full replan is
+        queued only when the local patch fails. Unblocking keeps existing
+        paths, which stay valid even if a shorter route has opened up.
+        """
+        cell = cy * self.cols + cx
+        if self.walkable[cell] == (not blocked):
+            return
+        self.walkable[cell] = not blocked
+
+        # The in-progress search may have expanded through the changed cell
+        if self._search is not None:
+            self.pending.appendleft(self._search[0])
+            self._search = None
+
+        if not blocked:
+            return
+
+        for key in [key for key, cells in self.cache.items() if cell in cells]:
+            del self.cache[key]
+
+        for path in list(self._paths):
+            if cell in path.cells[path.index:]:
+                self._repair(path)
+
+    def set_grid(self, walkable, origin):
+        """Swap in a new walkability grid, keeping live paths and queued requests.
+
+        The grid may cover a different window of the world, as when chunks
+        stream in and out. Paths and requests are moved to the new window's
+        cell numbering, and every cell whose walkability changed goes
+        through set_blocked, so a path crossing a new wall is repaired
+        rather than dropped. A path leaving the new window is blocked.
+
+        Args:
+            walkable (np.ndarray): (rows, cols) bool grid, True where movement is allowed
+            origin (tuple): World position of the new grid's top-left corner
+        """
+        rows, cols = walkable.shape
+        shift_x = (self.origin[0] - origin[0]) // self.cell_size
+        shift_y = (self.origin[1] - origin[1]) // self.cell_size
+        old_cols = self.cols
+
+        def move(cell):
+            """Old cell index in the new numbering, or -1 outside the new grid."""
+            x = cell % old_cols + shift_x
+            y = cell // old_cols + shift_y
+            return y * cols + x if 0 <= x < cols and 0 <= y < rows else -1
+
+        # The old walkability seen through the new window; cells it didn't cover start as they are now
+        known = walkable.copy()
+        old = np.array(self.walkable, dtype=bool).reshape(self.rows, old_cols)
+        y0, x0 = max(0, shift_y), max(0, shift_x)
+        y1, x1 = min(rows, self.rows + shift_y), min(cols, old_cols + shift_x)
+        if y0 < y1 and x0 < x1:
+            known[y0:y1, x0:x1] = old[y0 - shift_y:y1 - shift_y, x0 - shift_x:x1 - shift_x]
+
+        if (rows, cols) != (self.rows, self.cols) or shift_x or shift_y:
+            requests = ([self._search[0]] if self._search is not None else []) + list(self.pending)
+            self.rows, self.cols = rows, cols
+            self.origin = origin
+            count = rows * cols
+            self.g_score = [0.0] * count
+            self.parent = [-1] * count
+            self.stamp = [0] * count
+            self.closed = [0] * count
+            self.cache.clear()
+            self._search = None
+
+            self.pending.clear()
+            for request in requests:
+                request.start, request.goal = move(request.start), move(request.goal)
+                if request.start < 0 or request.goal < 0:
+                    self._finish(request, None)
+                else:
+                    self.pending.append(request)
+
+            for path in list(self._paths):
+                cells = [move(cell) for cell in path.cells]
+                if -1 in cells[max(path.index - 1, 0):]:
+                    path.blocked = True
+                    continue
+                path.cells = cells
+                path.cols = cols
+                path.origin = origin
+
+        # Open cells first, so detours around the new walls may use them
+        self.walkable = known.ravel().tolist()
+        for blocked, cells in ((False, walkable & ~known), (True, known & ~walkable)):
+            for cell in np.flatnonzero(cells).tolist():
+                self.set_blocked(cell % cols, cell // cols, blocked)
+
+    def _repair(self, path):
+        """Splice a detour around the blocked stretch of a live path."""
+        cells = path.cells
+        walkable = self.walkable
+        first = next(i for i in range(path.index, len(cells)) if not walkable[cells[i]])
+        last = first
+        while last < len(cells) and not walkable[cells[last]]:
+            last += 1
+        if last == len(cells):
+            # The goal itself is now a wall
+            path.blocked = True
+            return
+
+        # Rejoin from the cell just before the wall
+        start = max(first - 1, 0)
+        detour = self.find_path_now(cells[start], cells[last], self.repair_budget)
+        if detour is not None:
+            path.cells = cells[:start] + list(detour) + cells[last + 1:]
+            return
+
+        # No local detour, replan the rest of the way within the frame budget
+        def replace(new_path):
+            if new_path is None:
+                path.blocked = True
+            else:
+                path.cells = new_path.cells
+                path.cols = new_path.cols
+                path.origin = new_path.origin
+                path.index = 0
+        self.pending.append(PathRequest(cells[max(path.index - 1, 0)], cells[-1], replace))
+
+    def find_path_now(self, start, goal, max_nodes):
+        """Run a whole search immediately between two cells, bounded by max_nodes.
+
+        Returns:
+            list: Cells from start to goal, or None if not found within the bound
+        """
+        # Shares the node buffers, so any suspended search has to start over
+        if self._search is not None:
+            self.pending.appendleft(self._search[0])
+            self._search = None
+
+        heap = self._begin(start)
+        _, result = self._expand(heap, self.generation, goal, max_nodes)
+        return result
+
+    def _begin(self, start):
+        """Start a new search generation and return its open set."""
+        self.generation += 1
+        self.g_score[start] = 0.0
+        self.parent[start] = -1
+        self.stamp[start] = self.generation
+        return [(0.0, start)]
+
+    def _expand(self, heap, generation, goal, budget):
+        """Expand up to budget nodes.
+
+        Returns:
+            tuple: (remaining budget, cells from start to goal or None)
+        """
+        cols, rows = self.cols, self.rows
+        walkable = self.walkable
+        g_score, parent, stamp, closed = self.g_score, self.parent, self.stamp, self.closed
+        goal_x, goal_y = goal % cols, goal // cols
+        if not walkable[goal]:
+            heap.clear()
+            return budget, None
+
+        while heap and budget > 0:
+            _, node = heapq.heappop(heap)
+            if closed[node] == generation:
+                continue
+            closed[node] = generation
+            budget -= 1
+
+            if node == goal:
+                heap.clear()
+                return budget, self._reconstruct(node)
+
+            x, y = node % cols, node // cols
+            base = g_score[node]
+            for dx, dy, cost in _STEPS:
+                nx, ny = x + dx, y + dy
+                if nx < 0 or ny < 0 or nx >= cols or ny >= rows:
+                    continue
+                neighbour = ny * cols + nx
+                if not walkable[neighbour] or closed[neighbour] == generation:
+                    continue
+                if dx and dy and not (walkable[y * cols + nx] and walkable[ny * cols + x]):
+                    continue
+
+                score = base + cost
+                if stamp[neighbour] != generation or score < g_score[neighbour]:
+                    stamp[neighbour] = generation
+                    g_score[neighbour] = score
+                    parent[neighbour] = node
+                    # Octile distance heuristic
+                    hx, hy = abs(goal_x - nx), abs(goal_y - ny)
+                    heapq.heappush(heap, (score + hx + hy + _DIAGONAL_EXTRA * min(hx, hy), neighbour))
+
+        return budget, None
+
+    def _reconstruct(self, node):
+        """Walk parent links back to the start."""
+        cells = []
+        parent = self.parent
+        while node != -1:
+            cells.append(node)
+            node = parent[node]
+        cells.reverse()
+        return cells
+
+    def _cached(self, start, goal):
+        """Look up a cached result, marking it most recently used."""
+        cells = self.cache.get((start, goal))
+        if cells is not None:
+            self.cache.move_to_end((start, goal))
+        return cells
+
+    def _remember(self, start, goal, cells):
+        """Store a result, evicting the least recently used one if full."""
+        self.cache[(start, goal)] = tuple(cells)
+        self.cache.move_to_end((start, goal))
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def _finish(self, request, cells):
+        """Complete a request and hand its path to the caller."""
+        if cells is not None:
+            request.path = Path(cells, self.cols, self.cell_size, self.origin)
+            self._paths.add(request.path)
+        request.done = True
+        if request.callback is not None:
+            request.callback(request.path)
@@ -0,0 +1,228 @@
+import os
+import math
+import numpy as np
+import pygame
+from config import MAP_WIDTH, MAP_HEIGHT
+
+class ProjectileSystem:
+    """Fixed-capacity arrow pool for ranged enemies and player skills.
+
+    Arrows are slots in preallocated NumPy arrays and draw from a shared set
+    of pre-rotated frames, so firing a volley never creates surfaces or
+    Python objects per shot.
+    """
+
+    OWNER_PLAYER = 0
+    OWNER_ENEMY = 1
+
+    # Rotated frames are shared by every pool using the same sheet and step count
+    _frame_cache = {}
+
+    def __init__(self, capacity=2048, angle_steps=32):
+        self.capacity = capacity
+        self.angle_steps = angle_steps
+
+        # Per-arrow state
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.ones(capacity, dtype=np.float32)
+        self.damage = np.zeros(capacity, dtype=np.int32)
+        self.owner = np.zeros(capacity, dtype=np.int8)
+        self.angle_index = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        # Free list of dead slots, used as a stack
+        self._free = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self._free_count = capacity
+        self._high_water = 0
+
+        # Compiled wall grid and entity index, set by the owner of the pool
+        self.bounds = (0, 0, MAP_WIDTH, MAP_HEIGHT)  # Arrows leaving this area expire
+        self.collision_map = None
+        self.spatial_hash = None
+
+        self.frames = self.load_frames()
+        self.frame_half = np.array([(f.get_width() // 2, f.get_height() // 2) for f in self.frames], dtype=np.float32)
+
+    def load_frames(self):
+        """Load the arrow sprite and pre-rotate it for every angle step."""
+        path = os.path.join('assets', 'Arrow(Projectile)', 'Arrow01(32x32).png')
+        key = (path, self.angle_steps)
+        if key in self._frame_cache:
+            return self._frame_cache[key]
+
+        try:
+            arrow = pygame.image.load(path).convert_alpha()
+        except (pygame.error, FileNotFoundError):
+            print(f"Arrow sprite not found: {path}")
+            # Fallback: a simple line pointing right
+            arrow = pygame.Surface((32, 32), pygame.SRCALPHA)
+            pygame.draw.line(arrow, (220, 200, 160), (6, 16), (26, 16), 3)
+
+        # The sprite points right; pygame rotates counter-clockwise with y up
+        frames = [
+            pygame.transform.rotate(arrow, -math.degrees(i * 2 * math.pi / self.angle_steps))
+            for i in range(self.angle_steps)
+        ]
+        self._frame_cache[key] = frames
+        return frames
+
+    def fire(self, x, y, angle, speed=400, damage=10, owner=OWNER_ENEMY, lifetime=2.0):
+        """Fire a single arrow. Returns the number of arrows spawned (0 or 1)."""
+        return self.fire_volley(x, y, np.array([angle], dtype=np.float32), speed, damage, owner, lifetime)
+
+    def fire_volley(self, x, y, angles, speed=400, damage=10, owner=OWNER_ENEMY, lifetime=2.0):
+        """Fire one arrow per angle from the same origin.
+
+        Args:
+            x, y (float): World position of the shooter
+            angles (np.ndarray): Flight angles in radians (screen space, y down)
+            speed (float): Pixels per second
+            damage (int): Damage dealt on hit
+            owner (int): OWNER_PLAYER or OWNER_ENEMY
+            lifetime (float): Seconds before the arrow expires
+
+        Returns:
+            int: Number of arrows actually spawned (the pool may be full)
+        """
+        count = min(len(angles), self._free_count)
+        if count <= 0:
+            return 0
+        angles = np.asarray(angles[:count], dtype=np.float32)
+
+        slots = self._free[self._free_count - count:self._free_count]
+        self._free_count -= count
+        self._high_water = max(self._high_water, int(slots.max()) + 1)
+
+        self.pos[slots, 0] = x
+        self.pos[slots, 1] = y
+        self.vel[slots, 0] = np.cos(angles) * speed
+        self.vel[slots, 1] = np.sin(angles) * speed
+        self.age[slots] = 0
+        self.lifetime[slots] = lifetime
+        self.damage[slots] = damage
+        self.owner[slots] = owner
+        step = 2 * math.pi / self.angle_steps
+        self.angle_index[slots] = np.round(angles / step).astype(np.int32) % self.angle_steps
+        self.alive[slots] = True
+        return count
+
+    def update(self, dt, targets_by_owner=None):
+        """Move every arrow and resolve wall and entity hits.
+
+        Args:
+            dt (float): Elapsed time in seconds
+            targets_by_owner (dict): Maps an owner id to the spatial hash
+                categories its arrows can hit
+
+        Returns:
+            list: (target, damage, x, y) tuples for every entity hit this step
+        """
+        end = self._high_water
+        if end == 0:
+            return []
+
+        alive = self.alive[:end]
+        was_alive = alive.copy()
+        self.pos[:end] += self.vel[:end] * dt
+        self.age[:end] += dt
+
+        x = self.pos[:end, 0]
+        y = self.pos[:end, 1]
+        left, top, right, bottom = self.bounds
+        dead = alive & ((self.age[:end] >= self.lifetime[:end]) |
+                        (x < left) | (y < top) | (x >= right) | (y >= bottom))
+        alive &= ~dead
+
+        # Walls: one grid lookup per arrow, all in a single gather, and an exact
+        # test against the merged wall rects for arrows in a solid cell
+        if self.collision_map is not None:
+            alive &= ~self.collision_map.points_blocked_exact(x, y)
+
+        hits = []
+        for owner, categories in (targets_by_owner or {}).items():
+            hits.extend(self._collide_targets(owner, categories, x, y))
+
+        self._recycle(np.flatnonzero(was_alive & ~alive))
+        return hits
+
+    def _collide_targets(self, owner, categories, x, y):
+        """Test arrows of one owner against spatial hash entities of the given categories."""
+        end = len(x)
+        candidates = np.flatnonzero(self.alive[:end] & (self.owner[:end] == owner))
+        if self.spatial_hash is None or len(candidates) == 0:
+            return []
+
+        # Group candidate arrows by spatial hash cell and look each cell up once
+        size = self.spatial_hash.cell_size
+        cell_x = (x[candidates] // size).astype(np.int32)
+        cell_y = (y[candidates] // size).astype(np.int32)
+        order = np.lexsort((cell_y, cell_x))
+        candidates, cell_x, cell_y = candidates[order], cell_x[order], cell_y[order]
+        starts = np.flatnonzero(np.r_[True, (np.diff(cell_x) != 0) | (np.diff(cell_y) != 0)])
+        bounds = np.r_[starts, len(candidates)]
+
+        hits = []
+        for group in range(len(starts)):
+            lo, hi = bounds[group], bounds[group + 1]
+            targets = self.spatial_hash.query_cell(int(cell_x[lo]), int(cell_y[lo]), categories)
+            if not targets:
+                continue
+            for i in candidates[lo:hi].tolist():
+                point = (int(x[i]), int(y[i]))
+                for target in targets:
+                    if target.hurtbox.collidepoint(point):
+                        hits.append((target, int(self.damage[i]), point[0], point[1]))
+                        self.alive[i] = False
+                        break
+        return hits
+
+    def _recycle(self, slots):
+        """Push dead slots back onto the free list."""
+        if len(slots) == 0:
+            return
+        self._free[self._free_count:self._free_count + len(slots)] = slots[::-1]
+        self._free_count += len(slots)
+
+        live = np.flatnonzero(self.alive[:self._high_water])
+        self._high_water = int(live[-1]) + 1 if len(live) else 0
+
+    def draw(self, screen, camera):
+        """Draw all on-screen arrows with a single Surface.blits call."""
+        end = self._high_water
+        if end == 0:
+            return
+
+        angle = self.angle_index[:end]
+        screen_x = self.pos[:end, 0] - self.frame_half[angle, 0] + camera.x_offset
+        screen_y = self.pos[:end, 1] - self.frame_half[angle, 1] + camera.y_offset
+
+        width, height = screen.get_size()
+        visible = np.flatnonzero(
+            self.alive[:end] &
+            (screen_x > -32) & (screen_x < width) &
+            (screen_y > -32) & (screen_y < height)
+        )
+        if len(visible) == 0:
+            return
+
+        frames = self.frames
+        screen.blits([
+            (frames[a], (sx, sy))
+            for a, sx, sy in zip(angle[visible].tolist(),
+                                 screen_x[visible].astype(np.int32).tolist(),
+                                 screen_y[visible].astype(np.int32).tolist())
+        ], doreturn=False)
+
+    def clear(self):
+        """Remove every arrow and reset the free list."""
+        self.alive[:] = False
+        self._free[:] = np.arange(self.capacity - 1, -1, -1, dtype=np.int32)
+        self._free_count = self.capacity
+        self._high_water = 0
+
+    @property
+    def live_count(self):
+        """Number of arrows currently in flight."""
+        return self.capacity - self._free_count
@@ -0,0 +1,70 @@
+import numpy as np
+
+class SpawnPool:
+    """Authored enemy spawns kept as plain records until the player is near.
+
+    Each record is an archetype name, a position and current health. Records
+    within activate_radius of the view are handed out to be turned into
+    Enemy objects, and enemies that wander past park_radius are parked back
+    into their record. Memory and per-frame work then follow the enemies
+    near the player rather than every enemy the map declares.
+
+    A defeated record keeps health 0 and never spawns again.
+    """
+
+    def __init__(self, activate_radius=1000, park_radius=1300):
+        self.activate_radius = activate_radius
+        self.park_radius = park_radius
+        self.archetypes = []
+        self.x = np.zeros(0, dtype=np.float32)
+        self.y = np.zeros(0, dtype=np.float32)
+        self.health = np.zeros(0, dtype=np.int32)   # -1 for full health, 0 once defeated
+        self.active = np.zeros(0, dtype=bool)
+
+    def load(self, spawns):
+        """Replace every record with a list of {'name', 'x', 'y'} spawns."""
+        self.restore([spawn['name'] for spawn in spawns],
+                     [spawn['x'] for spawn in spawns],
+                     [spawn['y'] for spawn in spawns],
+                     np.full(len(spawns), -1))
+
+    def restore(self, archetypes, x, y, health):
+        """Replace every record with saved names, positions and health, all inactive."""
+        self.archetypes = list(archetypes)
+        self.x = np.array(x, dtype=np.float32)
+        self.y = np.array(y, dtype=np.float32)
+        self.health = np.array(health, dtype=np.int32)
+        self.active = np.zeros(len(self.archetypes), dtype=bool)
+
+    def activate(self, center_x, center_y):
+        """Mark records near a point active and return them.
+
+        Returns:
+            list: (index, archetype name, x, y, health or None) per new spawn
+        """
+        dist_sq = (self.x - center_x) ** 2 + (self.y - center_y) ** 2
+        due = np.flatnonzero(~self.active & (self.health != 0) &
+                             (dist_sq <= self.activate_radius * self.activate_radius))
+        self.active[due] = True
+        return [(index, self.archetypes[index], int(self.x[index]), int(self.y[index]),
+                 None if self.health[index] < 0 else int(self.health[index]))
+                for index in due.tolist()]
+
+    def should_park(self, x, y, center_x, center_y):
+        """True if an enemy at (x, y) is far enough from the view to park."""
+        return (x - center_x) ** 2 + (y - center_y) ** 2 > self.park_radius * self.park_radius
+
+    def park(self, index, x, y, health):
+        """Store an enemy's state back in its record until it is needed again."""
+        self.x[index] = x
+        self.y[index] = y
+        self.health[index] = health
+        self.active[index] = False
+
+    def defeat(self, index):
+        """Mark a record's enemy as beaten so it never spawns again."""
+        self.health[index] = 0
+        self.active[index] = True
+
+    def __len__(self):
+        return len(self.archetypes)
@@ -0,0 +1,146 @@
+import numpy as np
+
+# Terrain kinds
+GRASS = 0
+GROUND = 1
+WATER = 2
+FOREST = 3
+
+# Salts keeping each noise field independent of the others
+_HEIGHT_SALT = 0x68e31da4
+_MOISTURE_SALT = 0xb5297a4d
+_DETAIL_SALT = 0x1b56c4e9
+_TREE_SALT = 0x7fb5d329
+
+class TerrainGenerator:
+    """Seeded value noise turned into terrain, a whole block of tiles at a time.
+
+    Every lattice value is an integer hash of (seed, x, y), so any block of
+    the world can be generated on its own and neighbouring blocks line up
+    seamlessly. All work is NumPy array arithmetic over the block; there is
+    no per-tile Python loop and no shared random state.
+    """
+
+    def __init__(self, seed=0, scale=24.0, octaves=4, water_level=0.3, forest_level=0.6, dirt_level=0.3,
+                 detail_chance=0.3):
+        """
+        Args:
+            seed (int): World seed
+            scale (float): Size in tiles of the largest terrain features
+            octaves (int): Noise layers summed, each at twice the frequency
+            water_level (float): Height below which tiles are water
+            forest_level (float): Moisture above which tiles are forest
+            dirt_level (float): Moisture below which tiles are bare ground
+            detail_chance (float): Share of grass tiles drawn with a detail variant
+        """
+        self.seed = np.uint32(seed & 0xffffffff)
+        self.scale = scale
+        self.octaves = octaves
+        self.water_level = water_level
+        self.forest_level = forest_level
+        self.dirt_level = dirt_level
+        self.detail_chance = detail_chance
+
+    def _hash(self, x, y, salt):
+        """Uniform [0, 1) value per integer lattice point."""
+        h = x.astype(np.uint32) * np.uint32(0x27d4eb2d)
+        h ^= y.astype(np.uint32) * np.uint32(0x165667b1)
+        h ^= self.seed ^ np.uint32(salt & 0xffffffff)
+        # Finalise so neighbouring lattice points look unrelated
+        h ^= h >> np.uint32(15)
+        h *= np.uint32(0x2c1b3c6d)
+        h ^= h >> np.uint32(12)
+        h *= np.uint32(0x297a2d39)
+        h ^= h >> np.uint32(15)
+        return h.astype(np.float32) * np.float32(1.0 / 2 ** 32)
+
+    def _grid(self, tile_x, tile_y, cols, rows):
+        """(rows, cols) tile coordinates for a block starting at (tile_x, tile_y)."""
+        return np.meshgrid(np.arange(tile_x, tile_x + cols, dtype=np.int64),
+                           np.arange(tile_y, tile_y + rows, dtype=np.int64))
+
+    def white(self, tile_x, tile_y, cols, rows, salt):
+        """Independent [0, 1) value per tile."""
+        x, y = self._grid(tile_x, tile_y, cols, rows)
+        return self._hash(x, y, salt)
+
+    def noise(self, tile_x, tile_y, cols, rows, salt, scale=None):
+        """Fractal value noise in [0, 1) for a block of tiles.
+
+        Args:
+            tile_x, tile_y (int): Tile coordinates of the block's top-left corner
+            cols, rows (int): Block size in tiles
+            salt (int): Selects an independent noise field
+            scale (float): Feature size in tiles, defaults to the generator's
+
+        Returns:
+            np.ndarray: (rows, cols) float32 field
+        """
+        scale = self.scale if scale is None else scale
+        x = np.arange(tile_x, tile_x + cols, dtype=np.float64) + 0.5
+        y = np.arange(tile_y, tile_y + rows, dtype=np.float64) + 0.5
+
+        total = np.zeros((rows, cols), dtype=np.float32)
+        amplitude = 1.0
+        weight = 0.0
+        for octave in range(self.octaves):
+            # Hash only the lattice points the block touches, then interpolate.
+            # Sampling at tile centres means neighbouring blocks agree at their edges.
+            fx = x / scale
+            fy = y / scale
+            x0 = np.floor(fx).astype(np.int64)
+            y0 = np.floor(fy).astype(np.int64)
+            left, top = int(x0[0]), int(y0[0])
+            lattice_x, lattice_y = np.meshgrid(np.arange(left, int(x0[-1]) + 2, dtype=np.int64),
+                                               np.arange(top, int(y0[-1]) + 2, dtype=np.int64))
+            lattice = self._hash(lattice_x, lattice_y, salt + octave * 0x9e3779b9)
+
+            # Smoothstep removes the creases linear interpolation leaves at lattice lines
+            tx = (fx - x0).astype(np.float32)
+            ty = (fy - y0).astype(np.float32)[:, None]
+            tx = tx * tx * (3 - 2 * tx)
+            ty = ty * ty * (3 - 2 * ty)
+
+            ix = x0 - left
+            iy = y0 - top
+            upper = lattice[iy]
+            lower = lattice[iy + 1]
+            row_top = upper[:, ix] + (upper[:, ix + 1] - upper[:, ix]) * tx
+            row_bottom = lower[:, ix] + (lower[:, ix + 1] - lower[:, ix]) * tx
+            total += (row_top + (row_bottom - row_top) * ty) * amplitude
+
+            weight += amplitude
+            amplitude *= 0.5
+            scale /= 2
+        return total / weight
+
+    def details(self, tile_x, tile_y, cols, rows):
+        """Grass variant per tile, 0 for plain grass or 1-5 for a detail tile."""
+        # Low digits pick the variant, the whole value decides whether to use one
+        roll = self.white(tile_x, tile_y, cols, rows, _DETAIL_SALT)
+        return np.where(roll < self.detail_chance, 1 + (roll * 1000).astype(np.int32) % 5, 0).astype(np.int8)
+
+    def generate(self, tile_x, tile_y, cols, rows):
+        """Terrain for a block of tiles.
+
+        Returns:
+            tuple: (terrain, detail, trees), each (rows, cols). terrain holds
+                GRASS/GROUND/WATER/FOREST, detail is 0 for plain grass or a
+                1-5 grass variant, and trees is 0 for none or a 1-2 tree variant
+        """
+        height = self.noise(tile_x, tile_y, cols, rows, _HEIGHT_SALT)
+        # Moisture changes more slowly than height, giving broad forests and clearings
+        moisture = self.noise(tile_x, tile_y, cols, rows, _MOISTURE_SALT, self.scale * 1.5)
+
+        terrain = np.full((rows, cols), GRASS, dtype=np.int8)
+        terrain[moisture < self.dirt_level] = GROUND
+        terrain[moisture > self.forest_level] = FOREST
+        terrain[height < self.water_level] = WATER
+
+        detail = self.details(tile_x, tile_y, cols, rows)
+
+        # Forest gets denser toward its wettest middle
+        tree_roll = self.white(tile_x, tile_y, cols, rows, _TREE_SALT)
+        density = np.clip((moisture - self.forest_level) * 4 + 0.25, 0, 0.6)
+        trees = np.where((terrain == FOREST) & (tree_roll < density), 1 + (tree_roll * 1000).astype(np.int32) % 2, 0)
+        return terrain, detail, trees.astype(np.int8)
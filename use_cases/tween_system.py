@@ -0,0 +1,196 @@
+import heapq
+import math
+import numpy as np
+
+# Easing curves, by id
+LINEAR, IN_QUAD, OUT_QUAD, IN_OUT_QUAD, OUT_BACK, IN_OUT_SINE = range(6)
+
+# Playback modes. A leg is one run from start to end over the duration.
+ONCE = 0      # One leg, then finished
+YOYO = 1      # Start to end and back, then finished
+LOOP = 2      # Start to end, jumping back to start, forever
+PINGPONG = 3  # Start to end and back, forever
+
+class TweenSystem:
+    """Array-backed tweens for battle motion and UI transitions.
+
+    Each tween interpolates one number from a start to an end value and lives
+    in a slot of preallocated NumPy arrays, like ParticleSystem, so the whole
+    set is evaluated in one vectorised pass per update(). Callers name tweens
+    with any hashable key and read the current value with get(). Completion
+    callbacks wait in a heap ordered by end time, so tweens ending in the same
+    frame report in the order they finished.
+    """
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.time = 0.0  # Seconds this system has been updated for
+
+        # Per-tween state (one slot per tween)
+        self.start_value = np.zeros(capacity, dtype=np.float32)
+        self.end_value = np.zeros(capacity, dtype=np.float32)
+        self.start_time = np.zeros(capacity, dtype=np.float64)
+        self.duration = np.ones(capacity, dtype=np.float64)
+        self.easing = np.zeros(capacity, dtype=np.int8)
+        self.mode = np.zeros(capacity, dtype=np.int8)
+        self.value = np.zeros(capacity, dtype=np.float32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self._token = np.zeros(capacity, dtype=np.int64)  # Changes whenever a slot is restarted or stopped
+
+        # Free list of slots used as a stack, and the high-water mark of live slots
+        self._free = list(range(capacity - 1, -1, -1))
+        self._high_water = 0
+        self._slots = {}                # Key -> slot
+        self._keys = [None] * capacity  # Slot -> key
+        self._completions = []          # Heap of (end time, token, slot, key, callback)
+        self._next_token = 0
+
+    def _slot_for(self, key):
+        """Slot of a playing tween, or a free one (the pool grows when full)."""
+        slot = self._slots.get(key)
+        if slot is None:
+            if not self._free:
+                self._grow()
+            slot = self._free.pop()
+            self._slots[key] = slot
+            self._keys[slot] = key
+            self._high_water = max(self._high_water, slot + 1)
+        self._next_token += 1
+        self._token[slot] = self._next_token
+        return slot
+
+    def _grow(self):
+        capacity = self.capacity * 2
+        for name in ('start_value', 'end_value', 'start_time', 'duration', 'easing', 'mode', 'value',
+                     'alive', '_token'):
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:self.capacity] = array
+            setattr(self, name, grown)
+        self._free = list(range(capacity - 1, self.capacity - 1, -1))
+        self._keys.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def play(self, key, start, end, duration, easing=OUT_QUAD, mode=ONCE, delay=0.0, on_complete=None):
+        """Start a tween, replacing any tween playing under the same key.
+
+        Args:
+            key: Name to read the tween back with
+            start, end (float): Values at the start and end of a leg
+            duration (float): Seconds per leg
+            easing (int): Easing curve id
+            mode (int): ONCE, YOYO, LOOP or PINGPONG
+            delay (float): Seconds before the tween starts; negative values
+                start part way through, e.g. to offset looping tweens
+            on_complete: Called with the key once a ONCE or YOYO tween ends
+        """
+        slot = self._slot_for(key)
+        self.start_value[slot] = start
+        self.end_value[slot] = end
+        self.start_time[slot] = self.time + delay
+        self.duration[slot] = max(duration, 1e-6)
+        self.easing[slot] = easing
+        self.mode[slot] = mode
+        self.value[slot] = start
+        self.alive[slot] = True
+        if on_complete is not None and mode in (ONCE, YOYO):
+            # Same arithmetic as update()'s end check, so both agree on the frame it ends
+            end_time = float(self.start_time[slot] + self.duration[slot] * (1 + (mode & 1)))
+            heapq.heappush(self._completions, (end_time, int(self._token[slot]), slot, key, on_complete))
+
+    def play_many(self, keys, start, end, duration, easing=OUT_QUAD, mode=ONCE, delay=0.0):
+        """Start one tween per key in a single batch; values may be per-key arrays."""
+        if not len(keys):
+            return
+        slots = np.array([self._slot_for(key) for key in keys], dtype=np.int64)
+        self.start_value[slots] = start
+        self.end_value[slots] = end
+        self.start_time[slots] = self.time + np.asarray(delay, dtype=np.float64)
+        self.duration[slots] = np.maximum(duration, 1e-6)
+        self.easing[slots] = easing
+        self.mode[slots] = mode
+        self.value[slots] = start
+        self.alive[slots] = True
+
+    def get(self, key, default=0.0):
+        """Current value of a tween, or default once it has finished or if it never ran."""
+        slot = self._slots.get(key)
+        return default if slot is None else float(self.value[slot])
+
+    def playing(self, key):
+        """True while a tween is playing under the key."""
+        return key in self._slots
+
+    def stop(self, key):
+        """End a tween early, without calling its completion callback."""
+        slot = self._slots.pop(key, None)
+        if slot is not None:
+            self._release(slot)
+
+    def _release(self, slot):
+        self.alive[slot] = False
+        self._keys[slot] = None
+        self._next_token += 1
+        self._token[slot] = self._next_token
+        self._free.append(slot)
+
+    def update(self, dt):
+        """Advance time by dt seconds, evaluate every tween and report those that ended."""
+        self.time += dt
+        end = self._high_water
+        if end == 0:
+            return
+
+        # Progress through the tween in legs: 0..1 for ONCE and LOOP, 0..2 for YOYO and PINGPONG
+        mode = self.mode[:end]
+        legs = 1 + (mode & 1)
+        looping = mode >= LOOP
+        t = (self.time - self.start_time[:end]) / self.duration[:end]
+        leg = np.where(looping, np.mod(t, legs), np.clip(t, 0.0, legs))
+        p = np.where(legs == 2, 1.0 - np.abs(1.0 - leg), np.minimum(leg, 1.0))
+
+        easing = self.easing[:end]
+        back = p - 1.0
+        eased = np.select(
+            [easing == IN_QUAD, easing == OUT_QUAD, easing == IN_OUT_QUAD, easing == OUT_BACK,
+             easing == IN_OUT_SINE],
+            [p * p, p * (2.0 - p), np.where(p < 0.5, 2.0 * p * p, 1.0 - 2.0 * back * back),
+             1.0 + 2.70158 * back ** 3 + 1.70158 * back ** 2, 0.5 - 0.5 * np.cos(math.pi * p)],
+            p)
+        start = self.start_value[:end]
+        self.value[:end] = start + (self.end_value[:end] - start) * eased
+
+        # Callbacks due this frame, skipping those of tweens restarted or stopped since
+        due = []
+        completions = self._completions
+        while completions and completions[0][0] <= self.time:
+            _, token, slot, key, callback = heapq.heappop(completions)
+            if self._token[slot] == token:
+                due.append((callback, key))
+
+        # Finished tweens give their slot back
+        finished = np.flatnonzero(self.alive[:end] & ~looping &
+                                  (self.start_time[:end] + self.duration[:end] * legs <= self.time))
+        if len(finished):
+            for slot in finished.tolist():
+                del self._slots[self._keys[slot]]
+                self._release(slot)
+            live = np.flatnonzero(self.alive[:end])
+            self._high_water = int(live[-1]) + 1 if len(live) else 0
+
+        # Called last, as callbacks may start new tweens
+        for callback, key in due:
+            callback(key)
+
+    def clear(self):
+        """Stop every tween and drop pending callbacks."""
+        self.alive[:] = False
+        self.value[:] = 0
+        self._free = list(range(self.capacity - 1, -1, -1))
+        self._high_water = 0
+        self._slots.clear()
+        self._keys = [None] * self.capacity
+        self._completions.clear()
+
+    def __len__(self):
+        return len(self._slots)
@@ -0,0 +1,72 @@
+import math
+import numpy as np
+from entities.components import COOLDOWNS, SHOT_COOLDOWN, SHOT_RANGE, SIM_SLOT
+
+class CooldownSystem:
+    """Counts every cooldown component down to zero.
+
+    One pass per cooldown component covers every entity holding it, so the
+    player's skills and every archer's reload tick together, once a frame.
+    """
+
+    def __init__(self, world, components=COOLDOWNS):
+        self.world = world
+        self.components = components
+
+    def update(self, dt):
+        """Advance all cooldowns by dt seconds."""
+        for component in self.components:
+            for table in self.world.query(component):
+                if table.count:
+                    column = table.column(component)
+                    np.subtract(column, dt, out=column)
+                    np.maximum(column, 0, out=column)
+
+class RangedAttackSystem:
+    """Finds the ranged enemies that are reloaded and in range of a target.
+
+    Reload timers and ranges are read as whole columns. Positions of
+    simulated enemies come straight from the EnemySimulation arrays, so the
+    per-archer Python work is limited to the few that actually fire.
+    """
+
+    def __init__(self, world, enemy_sim):
+        self.world = world
+        self.enemy_sim = enemy_sim
+
+    def update(self, target_x, target_y):
+        """Reset the reload of every archer that can shoot now.
+
+        Returns:
+            list: (archer, x, y, angle) for each shot, fired from the archer's centre
+        """
+        sim = self.enemy_sim
+        shots = []
+        for table in self.world.query(SHOT_COOLDOWN, SHOT_RANGE, SIM_SLOT):
+            if table.count == 0:
+                continue
+            cooldown = table.column(SHOT_COOLDOWN)
+            ready = np.flatnonzero(cooldown <= 0)
+            if len(ready) == 0:
+                continue
+
+            # Centres from the simulation, or the sprite rect for unbound enemies
+            slots = table.column(SIM_SLOT)[ready]
+            centres = np.empty((len(ready), 2), dtype=np.float32)
+            bound = slots >= 0
+            centres[bound] = sim.pos[slots[bound]] + sim.size[slots[bound]] * 0.5
+            for i in np.flatnonzero(~bound).tolist():
+                centres[i] = table.objects[ready[i]].rect.center
+
+            dx = target_x - centres[:, 0]
+            dy = target_y - centres[:, 1]
+            shot_range = table.column(SHOT_RANGE)[ready]
+            in_range = dx * dx + dy * dy <= shot_range * shot_range
+
+            for i in np.flatnonzero(in_range).tolist():
+                row = ready[i]
+                archer = table.objects[row]
+                cooldown[row] = archer.shot_interval
+                x, y = int(centres[i, 0]), int(centres[i, 1])
+                shots.append((archer, x, y, math.atan2(dy[i], dx[i])))
+        return shots